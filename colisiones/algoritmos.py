@@ -1,15 +1,28 @@
 # colisiones/algoritmos.py
 from __future__ import annotations
 
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass
-from math import sqrt, fabs
-from typing import List, Tuple
+from math import sqrt, fabs, floor
+from time import perf_counter
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
 
-from .modelos import Avion, ResultadoColision
+from .kdtree import ArbolKD
+from .modelos import Avion, Estadisticas, ParesIndexados, ResultadoColision, VecinosCercanos
+from .perfil import activas
 
 
 ParAviones = Tuple[Avion, Avion]
 
+# Recibe la fracción de trabajo hecha, en [0, 1]. Puede lanzar una excepción
+# para cortar el cálculo (por ejemplo, si el usuario lo canceló).
+Progreso = Callable[[float], None]
+
+# Cada cuántas iteraciones de la vuelta externa se informa el progreso
+_PASO_PROGRESO = 1024
+
 
 def _dist2(a: Avion, b: Avion) -> float:
     """Distancia entre dos aviones."""
@@ -36,6 +49,9 @@ def fuerza_bruta(puntos: List[Avion]) -> ResultadoColision:
             elif d2 == mejor_dist2:
                 pares.append((puntos[i], puntos[j]))
 
+    stats = activas()
+    if stats is not None:
+        stats.contar("fuerza_bruta.distancias", n * (n - 1) // 2)
     return ResultadoColision(sqrt(mejor_dist2), pares)
 
 
@@ -45,10 +61,15 @@ class _ResultadoInterno:
     pares: List[ParAviones]
 
 
-def _par_mas_cercano_dyv_rec(px: List[Avion], py: List[Avion]) -> _ResultadoInterno:
+def _par_mas_cercano_dyv_rec(
+    px: List[Avion], py: List[Avion], stats: Estadisticas | None = None, nivel: int = 0
+) -> _ResultadoInterno:
     
     n = len(px)
 
+    if stats is not None:
+        stats.maximo("dyv.profundidad", nivel)
+
     
     if n <= 3:
         res = fuerza_bruta(px)
@@ -70,8 +91,8 @@ def _par_mas_cercano_dyv_rec(px: List[Avion], py: List[Avion]) -> _ResultadoInte
             derecha_y.append(p)
 
     
-    res_izq = _par_mas_cercano_dyv_rec(izquierda_x, izquierda_y)
-    res_der = _par_mas_cercano_dyv_rec(derecha_x, derecha_y)
+    res_izq = _par_mas_cercano_dyv_rec(izquierda_x, izquierda_y, stats, nivel + 1)
+    res_der = _par_mas_cercano_dyv_rec(derecha_x, derecha_y, stats, nivel + 1)
 
    
     if res_izq.distancia2 < res_der.distancia2:
@@ -90,6 +111,9 @@ def _par_mas_cercano_dyv_rec(px: List[Avion], py: List[Avion]) -> _ResultadoInte
 
     
     m = len(strip)
+    if stats is not None:
+        stats.contar("dyv.franja", m)
+        stats.maximo("dyv.franja", m)
     for i in range(m):
         j = i + 1
         while j < m and (strip[j].y - strip[i].y) < d:
@@ -110,26 +134,281 @@ def par_mas_cercano_dyv(puntos: List[Avion]) -> ResultadoColision:
     if len(puntos) < 2:
         return ResultadoColision(float("inf"), [])
 
+    stats = activas()
+    if stats is not None:
+        t0 = perf_counter()
+
     px = sorted(puntos, key=lambda p: p.x)
     py = sorted(puntos, key=lambda p: p.y)
 
-    res_int = _par_mas_cercano_dyv_rec(px, py)
+    if stats is not None:
+        t1 = perf_counter()
+        stats.tiempo("dyv.orden", t1 - t0)
+
+    res_int = _par_mas_cercano_dyv_rec(px, py, stats)
+
+    if stats is not None:
+        stats.tiempo("dyv.recursion", perf_counter() - t1)
+        stats.contar("dyv.pares", len(res_int.pares))
     return ResultadoColision(sqrt(res_int.distancia2), res_int.pares)
 
 
+# divide y vencerás sobre arreglos de índices, de abajo hacia arriba
+
+# Tamaño de los bloques que se resuelven por fuerza bruta
+_HOJA_DYV = 8
+
+
+def _unir_franja(
+    xs: Sequence[float],
+    ys: Sequence[float],
+    lo: int,
+    mid: int,
+    hi: int,
+    por_y: Sequence[int],
+    mejor_dist2: float,
+    empatados: List[Tuple[int, int]],
+) -> Tuple[float, List[Tuple[int, int]], int]:
+    """
+    Paso de unión de divide y vencerás sobre las posiciones [lo, hi) de xs/ys
+    ordenados por x, ya resueltos [lo, mid) y [mid, hi): revisa la franja
+    alrededor de xs[mid] y solo compara pares que cruzan la división (el lado
+    lo decide la posición), así ningún par se repite.
+    por_y: las posiciones [lo, hi) ordenadas por y
+    Devuelve (mejor_dist2, empatados, ancho de la franja), con los empates
+    como posiciones (a, b), a < b.
+    """
+    # Como [lo, hi) está ordenado por x, la franja es un tramo contiguo
+    # [a, b). Los bordes se comparan en distancia² para no perder empates por
+    # el redondeo de sqrt.
+    mid_x = xs[mid]
+    d = sqrt(mejor_dist2)
+    a = bisect_left(xs, mid_x - d, lo, mid)
+    while a > lo and (mid_x - xs[a - 1]) ** 2 <= mejor_dist2:
+        a -= 1
+    while a < mid and (mid_x - xs[a]) ** 2 > mejor_dist2:
+        a += 1
+    b = bisect_right(xs, mid_x + d, mid, hi)
+    while b < hi and (xs[b] - mid_x) ** 2 <= mejor_dist2:
+        b += 1
+    while b > mid and (xs[b - 1] - mid_x) ** 2 > mejor_dist2:
+        b -= 1
+
+    # Si la franja es chica conviene ordenarla directo; si no, se filtra el
+    # bloque ya ordenado por y. Así un nivel nunca cuesta más que recorrer
+    # el bloque.
+    m = b - a
+    if m == hi - lo:
+        franja = por_y
+    elif m * m.bit_length() < hi - lo:
+        franja = sorted(range(a, b), key=ys.__getitem__)
+    else:
+        franja = [p for p in por_y if a <= p < b]
+
+    for s in range(m):
+        pa = franja[s]
+        izquierda = pa < mid
+        xa = xs[pa]
+        ya = ys[pa]
+        for t in range(s + 1, m):
+            pb = franja[t]
+            dy = ys[pb] - ya
+            if dy * dy > mejor_dist2:
+                break
+            if (pb < mid) == izquierda:
+                continue  # mismo lado: ya se vio en un nivel anterior
+            dx = xs[pb] - xa
+            d2 = dx * dx + dy * dy
+            if d2 < mejor_dist2:
+                mejor_dist2 = d2
+                empatados = [(pa, pb) if pa < pb else (pb, pa)]
+            elif d2 == mejor_dist2:
+                empatados.append((pa, pb) if pa < pb else (pb, pa))
+
+    return mejor_dist2, empatados, m
+
+
+def par_mas_cercano_dyv_indices(puntos: List[Avion]) -> ResultadoColision:
+    """
+    Divide y vencerás sin recursión ni copias por nivel.
+
+    Las posiciones ordenadas por (x, índice) se parten por posición, no por
+    valor, así que los x repetidos no desbalancean nada. Se resuelven bloques
+    de _HOJA_DYV por fuerza bruta y después se mezclan de a pares, duplicando
+    el ancho: la mezcla deja cada bloque ordenado por y (como un merge sort)
+    y la franja solo compara pares que cruzan la división (con <=, para no
+    perder empates). O(n log n) de tiempo y O(n) de memoria extra, más los
+    pares empatados que se devuelvan.
+    """
+    n = len(puntos)
+    if n < 2:
+        return ResultadoColision(float("inf"), [])
+
+    stats = activas()
+    if stats is not None:
+        t0 = perf_counter()
+
+    orig = array("l", sorted(range(n), key=lambda i: (puntos[i].x, i)))
+    xs = array("d", (puntos[i].x for i in orig))
+    ys = array("d", (puntos[i].y for i in orig))
+
+    # py: posiciones ordenadas por y dentro de cada bloque del nivel actual
+    py = array("l", range(n))
+    aux = array("l", py)
+
+    mejor_dist2 = float("inf")
+    # pares empatados como posiciones (a, b) con a < b
+    empatados: List[Tuple[int, int]] = []
+
+    if stats is not None:
+        t1 = perf_counter()
+        stats.tiempo("dyv_indices.orden", t1 - t0)
+
+    # Hojas: fuerza bruta y orden por y
+    for lo in range(0, n, _HOJA_DYV):
+        hi = min(lo + _HOJA_DYV, n)
+        for a in range(lo, hi):
+            xa = xs[a]
+            ya = ys[a]
+            for b in range(a + 1, hi):
+                dx = xs[b] - xa
+                dy = ys[b] - ya
+                d2 = dx * dx + dy * dy
+                if d2 < mejor_dist2:
+                    mejor_dist2 = d2
+                    empatados = [(a, b)]
+                elif d2 == mejor_dist2:
+                    empatados.append((a, b))
+        py[lo:hi] = array("l", sorted(range(lo, hi), key=ys.__getitem__))
+
+    if stats is not None:
+        t2 = perf_counter()
+        stats.tiempo("dyv_indices.hojas", t2 - t1)
+        completas, resto = divmod(n, _HOJA_DYV)
+        stats.contar(
+            "dyv_indices.distancias_hojas",
+            completas * _HOJA_DYV * (_HOJA_DYV - 1) // 2 + resto * (resto - 1) // 2,
+        )
+
+    ancho = _HOJA_DYV
+    while ancho < n:
+        if stats is not None:
+            stats.contar("dyv_indices.niveles")
+        for lo in range(0, n, 2 * ancho):
+            mid = lo + ancho
+            hi = min(lo + 2 * ancho, n)
+            if mid >= hi:
+                aux[lo:hi] = py[lo:hi]
+                continue
+
+            # Mezcla por y de [lo, mid) y [mid, hi): son dos tramos ya
+            # ordenados y timsort los une en una sola pasada lineal.
+            por_y = sorted(py[lo:hi], key=ys.__getitem__)
+            aux[lo:hi] = array("l", por_y)
+
+            mejor_dist2, empatados, m = _unir_franja(
+                xs, ys, lo, mid, hi, por_y, mejor_dist2, empatados
+            )
+
+            if stats is not None:
+                stats.contar("dyv_indices.franja", m)
+                stats.maximo("dyv_indices.franja", m)
+
+        py, aux = aux, py
+        ancho *= 2
+
+    pares = sorted((orig[a], orig[b]) if orig[a] < orig[b] else (orig[b], orig[a]) for a, b in empatados)
+    if stats is not None:
+        stats.tiempo("dyv_indices.mezcla", perf_counter() - t2)
+        stats.contar("dyv_indices.pares", len(pares))
+    return ResultadoColision(sqrt(mejor_dist2), [(puntos[i], puntos[j]) for i, j in pares])
+
+
+# par más cercano con línea de barrido
+
+def par_mas_cercano_barrido(puntos: List[Avion]) -> ResultadoColision:
+    """
+    Par más cercano barriendo de izquierda a derecha: se ordena una vez por x
+    y se mantiene la ventana de aviones a distancia <= d en x, ordenada por y.
+    Cada avión nuevo solo se compara con los de la ventana en [y - d, y + d].
+    Devuelve todos los pares empatados, en el mismo orden que fuerza bruta.
+    """
+    n = len(puntos)
+    if n < 2:
+        return ResultadoColision(float("inf"), [])
+
+    stats = activas()
+    if stats is not None:
+        t0 = perf_counter()
+
+    orden = sorted(range(n), key=lambda i: puntos[i].x)
+
+    if stats is not None:
+        t1 = perf_counter()
+        stats.tiempo("barrido.orden", t1 - t0)
+
+    # ventana activa: (y, índice) ordenada por y
+    activos: List[Tuple[float, int]] = []
+    mejor_dist2 = float("inf")
+    d = float("inf")
+    empatados: List[Tuple[int, int]] = []
+    izq = 0
+
+    for i in orden:
+        p = puntos[i]
+
+        # Sale de la ventana lo que quedó a más de d en x (dx == d se queda,
+        # puede empatar).
+        while izq < n:
+            q = puntos[orden[izq]]
+            dx = p.x - q.x
+            if dx * dx <= mejor_dist2:
+                break
+            k = bisect_left(activos, (q.y, orden[izq]))
+            del activos[k]
+            izq += 1
+
+        k = bisect_left(activos, (p.y - d, -1))
+        tope = p.y + d
+        while k < len(activos) and activos[k][0] <= tope:
+            j = activos[k][1]
+            d2 = _dist2(p, puntos[j])
+            if d2 < mejor_dist2:
+                mejor_dist2 = d2
+                d = sqrt(d2)
+                tope = p.y + d
+                empatados = [(j, i) if j < i else (i, j)]
+            elif d2 == mejor_dist2:
+                empatados.append((j, i) if j < i else (i, j))
+            k += 1
+
+        insort(activos, (p.y, i))
+
+    empatados.sort()
+    if stats is not None:
+        stats.tiempo("barrido.recorrido", perf_counter() - t1)
+        stats.contar("barrido.pares", len(empatados))
+    return ResultadoColision(d, [(puntos[i], puntos[j]) for i, j in empatados])
+
+
 # colisiones segun el umbral
 
-def pares_en_riesgo(puntos: List[Avion], umbral: float) -> tuple[float, List[ParAviones]]:
+def pares_en_riesgo(
+    puntos: List[Avion], umbral: float, progreso: Progreso | None = None
+) -> tuple[float, ParesIndexados]:
 
     n = len(puntos)
     if n < 2:
-        return float("inf"), []
+        return float("inf"), ParesIndexados(puntos)
 
     umbral2 = umbral * umbral
     mejor_dist2 = float("inf")
-    pares_riesgo: List[ParAviones] = []
+    pares_riesgo = ParesIndexados(puntos)
 
     for i in range(n):
+        if progreso is not None and i % _PASO_PROGRESO == 0:
+            # la fila i tiene n - i - 1 pares
+            progreso(1 - ((n - i) / n) ** 2)
         for j in range(i + 1, n):
             d2 = _dist2(puntos[i], puntos[j])
 
@@ -139,6 +418,335 @@ def pares_en_riesgo(puntos: List[Avion], umbral: float) -> tuple[float, List[Par
 
       
             if d2 <= umbral2:
-                pares_riesgo.append((puntos[i], puntos[j]))
+                pares_riesgo.agregar(i, j)
 
+    stats = activas()
+    if stats is not None:
+        stats.contar("riesgo.distancias", n * (n - 1) // 2)
+        stats.contar("riesgo.pares", len(pares_riesgo))
     return sqrt(mejor_dist2), pares_riesgo
+
+
+def iterar_indices_fuerza_bruta(
+    puntos: List[Avion], umbral: float, progreso: Progreso | None = None
+) -> Iterator[Tuple[int, int, float]]:
+    """Los pares de pares_en_riesgo de a uno, como (i, j, distancia²)."""
+    umbral2 = umbral * umbral
+    n = len(puntos)
+    for i in range(n):
+        if progreso is not None and i % _PASO_PROGRESO == 0:
+            progreso(1 - ((n - i) / n) ** 2)
+        pa = puntos[i]
+        for j in range(i + 1, n):
+            d2 = _dist2(pa, puntos[j])
+            if d2 <= umbral2:
+                yield i, j, d2
+
+
+# colisiones segun el umbral usando una grilla uniforme
+
+_VECINOS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+
+def _construir_grilla(puntos: List[Avion], tam_celda: float) -> Dict[Tuple[int, int], List[int]]:
+    """Agrupa los índices de los aviones por celda de lado tam_celda."""
+    grilla: Dict[Tuple[int, int], List[int]] = {}
+    for i, p in enumerate(puntos):
+        clave = (floor(p.x / tam_celda), floor(p.y / tam_celda))
+        celda = grilla.get(clave)
+        if celda is None:
+            grilla[clave] = [i]
+        else:
+            celda.append(i)
+    return grilla
+
+
+def _recorrer_grilla(
+    puntos: List[Avion],
+    umbral: float,
+    grilla: Dict[Tuple[int, int], List[int]] | None,
+    progreso: Progreso | None = None,
+) -> Iterator[Tuple[int, int, float]]:
+    """
+    (i, j, distancia²) para cada par a distancia <= umbral, en el mismo orden
+    que fuerza bruta. Es el único recorrido de la grilla: la lista, el conteo
+    y el iterador se arman encima.
+    grilla: la de _construir_grilla(puntos, umbral); None con umbral <= 0
+    """
+    if umbral <= 0:
+        # Solo cuentan los aviones en la misma posición exacta.
+        iguales: Dict[Tuple[float, float], List[int]] = {}
+        for i, p in enumerate(puntos):
+            iguales.setdefault((p.x, p.y), []).append(i)
+        for i, p in enumerate(puntos):
+            for j in iguales[(p.x, p.y)]:
+                if j > i:
+                    yield i, j, 0.0
+        return
+
+    umbral2 = umbral * umbral
+    candidatos: List[Tuple[int, float]] = []
+
+    # Recorrer por índice y quedarse con j > i deja los pares ya ordenados.
+    n = len(puntos)
+    for i, pa in enumerate(puntos):
+        if progreso is not None and i % _PASO_PROGRESO == 0:
+            progreso(i / n)
+        cx = floor(pa.x / umbral)
+        cy = floor(pa.y / umbral)
+        for dx, dy in _VECINOS:
+            celda = grilla.get((cx + dx, cy + dy))
+            if celda is None:
+                continue
+            for j in celda:
+                if j <= i:
+                    continue
+                d2 = _dist2(pa, puntos[j])
+                if d2 <= umbral2:
+                    candidatos.append((j, d2))
+        if candidatos:
+            candidatos.sort()
+            for j, d2 in candidatos:
+                yield i, j, d2
+            candidatos.clear()
+
+
+def _indices_en_riesgo_grilla(
+    puntos: List[Avion],
+    umbral: float,
+    progreso: Progreso | None = None,
+    empates: List[Tuple[int, int]] | None = None,
+) -> Tuple[float, ParesIndexados]:
+    """
+    Devuelve (mejor_dist2, pares) con todos los pares (i, j), i < j,
+    cuya distancia es <= umbral, en el mismo orden que fuerza bruta.
+    mejor_dist2 es la mínima entre esos pares.
+    empates: si se da, se llena con los pares a distancia mejor_dist2
+    """
+    mejor_dist2 = float("inf")
+    pares = ParesIndexados(puntos)
+
+    stats = activas() if umbral > 0 else None
+    if stats is not None:
+        t0 = perf_counter()
+
+    grilla = _construir_grilla(puntos, umbral) if umbral > 0 else None
+
+    if stats is not None:
+        t1 = perf_counter()
+        stats.tiempo("grilla.construccion", t1 - t0)
+
+    for i, j, d2 in _recorrer_grilla(puntos, umbral, grilla, progreso):
+        if d2 < mejor_dist2:
+            mejor_dist2 = d2
+            if empates is not None:
+                empates.clear()
+                empates.append((i, j))
+        elif d2 == mejor_dist2 and empates is not None:
+            empates.append((i, j))
+        pares.agregar(i, j)
+
+    if stats is not None:
+        n = len(puntos)
+        stats.tiempo("grilla.recorrido", perf_counter() - t1)
+        stats.contar("grilla.celdas", len(grilla))
+        stats.maximo("grilla.ocupacion", max(map(len, grilla.values()), default=0))
+        # Cada par de aviones en celdas vecinas se compara una vez.
+        vecinos = 0
+        for (cx, cy), celda in grilla.items():
+            for dx, dy in _VECINOS:
+                otra = grilla.get((cx + dx, cy + dy))
+                if otra is not None:
+                    vecinos += len(celda) * len(otra)
+        stats.contar("grilla.distancias", (vecinos - n) // 2)
+        stats.contar("grilla.pares", len(pares))
+
+    return mejor_dist2, pares
+
+
+def pares_en_riesgo_grilla(
+    puntos: List[Avion], umbral: float, progreso: Progreso | None = None
+) -> tuple[float, ParesIndexados]:
+    """
+    Igual que pares_en_riesgo, pero cada avión solo se compara con los de su
+    celda y las 8 vecinas (celdas de lado umbral).
+    Si ningún par queda bajo el umbral, la distancia mínima global se obtiene
+    con divide y vencerás.
+    """
+    n = len(puntos)
+    if n < 2:
+        return float("inf"), ParesIndexados(puntos)
+
+    mejor_dist2, pares_riesgo = _indices_en_riesgo_grilla(puntos, umbral, progreso)
+
+    if not pares_riesgo:
+        return par_mas_cercano_dyv(puntos).distancia, pares_riesgo
+
+    return sqrt(mejor_dist2), pares_riesgo
+
+
+# pares en riesgo sin armar la lista completa
+
+def iterar_pares_en_riesgo(
+    puntos: List[Avion], umbral: float, progreso: Progreso | None = None
+) -> Iterator[Tuple[ParAviones, float]]:
+    """
+    Entrega ((a, b), distancia) para cada par a distancia <= umbral, a medida
+    que la grilla los encuentra y en el mismo orden que fuerza bruta. Si se
+    deja de consumir, el recorrido se corta ahí.
+    """
+    for i, j, d2 in iterar_indices_grilla(puntos, umbral, progreso):
+        yield (puntos[i], puntos[j]), sqrt(d2)
+
+
+def iterar_indices_grilla(
+    puntos: List[Avion], umbral: float, progreso: Progreso | None = None
+) -> Iterator[Tuple[int, int, float]]:
+    """Como iterar_pares_en_riesgo, con los pares como (i, j, distancia²)."""
+    grilla = _construir_grilla(puntos, umbral) if umbral > 0 else None
+    yield from _recorrer_grilla(puntos, umbral, grilla, progreso)
+
+
+def contar_pares_en_riesgo(
+    puntos: List[Avion], umbral: float, progreso: Progreso | None = None
+) -> int:
+    """Cantidad de pares a distancia <= umbral, sin guardar ninguno."""
+    return sum(1 for _ in iterar_indices_grilla(puntos, umbral, progreso))
+
+
+def top_k(pares: Iterable[Tuple[ParAviones, float]], k: int) -> List[Tuple[ParAviones, float]]:
+    """
+    Los k pares más cercanos de pares ((a, b), distancia), del más cercano al
+    más lejano (sirve igual con distancia²). Guarda solo k a la vez; los
+    empates se resuelven a favor del que llegó primero.
+    """
+    if k <= 0:
+        return []
+    # montículo de máximos con (-distancia, -orden de llegada)
+    mejores: List[Tuple[float, int, ParAviones]] = []
+    for orden, (par, d) in enumerate(pares):
+        if len(mejores) < k:
+            heapq.heappush(mejores, (-d, -orden, par))
+        elif (-d, -orden) > mejores[0][:2]:
+            heapq.heapreplace(mejores, (-d, -orden, par))
+    return [(par, -d) for d, _, par in sorted(mejores, key=lambda e: (-e[0], -e[1]))]
+
+
+def top_k_pares_en_riesgo(
+    puntos: List[Avion], umbral: float, k: int, progreso: Progreso | None = None
+) -> List[Tuple[ParAviones, float]]:
+    """Los k pares más cercanos entre los que están a distancia <= umbral."""
+    return top_k(iterar_pares_en_riesgo(puntos, umbral, progreso), k)
+
+
+def pares_en_riesgo_kdtree(
+    puntos: List[Avion],
+    umbral: float,
+    progreso: Progreso | None = None,
+    arbol: ArbolKD | None = None,
+) -> tuple[float, ParesIndexados]:
+    """
+    Igual que pares_en_riesgo, con consultas de radio sobre un árbol k-d.
+    arbol: índice ya construido sobre puntos, para no pagar la construcción
+    en cada llamada.
+    """
+    n = len(puntos)
+    if n < 2:
+        return float("inf"), ParesIndexados(puntos)
+
+    stats = activas()
+    if stats is not None:
+        t0 = perf_counter()
+
+    if arbol is None:
+        arbol = ArbolKD(puntos)
+
+    if stats is not None:
+        t1 = perf_counter()
+        stats.tiempo("kdtree.construccion", t1 - t0)
+
+    mejor_dist2, pares_riesgo = arbol.pares_dentro_de(umbral, progreso)
+
+    if stats is not None:
+        stats.tiempo("kdtree.consultas", perf_counter() - t1)
+        stats.contar("kdtree.pares", len(pares_riesgo))
+
+    if not pares_riesgo:
+        return par_mas_cercano_dyv(puntos).distancia, pares_riesgo
+
+    return sqrt(mejor_dist2), pares_riesgo
+
+
+def iterar_indices_kdtree(
+    puntos: List[Avion],
+    umbral: float,
+    progreso: Progreso | None = None,
+    arbol: ArbolKD | None = None,
+) -> Iterator[Tuple[int, int, float]]:
+    """Los pares de pares_en_riesgo_kdtree de a uno, como (i, j, distancia²)."""
+    if arbol is None:
+        arbol = ArbolKD(puntos)
+    return arbol.iterar_pares_dentro_de(umbral, progreso)
+
+
+# vecino más cercano de cada avión
+
+def vecinos_mas_cercanos(
+    puntos: List[Avion], progreso: Progreso | None = None, arbol: ArbolKD | None = None
+) -> VecinosCercanos:
+    """
+    Vecino más cercano (y su distancia) de cada avión, con un árbol k-d:
+    O(n log n) en vez de n recorridos de fuerza bruta. Si hay empate se
+    elige el de menor índice.
+    arbol: índice ya construido sobre puntos, si el llamador tiene uno
+    """
+    stats = activas()
+    if stats is not None:
+        t0 = perf_counter()
+
+    if arbol is None:
+        arbol = ArbolKD(puntos)
+
+    if stats is not None:
+        t1 = perf_counter()
+        stats.tiempo("vecinos.construccion", t1 - t0)
+
+    indices, dist2 = arbol.vecino_de_cada_uno(progreso)
+    distancias = array("d", map(sqrt, dist2))
+
+    if stats is not None:
+        stats.tiempo("vecinos.busqueda", perf_counter() - t1)
+    return VecinosCercanos(puntos, indices, distancias)
+
+
+# Motores disponibles para listar las parejas en riesgo.
+# Todos se llaman como motor(puntos, umbral, progreso=None).
+MOTORES_RIESGO: Dict[str, Callable[..., tuple[float, Sequence[ParAviones]]]] = {
+    "fuerza_bruta": pares_en_riesgo,
+    "grilla": pares_en_riesgo_grilla,
+    "kdtree": pares_en_riesgo_kdtree,
+}
+
+# Los mismos motores entregando los pares de a uno: iterador(puntos, umbral,
+# progreso=None) da (i, j, distancia²) con i < j, en el orden de cada motor.
+# La memoria no depende de cuántos pares haya.
+ITERADORES_RIESGO: Dict[str, Callable[..., Iterator[Tuple[int, int, float]]]] = {
+    "fuerza_bruta": iterar_indices_fuerza_bruta,
+    "grilla": iterar_indices_grilla,
+    "kdtree": iterar_indices_kdtree,
+}
+
+# Solo para coordenadas enteras (lanza ValueError con las demás)
+from .enteros import iterar_indices_enteros, pares_en_riesgo_enteros  # noqa: E402
+
+MOTORES_RIESGO["enteros"] = pares_en_riesgo_enteros
+ITERADORES_RIESGO["enteros"] = iterar_indices_enteros
+
+
+try:
+    from .vectorizado import iterar_indices_np, pares_en_riesgo_np
+except ImportError:  # numpy es opcional
+    pass
+else:
+    MOTORES_RIESGO["numpy"] = pares_en_riesgo_np
+    ITERADORES_RIESGO["numpy"] = iterar_indices_np
@@ -0,0 +1,185 @@
+# colisiones/analisis.py
+"""
+Análisis completo de una flota en una sola pasada.
+
+La distancia mínima global, sus pares empatados y todos los pares bajo el
+umbral salen del mismo recorrido de la grilla: si hay algún par bajo el
+umbral, el mínimo global está entre ellos. Solo cuando no hay ninguno hace
+falta buscar el par más cercano aparte.
+
+Con un límite, la lista completa no se arma con ningún motor: se cuentan
+los pares y se guardan solo los más cercanos.
+
+Es el punto de entrada de main y de la interfaz: con motor MOTOR_AUTO el
+motor lo elige seleccion.elegir_motor según la flota y el umbral.
+"""
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from functools import partial
+from math import sqrt
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from .algoritmos import (
+    ITERADORES_RIESGO,
+    MOTORES_RIESGO,
+    ParAviones,
+    Progreso,
+    _dist2,
+    _indices_en_riesgo_grilla,
+    par_mas_cercano_dyv_indices,
+    pares_en_riesgo_kdtree,
+)
+from .cache import CacheResultados, huella_flota
+from .kdtree import ArbolKD
+from .modelos import Avion, ParesIndexados, ResultadoColision
+from .seleccion import MOTOR_AUTO, elegir_motor
+
+
+@dataclass
+class Analisis:
+    """
+    - umbral: umbral usado
+    - minimo: distancia mínima global y todos sus pares empatados
+    - pares_riesgo: pares (i, j), i < j, a distancia <= umbral; None si se
+      pidió un límite
+    - total_riesgo: cantidad de pares a distancia <= umbral
+    - mas_cercanos: con límite, los pares más cercanos ((a, b), distancia),
+      del más cercano al más lejano
+    - motor: motor usado (el elegido, si se pidió MOTOR_AUTO)
+    """
+    umbral: float
+    minimo: ResultadoColision
+    pares_riesgo: Optional[ParesIndexados]
+    total_riesgo: int = 0
+    mas_cercanos: List[Tuple[ParAviones, float]] = field(default_factory=list)
+    motor: str = "grilla"
+
+
+def analizar(
+    puntos: Sequence[Avion],
+    umbral: float,
+    motor: str = MOTOR_AUTO,
+    progreso: Progreso | None = None,
+    arbol: ArbolKD | None = None,
+    limite: int | None = None,
+    cache: CacheResultados | None = None,
+) -> Analisis:
+    """
+    Mínimo global y pares en riesgo de la flota.
+    motor: con "grilla" todo sale de una pasada; con otro motor de
+    MOTORES_RIESGO los empates se sacan de la lista de pares; con
+    MOTOR_AUTO se usa el que el modelo de costo estima más rápido
+    arbol: índice ya construido, para el motor "kdtree"
+    limite: si se da, no se devuelve la lista de pares sino solo los limite
+    más cercanos y el total; los pares se recorren de a uno con el iterador
+    del motor (ITERADORES_RIESGO), así la memoria no depende de cuántos haya
+    cache: si se da, los pares y el mínimo se toman de ahí cuando ya están (o
+    se filtran de un umbral mayor) y lo calculado se guarda
+    """
+    if motor == MOTOR_AUTO:
+        motor = elegir_motor(puntos, umbral)
+
+    if len(puntos) < 2:
+        pares = None if limite is not None else ParesIndexados(puntos)
+        return Analisis(umbral, ResultadoColision(float("inf"), []), pares, motor=motor)
+
+    huella = huella_flota(puntos) if cache is not None else None
+
+    def minimo_global() -> ResultadoColision:
+        # Nada bajo el umbral: el mínimo global hay que buscarlo aparte.
+        if cache is not None:
+            return cache.par_mas_cercano(puntos, huella=huella)
+        return par_mas_cercano_dyv_indices(puntos)
+
+    if limite is not None:
+        iterar = ITERADORES_RIESGO.get(motor)
+        if iterar is None:
+            raise ValueError(f"el motor {motor!r} no puede entregar los pares de a uno: no admite limite")
+        if motor == "kdtree":
+            iterar = partial(iterar, arbol=arbol)
+        if cache is not None:
+            pares_iter = cache.iterar_pares_en_riesgo(puntos, umbral, iterar, progreso, huella=huella)
+        else:
+            pares_iter = iterar(puntos, umbral, progreso)
+        return _analizar_acotado(puntos, umbral, limite, pares_iter, motor, minimo_global)
+
+    if motor == "grilla" and cache is None:
+        empates: List[Tuple[int, int]] = []
+        mejor_dist2, pares = _indices_en_riesgo_grilla(puntos, umbral, progreso, empates)
+        empates.sort()
+    else:
+        calcular = partial(pares_en_riesgo_kdtree, arbol=arbol) if motor == "kdtree" else MOTORES_RIESGO[motor]
+        if cache is not None:
+            _, pares = cache.pares_en_riesgo(puntos, umbral, calcular, progreso, huella=huella)
+        else:
+            _, pares = calcular(puntos, umbral, progreso)
+        if not isinstance(pares, ParesIndexados):
+            posicion = {id(p): i for i, p in enumerate(puntos)}
+            indexados = ParesIndexados(puntos)
+            for a, b in pares:
+                indexados.agregar(posicion[id(a)], posicion[id(b)])
+            pares = indexados
+        mejor_dist2 = float("inf")
+        empates = []
+        for i, j in pares.indices():
+            d2 = _dist2(puntos[i], puntos[j])
+            if d2 < mejor_dist2:
+                mejor_dist2 = d2
+                empates = [(i, j)]
+            elif d2 == mejor_dist2:
+                empates.append((i, j))
+
+    if not pares:
+        minimo = minimo_global()
+    else:
+        minimo = ResultadoColision(sqrt(mejor_dist2), [(puntos[i], puntos[j]) for i, j in empates])
+    return Analisis(umbral, minimo, pares, len(pares), motor=motor)
+
+
+def _analizar_acotado(
+    puntos: Sequence[Avion],
+    umbral: float,
+    limite: int,
+    pares: Iterator[Tuple[int, int, float]],
+    motor: str,
+    minimo_global: Callable[[], ResultadoColision],
+) -> Analisis:
+    """
+    Versión con límite del análisis: recorre los pares (i, j, distancia²) a
+    medida que el motor los entrega y guarda el mínimo con sus empates, la
+    cuenta y un montículo de tamaño limite. La memoria no depende de cuántos
+    pares haya. Los empates se resuelven por (i, j), así el resultado no
+    depende del orden en que cada motor entrega los pares.
+    """
+    mejor_dist2 = float("inf")
+    empates: List[Tuple[int, int]] = []
+    total = 0
+    # montículo de máximos con (-d2, -i, -j): arriba, el peor de los guardados
+    mejores: List[Tuple[float, int, int]] = []
+
+    for i, j, d2 in pares:
+        total += 1
+        if d2 <= mejor_dist2:
+            if d2 < mejor_dist2:
+                mejor_dist2 = d2
+                empates = [(i, j)]
+            else:
+                empates.append((i, j))
+        if limite <= 0:
+            continue
+        if len(mejores) < limite:
+            heapq.heappush(mejores, (-d2, -i, -j))
+        elif (-d2, -i, -j) > mejores[0]:
+            heapq.heapreplace(mejores, (-d2, -i, -j))
+
+    mas_cercanos = [
+        ((puntos[-i], puntos[-j]), sqrt(-d2)) for d2, i, j in sorted(mejores, reverse=True)
+    ]
+    if total == 0:
+        minimo = minimo_global()
+    else:
+        empates.sort()
+        minimo = ResultadoColision(sqrt(mejor_dist2), [(puntos[i], puntos[j]) for i, j in empates])
+    return Analisis(umbral, minimo, None, total, mas_cercanos, motor)
@@ -0,0 +1,363 @@
+# colisiones/benchmark.py
+"""
+Banco de pruebas de los motores de colisión.
+
+Recorre tamaños, distribuciones y umbrales, mide cada motor varias veces
+(mediana y p95 del tiempo, pico de memoria con tracemalloc) y guarda todo
+en JSON para comparar corridas.
+
+    python -m colisiones.benchmark --tamanos 100 1000 10000 --salida base.json
+    python -m colisiones.benchmark --salida nueva.json --comparar base.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from math import sqrt
+from random import Random
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .algoritmos import (
+    MOTORES_RIESGO,
+    fuerza_bruta,
+    par_mas_cercano_barrido,
+    par_mas_cercano_dyv,
+    par_mas_cercano_dyv_indices,
+)
+from .enteros import coordenadas_enteras, par_mas_cercano_enteros
+from .generador import generar_puntos
+from .modelos import Avion
+from .paralelo import par_mas_cercano_paralelo
+from .seleccion import PERFILES
+
+
+# ==============================
+# Distribuciones
+# ==============================
+
+def _lado_plano(n: int) -> int:
+    """Lado del plano para mantener ~100 unidades² por avión (mínimo 1000)."""
+    return max(1000, int(sqrt(n) * 10))
+
+
+def _uniforme(n: int, seed: int) -> List[Avion]:
+    lado = _lado_plano(n)
+    return generar_puntos(n, lado, lado, seed=seed)
+
+
+def _agrupada(n: int, seed: int) -> List[Avion]:
+    """Aviones alrededor de unos pocos centros (aeropuertos)."""
+    rnd = Random(seed)
+    lado = _lado_plano(n)
+    centros = [(rnd.uniform(0, lado), rnd.uniform(0, lado)) for _ in range(max(1, n // 1000))]
+    sigma = lado / 50
+    puntos: List[Avion] = []
+    for i in range(n):
+        cx, cy = centros[rnd.randrange(len(centros))]
+        x = float(round(rnd.gauss(cx, sigma)))
+        y = float(round(rnd.gauss(cy, sigma)))
+        puntos.append(Avion(id=i, x=x, y=y))
+    return puntos
+
+
+def _colineal(n: int, seed: int) -> List[Avion]:
+    """Todos los aviones sobre la misma vertical: peor caso para la franja."""
+    rnd = Random(seed)
+    lado = _lado_plano(n)
+    return [Avion(id=i, x=float(lado // 2), y=float(rnd.randint(0, lado))) for i in range(n)]
+
+
+def _duplicados(n: int, seed: int) -> List[Avion]:
+    """La mitad de los aviones repite la posición de otro."""
+    rnd = Random(seed)
+    puntos = _uniforme(n, seed)
+    for i in range(1, n, 2):
+        otro = puntos[rnd.randrange(i)]
+        puntos[i] = Avion(id=i, x=otro.x, y=otro.y)
+    return puntos
+
+
+DISTRIBUCIONES: Dict[str, Callable[[int, int], List[Avion]]] = {
+    "uniforme": _uniforme,
+    "agrupada": _agrupada,
+    "colineal": _colineal,
+    "duplicados": _duplicados,
+}
+
+try:
+    from .trafico import generar_trafico
+except ImportError:  # numpy es opcional
+    pass
+else:
+    DISTRIBUCIONES["trafico"] = lambda n, seed: generar_trafico(n, seed).a_aviones()
+
+
+# ==============================
+# Motores
+# ==============================
+
+@dataclass
+class Motor:
+    """
+    nombre: como aparece en los resultados
+    tipo: "par" (par más cercano) o "riesgo" (pares bajo umbral)
+    fn: función a medir
+    cuadratico: se salta por encima del límite de tamaño para O(n²)
+    enteros: solo acepta coordenadas enteras; se salta en las demás
+    degenera: distribuciones en las que se trata como cuadrático
+    """
+    nombre: str
+    tipo: str
+    fn: Callable
+    cuadratico: bool = False
+    enteros: bool = False
+    degenera: Tuple[str, ...] = ()
+
+
+def motores_disponibles() -> List[Motor]:
+    motores = [
+        Motor("fuerza_bruta", "par", fuerza_bruta, cuadratico=True),
+        # Con todos los x iguales, la partición por x <= mid_x manda la
+        # flota entera a un solo lado en cada nivel.
+        Motor("dyv", "par", par_mas_cercano_dyv, degenera=("colineal",)),
+        Motor("dyv_indices", "par", par_mas_cercano_dyv_indices),
+        Motor("barrido", "par", par_mas_cercano_barrido),
+        Motor("paralelo", "par", par_mas_cercano_paralelo),
+        Motor("enteros", "par", par_mas_cercano_enteros, enteros=True),
+    ]
+    # Los motores de pares en riesgo salen del registro, así no falta ninguno.
+    # Con numpy, "riesgo_numpy" incluye la conversión a columnas, como la
+    # pagaría un llamador.
+    for nombre, fn in sorted(MOTORES_RIESGO.items()):
+        perfil = PERFILES.get(nombre)
+        motores.append(Motor(
+            f"riesgo_{nombre}",
+            "riesgo",
+            fn,
+            cuadratico=nombre == "fuerza_bruta",
+            enteros=perfil is not None and perfil.requiere_enteras,
+            # Sobre una vertical el barrido cambia de eje, pero cada
+            # desplazamiento sigue siendo una pasada de numpy.
+            degenera=("colineal",) if nombre == "numpy" else (),
+        ))
+    try:
+        from .vectorizado import FlotaColumnar, fuerza_bruta_np, par_mas_cercano_dyv_np
+    except ImportError:  # numpy es opcional
+        return motores
+
+    motores += [
+        Motor("fuerza_bruta_np", "par",
+              lambda p: fuerza_bruta_np(FlotaColumnar.desde_aviones(p)), cuadratico=True),
+        Motor("dyv_np", "par",
+              lambda p: par_mas_cercano_dyv_np(FlotaColumnar.desde_aviones(p))),
+    ]
+    return motores
+
+
+# ==============================
+# Medición
+# ==============================
+
+@dataclass
+class Medicion:
+    motor: str
+    distribucion: str
+    n: int
+    umbral: Optional[float]
+    repeticiones: int
+    mediana_s: float
+    p95_s: float
+    min_s: float
+    memoria_pico_bytes: int
+
+
+def _medir(fn: Callable[[], object], repeticiones: int) -> tuple[List[float], int]:
+    tiempos: List[float] = []
+    for _ in range(repeticiones):
+        t0 = perf_counter()
+        fn()
+        tiempos.append(perf_counter() - t0)
+
+    # La memoria se mide en una corrida aparte: tracemalloc frena el código.
+    tracemalloc.start()
+    try:
+        fn()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return tiempos, pico
+
+
+def _p95(tiempos: List[float]) -> float:
+    if len(tiempos) < 2:
+        return tiempos[0]
+    return statistics.quantiles(tiempos, n=20, method="inclusive")[18]
+
+
+def ejecutar(
+    tamanos: List[int],
+    distribuciones: List[str],
+    umbrales: List[float],
+    motores: List[Motor],
+    repeticiones: int = 5,
+    limite_cuadratico: int = 5000,
+    seed: int = 42,
+    informar: Callable[[Medicion], None] | None = None,
+    avisar: Callable[[str], None] | None = None,
+) -> List[Medicion]:
+    """
+    Mide cada motor en cada caso. informar recibe cada medición apenas está
+    lista; avisar, una nota por cada caso que se salta por tamaño.
+    """
+    resultados: List[Medicion] = []
+
+    for distribucion in distribuciones:
+        for n in tamanos:
+            puntos = DISTRIBUCIONES[distribucion](n, seed)
+            enteras = coordenadas_enteras(puntos)
+            for motor in motores:
+                cuadratico = motor.cuadratico or distribucion in motor.degenera
+                if cuadratico and n > limite_cuadratico:
+                    if avisar is not None:
+                        motivo = "O(n²)" if motor.cuadratico else f"degenera en {distribucion}"
+                        avisar(f"{motor.nombre} omitido en {distribucion} n={n}: {motivo}, "
+                               f"límite {limite_cuadratico}")
+                    continue
+                if motor.enteros and not enteras:
+                    continue
+                casos = umbrales if motor.tipo == "riesgo" else [None]
+                for umbral in casos:
+                    if umbral is None:
+                        llamada = lambda: motor.fn(puntos)
+                    else:
+                        llamada = lambda: motor.fn(puntos, umbral)
+                    tiempos, pico = _medir(llamada, repeticiones)
+                    m = Medicion(
+                        motor=motor.nombre,
+                        distribucion=distribucion,
+                        n=n,
+                        umbral=umbral,
+                        repeticiones=repeticiones,
+                        mediana_s=statistics.median(tiempos),
+                        p95_s=_p95(tiempos),
+                        min_s=min(tiempos),
+                        memoria_pico_bytes=pico,
+                    )
+                    resultados.append(m)
+                    if informar is not None:
+                        informar(m)
+
+    return resultados
+
+
+def _clave(m: dict) -> tuple:
+    return m["motor"], m["distribucion"], m["n"], m["umbral"]
+
+
+def comparar(actual: List[dict], base: List[dict]) -> List[tuple[dict, dict, float]]:
+    """(actual, base, razón de medianas) para cada caso presente en ambas corridas."""
+    por_clave = {_clave(m): m for m in base}
+    filas = []
+    for m in actual:
+        b = por_clave.get(_clave(m))
+        if b is not None and b["mediana_s"] > 0:
+            filas.append((m, b, m["mediana_s"] / b["mediana_s"]))
+    return filas
+
+
+# ==============================
+# CLI
+# ==============================
+
+def _imprimir(m: Medicion) -> None:
+    umbral = "-" if m.umbral is None else f"{m.umbral:g}"
+    print(
+        f"{m.motor:<20} {m.distribucion:<11} n={m.n:<9} umbral={umbral:<6} "
+        f"mediana={m.mediana_s:.6f}s p95={m.p95_s:.6f}s "
+        f"memoria={m.memoria_pico_bytes / 1e6:.2f}MB",
+        flush=True,
+    )
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="colisiones.benchmark",
+        description="Compara los motores de colisión en varios tamaños y distribuciones.",
+    )
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument(
+        "--distribuciones", nargs="+", choices=sorted(DISTRIBUCIONES), default=sorted(DISTRIBUCIONES)
+    )
+    parser.add_argument("--umbrales", type=float, nargs="+", default=[5.0, 20.0])
+    parser.add_argument("--motores", nargs="+", help="nombres de motores (default: todos)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument(
+        "--limite-cuadratico",
+        type=int,
+        default=5000,
+        help="n máximo para los motores O(n²) y los que degeneran en la distribución "
+        "(default: 5000)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--salida", metavar="JSON", help="archivo donde guardar los resultados")
+    parser.add_argument("--comparar", metavar="JSON", help="resultados previos para comparar")
+    args = parser.parse_args(argv[1:])
+
+    motores = motores_disponibles()
+    if args.motores:
+        conocidos = {m.nombre for m in motores}
+        desconocidos = set(args.motores) - conocidos
+        if desconocidos:
+            parser.error(f"motores desconocidos: {', '.join(sorted(desconocidos))}")
+        motores = [m for m in motores if m.nombre in args.motores]
+
+    resultados = ejecutar(
+        tamanos=args.tamanos,
+        distribuciones=args.distribuciones,
+        umbrales=args.umbrales,
+        motores=motores,
+        repeticiones=args.repeticiones,
+        limite_cuadratico=args.limite_cuadratico,
+        seed=args.seed,
+        informar=_imprimir,
+        avisar=lambda nota: print(f"# {nota}", flush=True),
+    )
+    filas = [asdict(m) for m in resultados]
+
+    if args.salida:
+        documento = {
+            "meta": {
+                "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "repeticiones": args.repeticiones,
+                "seed": args.seed,
+            },
+            "resultados": filas,
+        }
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(documento, f, indent=2)
+        print(f"\nResultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)["resultados"]
+        print("\n=== Comparación con", args.comparar, "===")
+        for m, b, razon in comparar(filas, base):
+            marca = "  <-- más lento" if razon > 1.10 else ""
+            umbral = "-" if m["umbral"] is None else f"{m['umbral']:g}"
+            print(
+                f"{m['motor']:<20} {m['distribucion']:<11} n={m['n']:<9} umbral={umbral:<6} "
+                f"{b['mediana_s']:.6f}s -> {m['mediana_s']:.6f}s (x{razon:.2f}){marca}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv)
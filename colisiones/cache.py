@@ -0,0 +1,398 @@
+# colisiones/cache.py
+"""
+Caché LRU de resultados por huella de flota.
+
+La clave es un hash del contenido de la flota (ids y coordenadas), así que
+dos listas distintas con los mismos aviones comparten resultados. Los pares
+en riesgo se guardan con su distancia²: una consulta con un umbral menor se
+responde filtrando el resultado de un umbral mayor, sin volver a recorrer.
+
+La caché se puede guardar en disco (guardar / cargar) para que la usen
+corridas sucesivas; main la guarda en RUTA_CACHE.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from math import sqrt
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .algoritmos import Progreso, _dist2, par_mas_cercano_dyv_indices, pares_en_riesgo_grilla
+from .modelos import Avion, ParesIndexados, ResultadoColision
+
+
+def directorio_cache() -> str:
+    """Directorio de los archivos de caché: $XDG_CACHE_HOME/colisiones o ~/.cache/colisiones."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "colisiones")
+
+
+# Archivo donde main guarda la caché entre corridas
+RUTA_CACHE = os.environ.get("COLISIONES_CACHE") or os.path.join(directorio_cache(), "resultados.bin")
+
+# Memoria máxima por defecto (aproximada) de la caché
+MAX_BYTES = 64 * 1024 * 1024
+
+# Formato del archivo: cabecera (marca, versión, entradas) y, por entrada,
+# (huella, tipo, umbral, distancia, pares) seguido de las columnas en int64 /
+# float64 little-endian.
+_MARCA = b"COLC"
+_VERSION_ARCHIVO = 1
+_CABECERA = struct.Struct("<4sII")
+_ENTRADA = struct.Struct("<16sBddQ")
+_TIPOS = ("riesgo", "par")
+
+# Bytes estimados por par guardado (dos índices y una distancia²)
+_BYTES_POR_PAR = 24
+_BYTES_ENTRADA = 256
+
+
+def huella_flota(puntos: Sequence[Avion]) -> str:
+    """Hash del contenido de la flota, en orden."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(len(puntos).to_bytes(8, "little"))
+    h.update(array("q", (p.id for p in puntos)).tobytes())
+    h.update(array("d", (p.x for p in puntos)).tobytes())
+    h.update(array("d", (p.y for p in puntos)).tobytes())
+    return h.hexdigest()
+
+
+@dataclass
+class _EntradaRiesgo:
+    umbral: float
+    distancia_min: float
+    ia: array
+    ib: array
+    d2: array
+
+    def bytes(self) -> int:
+        return _BYTES_ENTRADA + _BYTES_POR_PAR * len(self.ia)
+
+
+@dataclass
+class _EntradaPar:
+    distancia: float
+    pares: List[Tuple[int, int]]
+
+    def bytes(self) -> int:
+        return _BYTES_ENTRADA + 16 * len(self.pares)
+
+
+class CacheResultados:
+    """
+    Caché LRU con tope de memoria para par_mas_cercano y pares_en_riesgo.
+    Se puede usar desde varios hilos.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entradas: OrderedDict[tuple, object] = OrderedDict()
+        # umbrales guardados por huella, para buscar supersets
+        self._umbrales: Dict[str, List[float]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.filtrados = 0
+        self.fallos = 0
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    @property
+    def bytes_usados(self) -> int:
+        return self._bytes
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._umbrales.clear()
+            self._bytes = 0
+
+    # ------------------------------
+    # Consultas
+    # ------------------------------
+    def pares_en_riesgo(
+        self,
+        puntos: Sequence[Avion],
+        umbral: float,
+        motor: Callable[..., tuple[float, Sequence]] = pares_en_riesgo_grilla,
+        progreso: Progreso | None = None,
+        huella: Optional[str] = None,
+    ) -> tuple[float, ParesIndexados]:
+        """
+        Igual que pares_en_riesgo. Si hay un resultado guardado para la misma
+        flota con umbral >= al pedido, se filtra ese; si no, se calcula con
+        motor y se guarda.
+        huella: huella_flota(puntos), si el llamador ya la tiene
+        """
+        if huella is None:
+            huella = huella_flota(puntos)
+
+        with self._lock:
+            entrada = self._buscar_superset(huella, umbral)
+            if entrada is not None:
+                if entrada.umbral == umbral:
+                    self.aciertos += 1
+                    return entrada.distancia_min, ParesIndexados(puntos, entrada.ia, entrada.ib)
+                self.filtrados += 1
+            else:
+                self.fallos += 1
+
+        if entrada is not None:
+            return entrada.distancia_min, self._filtrar(puntos, entrada, umbral)
+
+        distancia_min, pares = motor(puntos, umbral, progreso)
+        ia, ib = self._columnas(puntos, pares)
+        d2 = array("d", (_dist2(puntos[i], puntos[j]) for i, j in zip(ia, ib)))
+        nueva = _EntradaRiesgo(umbral, distancia_min, ia, ib, d2)
+        with self._lock:
+            self._guardar((huella, "riesgo", umbral), nueva)
+        return distancia_min, ParesIndexados(puntos, ia, ib)
+
+    def iterar_pares_en_riesgo(
+        self,
+        puntos: Sequence[Avion],
+        umbral: float,
+        iterar: Callable[..., Iterator[Tuple[int, int, float]]],
+        progreso: Progreso | None = None,
+        huella: Optional[str] = None,
+    ) -> Iterator[Tuple[int, int, float]]:
+        """
+        Como pares_en_riesgo, pero entrega los pares (i, j, distancia²) de a
+        uno, como los iteradores de ITERADORES_RIESGO. Si hay un resultado
+        guardado que alcance se recorre ese; si no, se recorre
+        iterar(puntos, umbral, progreso) y los pares se van juntando mientras
+        quepan en max_bytes. Si no caben se dejan de juntar y no se guarda
+        nada: la memoria queda acotada por el tope de la caché.
+        """
+        if huella is None:
+            huella = huella_flota(puntos)
+
+        with self._lock:
+            entrada = self._buscar_superset(huella, umbral)
+            if entrada is None:
+                self.fallos += 1
+            elif entrada.umbral == umbral:
+                self.aciertos += 1
+            else:
+                self.filtrados += 1
+
+        if entrada is not None:
+            umbral2 = umbral * umbral
+            for i, j, d2 in zip(entrada.ia, entrada.ib, entrada.d2):
+                if d2 <= umbral2:
+                    yield i, j, d2
+            return
+
+        n = len(puntos)
+        max_pares = (self.max_bytes - _BYTES_ENTRADA) // _BYTES_POR_PAR
+        claves: Optional[array] = array("q")  # i * n + j
+        distancias2 = array("d")
+        for i, j, d2 in iterar(puntos, umbral, progreso):
+            if claves is not None:
+                if len(claves) < max_pares:
+                    claves.append(i * n + j)
+                    distancias2.append(d2)
+                else:
+                    claves = distancias2 = None
+            yield i, j, d2
+        if claves is None:
+            return
+
+        # Guardados en el orden de fuerza bruta, como los devuelve pares_en_riesgo.
+        orden = sorted(range(len(claves)), key=claves.__getitem__)
+        ia = array("l", (claves[k] // n for k in orden))
+        ib = array("l", (claves[k] % n for k in orden))
+        d2 = array("d", (distancias2[k] for k in orden))
+        if d2:
+            distancia_min = sqrt(min(d2))
+        else:
+            distancia_min = self.par_mas_cercano(puntos, huella=huella).distancia
+        with self._lock:
+            self._guardar((huella, "riesgo", umbral), _EntradaRiesgo(umbral, distancia_min, ia, ib, d2))
+
+    def par_mas_cercano(
+        self,
+        puntos: Sequence[Avion],
+        motor: Callable[[Sequence[Avion]], ResultadoColision] = par_mas_cercano_dyv_indices,
+        huella: Optional[str] = None,
+    ) -> ResultadoColision:
+        """Igual que motor(puntos), guardando el resultado por huella."""
+        if huella is None:
+            huella = huella_flota(puntos)
+        clave = (huella, "par", None)
+
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+            else:
+                self.fallos += 1
+
+        if entrada is None:
+            res = motor(puntos)
+            posicion = {id(p): i for i, p in enumerate(puntos)}
+            entrada = _EntradaPar(
+                res.distancia, [(posicion[id(a)], posicion[id(b)]) for a, b in res.pares]
+            )
+            with self._lock:
+                self._guardar(clave, entrada)
+            return res
+
+        return ResultadoColision(
+            entrada.distancia, [(puntos[i], puntos[j]) for i, j in entrada.pares]
+        )
+
+    # ------------------------------
+    # Disco
+    # ------------------------------
+    def guardar(self, ruta: str) -> None:
+        """
+        Escribe las entradas en ruta, de la menos a la más reciente. Se
+        escribe en un temporal y se renombra, así un corte no deja el archivo
+        a medias. Sin disco se avisa por stderr y se sigue.
+        """
+        with self._lock:
+            entradas = list(self._entradas.items())
+        try:
+            os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            with open(temporal, "wb") as f:
+                f.write(_CABECERA.pack(_MARCA, _VERSION_ARCHIVO, len(entradas)))
+                for (huella, tipo, _), entrada in entradas:
+                    if tipo == "riesgo":
+                        f.write(_ENTRADA.pack(bytes.fromhex(huella), 0, entrada.umbral,
+                                              entrada.distancia_min, len(entrada.ia)))
+                        _escribir_columna(f, array("q", entrada.ia))
+                        _escribir_columna(f, array("q", entrada.ib))
+                        _escribir_columna(f, entrada.d2)
+                    else:
+                        f.write(_ENTRADA.pack(bytes.fromhex(huella), 1, 0.0,
+                                              entrada.distancia, len(entrada.pares)))
+                        _escribir_columna(f, array("q", (k for par in entrada.pares for k in par)))
+            os.replace(temporal, ruta)
+        except OSError as e:
+            print(f"No se pudo guardar la caché en {ruta}: {e}", file=sys.stderr)
+
+    def cargar(self, ruta: str) -> bool:
+        """
+        Agrega las entradas guardadas en ruta, respetando max_bytes. Devuelve
+        False si el archivo no existe o no se puede leer (se ignora entero).
+        """
+        try:
+            with open(ruta, "rb") as f:
+                marca, version, cantidad = _CABECERA.unpack(_leer_exacto(f, _CABECERA.size))
+                if marca != _MARCA or version != _VERSION_ARCHIVO:
+                    return False
+                leidas = []
+                for _ in range(cantidad):
+                    huella, tipo, umbral, distancia, m = _ENTRADA.unpack(_leer_exacto(f, _ENTRADA.size))
+                    if _TIPOS[tipo] == "riesgo":
+                        ia = array("l", _leer_columna(f, "q", m))
+                        ib = array("l", _leer_columna(f, "q", m))
+                        entrada = _EntradaRiesgo(umbral, distancia, ia, ib, _leer_columna(f, "d", m))
+                        leidas.append(((huella.hex(), "riesgo", umbral), entrada))
+                    else:
+                        planos = _leer_columna(f, "q", 2 * m)
+                        pares = list(zip(planos[0::2], planos[1::2]))
+                        leidas.append(((huella.hex(), "par", None), _EntradaPar(distancia, pares)))
+        except (OSError, ValueError, IndexError, struct.error):
+            return False
+        with self._lock:
+            for clave, entrada in leidas:
+                self._guardar(clave, entrada)
+        return True
+
+    # ------------------------------
+    # Internos (con el lock tomado)
+    # ------------------------------
+    def _buscar_superset(self, huella: str, umbral: float) -> Optional[_EntradaRiesgo]:
+        """La entrada con el menor umbral >= umbral, marcada como reciente."""
+        candidatos = [u for u in self._umbrales.get(huella, ()) if u >= umbral]
+        if not candidatos:
+            return None
+        clave = (huella, "riesgo", min(candidatos))
+        self._entradas.move_to_end(clave)
+        return self._entradas[clave]
+
+    def _guardar(self, clave: tuple, entrada) -> None:
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self._bytes -= anterior.bytes()
+            self._olvidar_umbral(clave)
+
+        if entrada.bytes() > self.max_bytes:
+            return  # no cabe ni sola: no se guarda
+        self._entradas[clave] = entrada
+        self._bytes += entrada.bytes()
+        huella, tipo, umbral = clave
+        if tipo == "riesgo":
+            self._umbrales.setdefault(huella, []).append(umbral)
+
+        while self._bytes > self.max_bytes:
+            vieja_clave, vieja = self._entradas.popitem(last=False)
+            self._bytes -= vieja.bytes()
+            self._olvidar_umbral(vieja_clave)
+
+    def _olvidar_umbral(self, clave: tuple) -> None:
+        huella, tipo, umbral = clave
+        if tipo != "riesgo":
+            return
+        umbrales = self._umbrales.get(huella)
+        if umbrales is not None and umbral in umbrales:
+            umbrales.remove(umbral)
+            if not umbrales:
+                del self._umbrales[huella]
+
+    # ------------------------------
+    # Ayudas
+    # ------------------------------
+    @staticmethod
+    def _columnas(puntos: Sequence[Avion], pares: Sequence) -> tuple[array, array]:
+        if isinstance(pares, ParesIndexados) and pares.puntos is puntos:
+            return array("l", pares.ia), array("l", pares.ib)
+        posicion = {id(p): i for i, p in enumerate(puntos)}
+        ia = array("l")
+        ib = array("l")
+        for a, b in pares:
+            ia.append(posicion[id(a)])
+            ib.append(posicion[id(b)])
+        return ia, ib
+
+    @staticmethod
+    def _filtrar(puntos: Sequence[Avion], entrada: _EntradaRiesgo, umbral: float) -> ParesIndexados:
+        umbral2 = umbral * umbral
+        pares = ParesIndexados(puntos)
+        for i, j, d2 in zip(entrada.ia, entrada.ib, entrada.d2):
+            if d2 <= umbral2:
+                pares.agregar(i, j)
+        return pares
+
+
+def _leer_exacto(f: BinaryIO, tam: int) -> bytes:
+    datos = f.read(tam)
+    if len(datos) != tam:
+        raise ValueError("archivo de caché truncado")
+    return datos
+
+
+def _escribir_columna(f: BinaryIO, columna: array) -> None:
+    if sys.byteorder == "big":
+        columna = array(columna.typecode, columna)
+        columna.byteswap()
+    f.write(columna.tobytes())
+
+
+def _leer_columna(f: BinaryIO, tipo: str, cantidad: int) -> array:
+    columna = array(tipo)
+    columna.frombytes(_leer_exacto(f, columna.itemsize * cantidad))
+    if sys.byteorder == "big":
+        columna.byteswap()
+    return columna
@@ -0,0 +1,261 @@
+# colisiones/enteros.py
+"""
+Motores exactos para coordenadas enteras o de punto fijo.
+
+Las coordenadas se pasan a enteros (multiplicadas por una escala) y todas
+las comparaciones se hacen con distancias² enteras y los empates son
+exactos, sin depender del redondeo. El umbral² es el mismo umbral * umbral
+en float con el que comparan los demás motores, así todos aceptan los
+mismos pares.
+La raíz cuadrada se toma una sola vez, al devolver la distancia.
+
+Para que distancia² quepa en un int64, |coordenada| * escala debe ser
+menor que LIMITE_COORDENADA.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, insort
+from fractions import Fraction
+from math import floor, isqrt, sqrt
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from .modelos import Avion, ParesIndexados, ResultadoColision
+
+
+# Con |x|, |y| < 2**30, dx² + dy² < 2**63
+LIMITE_COORDENADA = 1 << 30
+
+# Mayor que cualquier distancia² posible
+_SIN_PAR = 1 << 64
+
+_VECINOS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+# Cada cuántos aviones se informa el progreso
+_PASO_PROGRESO = 1024
+
+
+def _entero(v: float, escala: int) -> int:
+    try:
+        k = round(v * escala)
+    except (OverflowError, ValueError):
+        raise ValueError(f"coordenada no finita: {v}") from None
+    # v tiene que ser el float más cercano a k / escala
+    if k / escala != v:
+        raise ValueError(f"la coordenada {v} no es múltiplo de 1/{escala}")
+    if not -LIMITE_COORDENADA < k < LIMITE_COORDENADA:
+        raise ValueError(f"la coordenada {v} está fuera de rango para escala {escala}")
+    return k
+
+
+def a_enteros(puntos: Sequence[Avion], escala: int = 1) -> Tuple[array, array]:
+    """
+    Columnas (xs, ys) int64 con las coordenadas multiplicadas por escala.
+    Lanza ValueError si alguna no es múltiplo exacto de 1/escala.
+    """
+    if escala < 1:
+        raise ValueError("la escala debe ser >= 1")
+    if escala == 1:
+        # Camino rápido: convertir en bloque y revisar después.
+        vx = [p.x for p in puntos]
+        vy = [p.y for p in puntos]
+        try:
+            xs = array("q", map(int, vx))
+            ys = array("q", map(int, vy))
+        except (OverflowError, ValueError):
+            pass
+        else:
+            if (vx == list(map(float, xs)) and vy == list(map(float, ys))
+                    and all(-LIMITE_COORDENADA < k < LIMITE_COORDENADA
+                            for k in (min(xs, default=0), max(xs, default=0),
+                                      min(ys, default=0), max(ys, default=0)))):
+                return xs, ys
+    xs = array("q", (_entero(p.x, escala) for p in puntos))
+    ys = array("q", (_entero(p.y, escala) for p in puntos))
+    return xs, ys
+
+
+def coordenadas_enteras(puntos: Sequence[Avion], escala: int = 1) -> bool:
+    """True si la flota se puede usar con los motores de este módulo."""
+    try:
+        a_enteros(puntos, escala)
+    except ValueError:
+        return False
+    return True
+
+
+def umbral2_entero(umbral: float, escala: int = 1) -> int:
+    """
+    Mayor distancia² entera m (en unidades de 1/escala²) con
+    m / escala² <= umbral * umbral, donde umbral * umbral es el producto en
+    float con el que comparan los motores de punto flotante (d2 <= u * u).
+    Con escala 1 y coordenadas enteras, d2 es exacto en float y los dos
+    criterios aceptan exactamente los mismos pares.
+    """
+    if umbral <= 0:
+        return 0
+    return floor(Fraction(umbral * umbral) * (escala * escala))
+
+
+def _distancia(d2: int, escala: int) -> float:
+    return sqrt(d2) / escala
+
+
+def par_mas_cercano_enteros(puntos: List[Avion], escala: int = 1) -> ResultadoColision:
+    """
+    Par más cercano con línea de barrido (como par_mas_cercano_barrido) sobre
+    coordenadas enteras. El radio de búsqueda en y es isqrt(mejor²): entero
+    y exacto, porque dy es entero. Devuelve todos los pares empatados en el
+    orden de fuerza bruta.
+    """
+    n = len(puntos)
+    if n < 2:
+        return ResultadoColision(float("inf"), [])
+
+    xs, ys = a_enteros(puntos, escala)
+    orden = sorted(range(n), key=xs.__getitem__)
+
+    # ventana activa: (y, índice) ordenada por y
+    activos: List[Tuple[int, int]] = []
+    mejor = _SIN_PAR
+    radio = _SIN_PAR
+    empatados: List[Tuple[int, int]] = []
+    izq = 0
+
+    for i in orden:
+        x = xs[i]
+        y = ys[i]
+
+        while izq < n:
+            q = orden[izq]
+            dx = x - xs[q]
+            if dx * dx <= mejor:
+                break
+            del activos[bisect_left(activos, (ys[q], q))]
+            izq += 1
+
+        k = bisect_left(activos, (y - radio, -1))
+        tope = y + radio
+        while k < len(activos):
+            yj, j = activos[k]
+            if yj > tope:
+                break
+            dx = x - xs[j]
+            dy = y - yj
+            d2 = dx * dx + dy * dy
+            if d2 < mejor:
+                mejor = d2
+                radio = isqrt(d2)
+                tope = y + radio
+                empatados = [(j, i) if j < i else (i, j)]
+            elif d2 == mejor:
+                empatados.append((j, i) if j < i else (i, j))
+            k += 1
+
+        insort(activos, (y, i))
+
+    empatados.sort()
+    return ResultadoColision(_distancia(mejor, escala), [(puntos[i], puntos[j]) for i, j in empatados])
+
+
+def _recorrer_grilla(
+    xs: Sequence[int],
+    ys: Sequence[int],
+    limite2: int,
+    progreso: Callable[[float], None] | None = None,
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    (i, j, dx² + dy²) para cada par con dx² + dy² <= limite2, en el mismo
+    orden que fuerza bruta. Es el único recorrido de la grilla entera: la
+    lista y el iterador se arman encima. Las celdas miden isqrt(limite2).
+    """
+    n = len(xs)
+    lado = isqrt(limite2)
+    if lado == 0:
+        # Solo cuentan los aviones en la misma posición exacta.
+        iguales: Dict[Tuple[int, int], List[int]] = {}
+        for i in range(n):
+            iguales.setdefault((xs[i], ys[i]), []).append(i)
+        for i in range(n):
+            for j in iguales[(xs[i], ys[i])]:
+                if j > i:
+                    yield i, j, 0
+        return
+
+    grilla: Dict[Tuple[int, int], List[int]] = {}
+    for i in range(n):
+        grilla.setdefault((xs[i] // lado, ys[i] // lado), []).append(i)
+
+    candidatos: List[Tuple[int, int]] = []
+    for i in range(n):
+        if progreso is not None and i % _PASO_PROGRESO == 0:
+            progreso(i / n)
+        x = xs[i]
+        y = ys[i]
+        cx = x // lado
+        cy = y // lado
+        for dx, dy in _VECINOS:
+            celda = grilla.get((cx + dx, cy + dy))
+            if celda is None:
+                continue
+            for j in celda:
+                if j <= i:
+                    continue
+                ex = xs[j] - x
+                ey = ys[j] - y
+                d2 = ex * ex + ey * ey
+                if d2 <= limite2:
+                    candidatos.append((j, d2))
+        if candidatos:
+            candidatos.sort()
+            for j, d2 in candidatos:
+                yield i, j, d2
+            candidatos.clear()
+
+
+def pares_en_riesgo_enteros(
+    puntos: List[Avion],
+    umbral: float,
+    progreso: Callable[[float], None] | None = None,
+    escala: int = 1,
+) -> tuple[float, ParesIndexados]:
+    """
+    Igual que pares_en_riesgo_grilla, con coordenadas enteras: la grilla usa
+    celdas de lado isqrt(umbral²) y cada par se acepta si dx² + dy² <= umbral²
+    (ver umbral2_entero). Si ningún par queda bajo el umbral, la distancia
+    mínima global sale de par_mas_cercano_enteros.
+    """
+    n = len(puntos)
+    pares = ParesIndexados(puntos)
+    if n < 2:
+        return float("inf"), pares
+
+    xs, ys = a_enteros(puntos, escala)
+    mejor = _SIN_PAR
+    for i, j, d2 in _recorrer_grilla(xs, ys, umbral2_entero(umbral, escala), progreso):
+        if d2 < mejor:
+            mejor = d2
+        pares.agregar(i, j)
+
+    if not pares:
+        return par_mas_cercano_enteros(puntos, escala).distancia, pares
+    return _distancia(mejor, escala), pares
+
+
+def iterar_indices_enteros(
+    puntos: List[Avion],
+    umbral: float,
+    progreso: Callable[[float], None] | None = None,
+    escala: int = 1,
+) -> Iterator[Tuple[int, int, float]]:
+    """
+    Los pares de pares_en_riesgo_enteros de a uno, como (i, j, distancia²),
+    con la distancia² en las unidades de las coordenadas (exacta mientras
+    quepa en un float: |coordenada| * escala < 2**26).
+    """
+    if len(puntos) < 2:
+        return
+    xs, ys = a_enteros(puntos, escala)
+    e2 = escala * escala
+    for i, j, d2 in _recorrer_grilla(xs, ys, umbral2_entero(umbral, escala), progreso):
+        yield i, j, d2 / e2
@@ -0,0 +1,206 @@
+# colisiones/ingesta.py
+"""
+Lectura por bloques de reportes de posición y detección en flujo.
+
+Los reportes llegan como CSV (id,x,y[,z]) o JSON por líneas
+({"id": .., "x": .., "y": .., "z": ..}, z opcional) desde un archivo o stdin. Si vienen ordenados
+por x, los pares en riesgo se entregan a medida que aparecen y en memoria
+solo queda la ventana de aviones con x dentro del umbral del último leído.
+
+Los registros reales llegan en orden de tiempo: ordenar_por_x los ordena
+antes, por tramos en disco si no entran en memoria.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import struct
+import tempfile
+from collections import deque
+from itertools import islice
+from math import floor, sqrt
+from operator import attrgetter
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from .algoritmos import ParAviones, _dist2
+from .modelos import Avion
+from .perfil import activas
+
+
+FORMATOS = ("csv", "jsonl")
+
+# Aviones leídos por bloque
+TAM_BLOQUE = 4096
+
+# Aviones que se ordenan en memoria antes de pasar un tramo a disco
+TAM_TRAMO = 1 << 18
+
+# Registro de un avión en los tramos temporales: id, x, y, z
+_REGISTRO = struct.Struct("<qddd")
+
+_x = attrgetter("x")
+
+
+def _avion_csv(linea: str, num_linea: int) -> Avion | None:
+    campos = [c.strip() for c in linea.split(",")]
+    if not campos or not campos[0]:
+        return None
+    try:
+        z = float(campos[3]) if len(campos) > 3 and campos[3] else 0.0
+        return Avion(id=int(campos[0]), x=float(campos[1]), y=float(campos[2]), z=z)
+    except (ValueError, IndexError):
+        if num_linea == 1:
+            return None  # encabezado
+        raise ValueError(f"línea {num_linea}: se esperaba 'id,x,y[,z]', llegó {linea.strip()!r}")
+
+
+def _avion_jsonl(linea: str, num_linea: int) -> Avion | None:
+    if not linea.strip():
+        return None
+    try:
+        d = json.loads(linea)
+        return Avion(id=int(d["id"]), x=float(d["x"]), y=float(d["y"]), z=float(d.get("z", 0.0)))
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"línea {num_linea}: JSON inválido {linea.strip()!r}")
+
+
+def leer_bloques(flujo: TextIO, formato: str = "csv", tam_bloque: int = TAM_BLOQUE) -> Iterator[List[Avion]]:
+    """Lee el flujo y entrega listas de hasta tam_bloque aviones."""
+    if formato not in FORMATOS:
+        raise ValueError(f"formato desconocido: {formato!r}")
+    parsear = _avion_csv if formato == "csv" else _avion_jsonl
+
+    num_linea = 0
+    while True:
+        lineas = list(islice(flujo, tam_bloque))
+        if not lineas:
+            return
+        bloque: List[Avion] = []
+        for linea in lineas:
+            num_linea += 1
+            avion = parsear(linea, num_linea)
+            if avion is not None:
+                bloque.append(avion)
+        if bloque:
+            yield bloque
+
+
+def _en_bloques(aviones: Iterator[Avion], tam_bloque: int) -> Iterator[List[Avion]]:
+    while True:
+        bloque = list(islice(aviones, tam_bloque))
+        if not bloque:
+            return
+        yield bloque
+
+
+def _volcar(aviones: List[Avion], tam_bloque: int) -> BinaryIO:
+    """Guarda un tramo ya ordenado en un archivo temporal, listo para leer."""
+    archivo = tempfile.TemporaryFile()
+    pack = _REGISTRO.pack
+    for k in range(0, len(aviones), tam_bloque):
+        archivo.write(b"".join(pack(a.id, a.x, a.y, a.z) for a in aviones[k:k + tam_bloque]))
+    archivo.seek(0)
+    return archivo
+
+
+def _leer_tramo(archivo: BinaryIO, tam_bloque: int) -> Iterator[Avion]:
+    while True:
+        datos = archivo.read(_REGISTRO.size * tam_bloque)
+        if not datos:
+            return
+        for id, x, y, z in _REGISTRO.iter_unpack(datos):
+            yield Avion(id, x, y, z)
+
+
+def ordenar_por_x(
+    bloques: Iterable[List[Avion]],
+    tam_bloque: int = TAM_BLOQUE,
+    tam_tramo: int = TAM_TRAMO,
+) -> Iterator[List[Avion]]:
+    """
+    Los aviones de bloques ordenados por x (los de igual x, en el orden en
+    que llegaron), en bloques de hasta tam_bloque, listos para
+    detectar_en_flujo. Si hay más de tam_tramo, cada tramo se ordena y se
+    guarda en un archivo temporal y después se mezclan: en memoria queda un
+    tramo mientras se lee y un bloque por archivo mientras se mezcla.
+    Los ids deben caber en un int64.
+    """
+    tramo: List[Avion] = []
+    archivos: List[BinaryIO] = []
+    try:
+        for bloque in bloques:
+            tramo.extend(bloque)
+            if len(tramo) >= tam_tramo:
+                tramo.sort(key=_x)
+                archivos.append(_volcar(tramo, tam_bloque))
+                tramo = []
+        tramo.sort(key=_x)
+        if not archivos:
+            yield from _en_bloques(iter(tramo), tam_bloque)
+            return
+        if tramo:
+            archivos.append(_volcar(tramo, tam_bloque))
+            tramo = []
+        # heapq.merge es estable: a igual x, primero el tramo anterior
+        corridas = [_leer_tramo(archivo, tam_bloque) for archivo in archivos]
+        yield from _en_bloques(heapq.merge(*corridas, key=_x), tam_bloque)
+    finally:
+        for archivo in archivos:
+            archivo.close()
+
+
+def detectar_en_flujo(bloques: Iterable[List[Avion]], umbral: float) -> Iterator[Tuple[ParAviones, float]]:
+    """
+    Entrega ((a, b), distancia) para cada par a distancia <= umbral.
+
+    Los aviones deben llegar ordenados por x (ver ordenar_por_x). La ventana
+    activa se agrupa por franjas de y de alto umbral; cada avión nuevo solo
+    se compara con las franjas vecinas y se descartan los que ya quedaron a
+    más de umbral en x.
+    """
+    if umbral <= 0:
+        raise ValueError("el umbral debe ser > 0")
+    umbral2 = umbral * umbral
+
+    franjas: Dict[int, Deque[Avion]] = {}
+    ultimo_x = float("-inf")
+    stats = activas()
+
+    for bloque in bloques:
+        for avion in bloque:
+            if avion.x < ultimo_x:
+                raise ValueError(
+                    f"la entrada debe venir ordenada por x (avión {avion.id}: "
+                    f"x={avion.x} < {ultimo_x}); ver ordenar_por_x"
+                )
+            ultimo_x = avion.x
+            minimo_x = avion.x - umbral
+            fy = floor(avion.y / umbral)
+
+            for k in (fy - 1, fy, fy + 1):
+                franja = franjas.get(k)
+                if not franja:
+                    continue
+                while franja and franja[0].x < minimo_x:
+                    franja.popleft()
+                for otro in franja:
+                    d2 = _dist2(otro, avion)
+                    if d2 <= umbral2:
+                        yield (otro, avion), sqrt(d2)
+
+            franjas.setdefault(fy, deque()).append(avion)
+
+        # Al cerrar cada bloque se limpian también las franjas que no se
+        # visitaron, así la memoria depende solo de la ventana y del bloque.
+        minimo_x = ultimo_x - umbral
+        for k in list(franjas):
+            franja = franjas[k]
+            while franja and franja[0].x < minimo_x:
+                franja.popleft()
+            if not franja:
+                del franjas[k]
+
+        if stats is not None:
+            stats.contar("flujo.bloques")
+            stats.contar("flujo.aviones", len(bloque))
+            stats.maximo("flujo.ventana", sum(map(len, franjas.values())))
@@ -0,0 +1,304 @@
+# colisiones/instantanea.py
+"""
+Formato binario de instantáneas de flota.
+
+Estructura (little-endian, todo alineado a 8 bytes):
+    cabecera  32 bytes: magia b"COLS", versión (u16), banderas (u16),
+              n (u64), 16 bytes reservados
+    ids       n x int64
+    xs        n x float64
+    ys        n x float64
+    zs        n x float64 (solo con la bandera CON_Z)
+    orden_x   n x int64   (solo con la bandera ORDENADA)
+    orden_y   n x int64   (solo con la bandera ORDENADA)
+
+Sin la bandera CON_Z la altitud de todos los aviones es 0.
+
+El archivo se abre con mmap y las columnas se exponen como memoryview,
+sin crear objetos Avion hasta que se piden.
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from .modelos import Avion
+
+
+MAGIA = b"COLS"
+VERSION = 1
+
+# Banderas
+ORDENADA = 1
+CON_Z = 2
+
+_CABECERA = struct.Struct("<4sHHQ16x")
+
+
+# Formatos de buffer aceptados tal cual para cada tipo de columna
+_FORMATOS = {"q": ("q", "l", "<q", "<l"), "d": ("d", "<d")}
+
+
+def _columna(valores: Sequence, tipo: str) -> Sequence:
+    """Vista de 8 bytes por elemento sobre valores, copiando solo si hace falta."""
+    try:
+        vista = memoryview(valores)
+    except TypeError:
+        return array(tipo, valores)
+    if vista.itemsize == 8 and vista.format in _FORMATOS[tipo] and vista.c_contiguous:
+        return vista.cast("B").cast(tipo)
+    return array(tipo, vista.tolist())
+
+
+def guardar_columnas(
+    ruta: str,
+    ids: Sequence[int],
+    xs: Sequence[float],
+    ys: Sequence[float],
+    ordenar: bool = True,
+    zs: Optional[Sequence[float]] = None,
+) -> None:
+    """
+    Escribe una instantánea a partir de columnas.
+    ordenar: guarda también las permutaciones que ordenan por x y por y
+    zs: altitudes; sin ellas no se guarda la columna
+    """
+    if sys.byteorder != "little":
+        raise ValueError("el formato de instantánea requiere una máquina little-endian")
+
+    n = len(ids)
+    if not (len(xs) == len(ys) == n) or (zs is not None and len(zs) != n):
+        raise ValueError("ids, xs, ys y zs deben tener la misma longitud")
+
+    col_ids = _columna(ids, "q")
+    col_xs = _columna(xs, "d")
+    col_ys = _columna(ys, "d")
+
+    banderas = (ORDENADA if ordenar else 0) | (CON_Z if zs is not None else 0)
+    with open(ruta, "wb") as f:
+        f.write(_CABECERA.pack(MAGIA, VERSION, banderas, n))
+        f.write(col_ids)
+        f.write(col_xs)
+        f.write(col_ys)
+        if zs is not None:
+            f.write(_columna(zs, "d"))
+        if ordenar:
+            f.write(array("q", sorted(range(n), key=col_xs.__getitem__)))
+            f.write(array("q", sorted(range(n), key=col_ys.__getitem__)))
+
+
+def _tipos_columnas(banderas: int) -> List[str]:
+    """Tipo de cada columna guardada, en orden, según las banderas."""
+    tipos = ["q", "d", "d"]
+    if banderas & CON_Z:
+        tipos.append("d")
+    if banderas & ORDENADA:
+        tipos += ["q", "q"]
+    return tipos
+
+
+def guardar_bloques(
+    ruta: str,
+    n: int,
+    bloques: Iterable[Sequence[Sequence]],
+    ordenar: bool = True,
+    con_z: bool = False,
+) -> None:
+    """
+    Escribe una instantánea de n aviones que llegan por bloques (ids, xs, ys),
+    o (ids, xs, ys, zs) con con_z, sin tener la flota entera en memoria: cada
+    bloque se escribe en su lugar dentro de cada columna.
+    ordenar: calcula después las permutaciones por x y por y (con numpy si
+    está disponible; estas sí necesitan las columnas completas)
+    """
+    if sys.byteorder != "little":
+        raise ValueError("el formato de instantánea requiere una máquina little-endian")
+
+    banderas = (ORDENADA if ordenar else 0) | (CON_Z if con_z else 0)
+    tipos = _tipos_columnas(banderas)
+    inicio_col = [_CABECERA.size + 8 * n * k for k in range(len(tipos))]
+    datos = 4 if con_z else 3
+
+    with open(ruta, "w+b") as f:
+        f.write(_CABECERA.pack(MAGIA, VERSION, banderas, n))
+        f.truncate(_CABECERA.size + 8 * n * len(tipos))
+
+        escritos = 0
+        for bloque in bloques:
+            if len(bloque) != datos:
+                raise ValueError(f"cada bloque debe traer {datos} columnas")
+            m = len(bloque[0])
+            if any(len(valores) != m for valores in bloque):
+                raise ValueError("las columnas de un bloque deben tener la misma longitud")
+            if escritos + m > n:
+                raise ValueError(f"los bloques traen más de {n} aviones")
+            for k, valores in enumerate(bloque):
+                f.seek(inicio_col[k] + 8 * escritos)
+                f.write(_columna(valores, tipos[k]))
+            escritos += m
+        if escritos != n:
+            raise ValueError(f"se esperaban {n} aviones y llegaron {escritos}")
+
+        if ordenar and n:
+            f.flush()  # el mmap lee del archivo, no del buffer de f
+            with mmap.mmap(f.fileno(), 0) as mapa:
+                vista = memoryview(mapa)
+                try:
+                    for k, col in ((datos, 1), (datos + 1, 2)):
+                        valores = vista[inicio_col[col]:inicio_col[col] + 8 * n].cast("d")
+                        orden = _ordenar(valores)
+                        valores.release()
+                        mapa[inicio_col[k]:inicio_col[k] + 8 * n] = orden
+                finally:
+                    vista.release()
+
+
+def _ordenar(valores: memoryview) -> bytes:
+    """Permutación estable que ordena valores, como bytes int64."""
+    try:
+        import numpy as np
+    except ImportError:  # numpy es opcional
+        return array("q", sorted(range(len(valores)), key=valores.__getitem__)).tobytes()
+    return np.argsort(np.frombuffer(valores, dtype=np.float64), kind="stable").astype(np.int64).tobytes()
+
+
+def guardar_instantanea(ruta: str, puntos: Sequence[Avion], ordenar: bool = True) -> None:
+    """Escribe la flota en el formato de instantánea (con altitud si algún z no es 0)."""
+    con_z = any(p.z for p in puntos)
+    guardar_columnas(
+        ruta,
+        array("q", (p.id for p in puntos)),
+        array("d", (p.x for p in puntos)),
+        array("d", (p.y for p in puntos)),
+        ordenar,
+        array("d", (p.z for p in puntos)) if con_z else None,
+    )
+
+
+class Instantanea(Sequence[Avion]):
+    """
+    Instantánea abierta con mmap.
+    ruta: archivo de origen
+    ids, xs, ys: columnas (memoryview) sobre el archivo
+    zs: altitudes (memoryview), o None si no se guardaron (todas 0)
+    orden_x, orden_y: permutaciones de orden, o None si no se guardaron
+
+    También sirve como secuencia de Avion: cada acceso arma el avión al vuelo.
+    Las vistas dejan de ser válidas después de cerrar(). Los arreglos que
+    devolvió a_flota siguen valiendo: el archivo se desmapea cuando se
+    liberan.
+    """
+
+    def __init__(self, ruta: str):
+        if sys.byteorder != "little":
+            raise ValueError("el formato de instantánea requiere una máquina little-endian")
+
+        with open(ruta, "rb") as f:
+            self._mmap: Optional[mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magia, version, banderas, n = _CABECERA.unpack_from(self._mmap, 0)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f"{ruta}: archivo demasiado corto para ser una instantánea")
+        if magia != MAGIA:
+            self._mmap.close()
+            raise ValueError(f"{ruta}: no es una instantánea de flota")
+        if version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{ruta}: versión {version} no soportada")
+
+        tipos = _tipos_columnas(banderas)
+        esperado = _CABECERA.size + 8 * n * len(tipos)
+        if len(self._mmap) < esperado:
+            self._mmap.close()
+            raise ValueError(f"{ruta}: archivo truncado")
+
+        self.ruta = ruta
+        self.n = n
+        self._vista = memoryview(self._mmap)
+        self._vistas: List[memoryview] = []
+
+        columnas = iter(range(len(tipos)))
+
+        def col() -> memoryview:
+            k = next(columnas)
+            ini = _CABECERA.size + 8 * n * k
+            v = self._vista[ini:ini + 8 * n].cast(tipos[k])
+            self._vistas.append(v)
+            return v
+
+        self.ids = col()
+        self.xs = col()
+        self.ys = col()
+        self.zs: Optional[memoryview] = col() if banderas & CON_Z else None
+        self.orden_x: Optional[memoryview] = None
+        self.orden_y: Optional[memoryview] = None
+        if banderas & ORDENADA:
+            self.orden_x = col()
+            self.orden_y = col()
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self.n))]
+        return Avion(id=self.ids[i], x=self.xs[i], y=self.ys[i],
+                     z=self.zs[i] if self.zs is not None else 0.0)
+
+    def __iter__(self) -> Iterator[Avion]:
+        if self.zs is None:
+            for i, x, y in zip(self.ids, self.xs, self.ys):
+                yield Avion(id=i, x=x, y=y)
+        else:
+            for i, x, y, z in zip(self.ids, self.xs, self.ys, self.zs):
+                yield Avion(id=i, x=x, y=y, z=z)
+
+    def a_flota(self):
+        """FlotaColumnar sobre las mismas páginas del archivo (requiere numpy)."""
+        import numpy as np
+
+        from .vectorizado import FlotaColumnar
+
+        orden_x = None
+        if self.orden_x is not None:
+            orden_x = np.frombuffer(self.orden_x, dtype=np.int64)
+        zs = None
+        if self.zs is not None:
+            zs = np.frombuffer(self.zs, dtype=np.float64)
+        return FlotaColumnar(
+            np.frombuffer(self.ids, dtype=np.int64),
+            np.frombuffer(self.xs, dtype=np.float64),
+            np.frombuffer(self.ys, dtype=np.float64),
+            orden_x=orden_x,
+            zs=zs,
+        )
+
+    def cerrar(self) -> None:
+        if self._mmap is None:
+            return
+        try:
+            for v in self._vistas + [self._vista]:
+                v.release()
+            self._mmap.close()
+        except BufferError:
+            # Algo (los arreglos de a_flota, una rebanada de una columna)
+            # todavía usa las páginas: el mmap se cierra solo cuando lo
+            # suelten, acá solo se deja de referenciar.
+            pass
+        self._vistas = []
+        self._mmap = None
+
+    def __enter__(self) -> "Instantanea":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+
+def abrir_instantanea(ruta: str) -> Instantanea:
+    return Instantanea(ruta)
@@ -0,0 +1,294 @@
+# colisiones/kdtree.py
+"""
+Árbol k-d (k = 2) sobre la flota.
+
+Se construye una vez y responde muchas consultas: aviones dentro de un
+radio o rectángulo, k vecinos más cercanos y todos los pares a distancia
+<= radio (con la misma forma que pares_en_riesgo).
+
+El árbol es implícito: los aviones se reordenan en un arreglo y cada nodo
+es un rango [lo, hi) cuyo punto medio parte el espacio por x o por y, según
+en cuál de los dos ejes estén más dispersos los aviones del rango.
+"""
+from __future__ import annotations
+
+import heapq
+from array import array
+from math import sqrt
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+from .modelos import Avion, ParesIndexados
+
+
+# Rangos de este tamaño o menos se revisan sin seguir bajando
+_HOJA = 8
+
+# Cada cuántos aviones se informa el progreso
+_PASO_PROGRESO = 1024
+
+
+class ArbolKD:
+    """
+    Índice espacial sobre una lista de aviones.
+    Las consultas devuelven índices sobre la lista original (puntos).
+    """
+
+    def __init__(self, puntos: Sequence[Avion]):
+        self.puntos = puntos
+        n = len(puntos)
+        orden = list(range(n))
+        # eje de corte de cada nodo, guardado en la posición de su punto medio
+        self._ejes = bytearray(n)
+        self._construir(orden, 0, n)
+
+        self._orig = array("l", orden)
+        self._xs = array("d", (puntos[i].x for i in orden))
+        self._ys = array("d", (puntos[i].y for i in orden))
+
+    def _construir(self, orden: List[int], lo: int, hi: int) -> None:
+        if hi - lo <= _HOJA:
+            return
+        puntos = self.puntos
+        xs = [puntos[i].x for i in orden[lo:hi]]
+        ys = [puntos[i].y for i in orden[lo:hi]]
+        # Cortar por el eje más disperso: si todos comparten x (o y), cortar
+        # por ese eje no separaría nada.
+        eje = 0 if max(xs) - min(xs) >= max(ys) - min(ys) else 1
+        if eje == 0:
+            orden[lo:hi] = sorted(orden[lo:hi], key=lambda i: puntos[i].x)
+        else:
+            orden[lo:hi] = sorted(orden[lo:hi], key=lambda i: puntos[i].y)
+        mid = (lo + hi) // 2
+        self._ejes[mid] = eje
+        self._construir(orden, lo, mid)
+        self._construir(orden, mid + 1, hi)
+
+    def __len__(self) -> int:
+        return len(self._orig)
+
+    # ------------------------------
+    # Consultas por región
+    # ------------------------------
+    def en_radio(self, x: float, y: float, radio: float) -> List[int]:
+        """Índices de los aviones a distancia <= radio de (x, y)."""
+        xs, ys, orig, ejes = self._xs, self._ys, self._orig, self._ejes
+        radio2 = radio * radio
+        res: List[int] = []
+        pila = [(0, len(orig))]
+        while pila:
+            lo, hi = pila.pop()
+            if hi - lo <= _HOJA:
+                for k in range(lo, hi):
+                    dx = xs[k] - x
+                    dy = ys[k] - y
+                    if dx * dx + dy * dy <= radio2:
+                        res.append(orig[k])
+                continue
+            mid = (lo + hi) // 2
+            dx = xs[mid] - x
+            dy = ys[mid] - y
+            if dx * dx + dy * dy <= radio2:
+                res.append(orig[mid])
+            delta = dx if ejes[mid] == 0 else dy
+            if delta >= -radio:  # el punto medio no queda a la izquierda del círculo
+                pila.append((lo, mid))
+            if delta <= radio:
+                pila.append((mid + 1, hi))
+        return res
+
+    def en_rectangulo(self, x0: float, y0: float, x1: float, y1: float) -> List[int]:
+        """Índices de los aviones dentro de [x0, x1] x [y0, y1]."""
+        xs, ys, orig, ejes = self._xs, self._ys, self._orig, self._ejes
+        res: List[int] = []
+        pila = [(0, len(orig))]
+        while pila:
+            lo, hi = pila.pop()
+            if hi - lo <= _HOJA:
+                for k in range(lo, hi):
+                    if x0 <= xs[k] <= x1 and y0 <= ys[k] <= y1:
+                        res.append(orig[k])
+                continue
+            mid = (lo + hi) // 2
+            if x0 <= xs[mid] <= x1 and y0 <= ys[mid] <= y1:
+                res.append(orig[mid])
+            corte, a, b = (xs[mid], x0, x1) if ejes[mid] == 0 else (ys[mid], y0, y1)
+            if a <= corte:
+                pila.append((lo, mid))
+            if b >= corte:
+                pila.append((mid + 1, hi))
+        return res
+
+    # ------------------------------
+    # Vecinos más cercanos
+    # ------------------------------
+    def k_vecinos(self, x: float, y: float, k: int, excluir: int | None = None) -> List[Tuple[float, int]]:
+        """
+        Los k aviones más cercanos a (x, y) como (distancia, índice), del más
+        cercano al más lejano. excluir: índice a ignorar (el propio avión).
+        """
+        if k <= 0:
+            return []
+        xs, ys, orig, ejes = self._xs, self._ys, self._orig, self._ejes
+        # montículo de máximos con (-d2, -índice): se desempata por índice menor
+        mejores: List[Tuple[float, int]] = []
+
+        def considerar(pos: int) -> None:
+            i = orig[pos]
+            if i == excluir:
+                return
+            dx = xs[pos] - x
+            dy = ys[pos] - y
+            d2 = dx * dx + dy * dy
+            if len(mejores) < k:
+                heapq.heappush(mejores, (-d2, -i))
+            elif (-d2, -i) > mejores[0]:
+                heapq.heapreplace(mejores, (-d2, -i))
+
+        def peor() -> float:
+            return -mejores[0][0] if len(mejores) == k else float("inf")
+
+        def visitar(lo: int, hi: int) -> None:
+            if hi - lo <= _HOJA:
+                for pos in range(lo, hi):
+                    considerar(pos)
+                return
+            mid = (lo + hi) // 2
+            considerar(mid)
+            delta = (x - xs[mid]) if ejes[mid] == 0 else (y - ys[mid])
+            if delta < 0:
+                cerca, lejos = (lo, mid), (mid + 1, hi)
+            else:
+                cerca, lejos = (mid + 1, hi), (lo, mid)
+            visitar(*cerca)
+            if delta * delta <= peor():
+                visitar(*lejos)
+
+        visitar(0, len(orig))
+        return sorted((sqrt(-d2), -i) for d2, i in mejores)
+
+    def vecinos_de(self, i: int, k: int = 1) -> List[Tuple[float, int]]:
+        """Los k vecinos más cercanos del avión puntos[i], sin contarlo a él."""
+        p = self.puntos[i]
+        return self.k_vecinos(p.x, p.y, k, excluir=i)
+
+    def vecino_de_cada_uno(
+        self, progreso: Callable[[float], None] | None = None
+    ) -> Tuple[array, array]:
+        """
+        (vecino, dist2): para cada avión i, el índice de su vecino más cercano
+        (el de menor índice si hay empate; -1 si está solo) y la distancia² a
+        él. Los aviones se recorren en el orden del árbol, así cada búsqueda
+        arranca con un candidato cercano (el de al lado en el arreglo) y poda
+        casi todo: O(n log n) en total.
+        Los aviones que comparten posición no se buscan: su vecino es el de
+        menor índice entre los otros de esa posición, a distancia 0. Buscarlos
+        recorría todo el grupo por el desempate: O(n²) con muchos repetidos.
+        """
+        xs, ys, orig, ejes = self._xs, self._ys, self._orig, self._ejes
+        n = len(orig)
+        vecino = array("l", [-1]) * n
+        dist2 = array("d", [float("inf")]) * n
+        if n < 2:
+            return vecino, dist2
+
+        # los dos menores índices de cada posición
+        menores: Dict[Tuple[float, float], List[int]] = {}
+        for q in range(n):
+            dos = menores.setdefault((xs[q], ys[q]), [])
+            if len(dos) < 2:
+                dos.append(orig[q])
+                dos.sort()
+            elif orig[q] < dos[1]:
+                dos[1] = orig[q]
+                dos.sort()
+
+        for q in range(n):
+            if progreso is not None and q % _PASO_PROGRESO == 0:
+                progreso(q / n)
+            x = xs[q]
+            y = ys[q]
+            dos = menores[(x, y)]
+            if len(dos) == 2:
+                i = orig[q]
+                vecino[i] = dos[1] if dos[0] == i else dos[0]
+                dist2[i] = 0.0
+                continue
+            c = q + 1 if q + 1 < n else q - 1
+            dx = xs[c] - x
+            dy = ys[c] - y
+            mejor2 = dx * dx + dy * dy
+            mejor = orig[c]
+
+            # (lo, hi, cota): cota es la distancia² mínima al rango
+            pila = [(0, n, 0.0)]
+            while pila:
+                lo, hi, cota = pila.pop()
+                if cota > mejor2:
+                    continue
+                if hi - lo <= _HOJA:
+                    for pos in range(lo, hi):
+                        if pos == q:
+                            continue
+                        dx = xs[pos] - x
+                        dy = ys[pos] - y
+                        d2 = dx * dx + dy * dy
+                        if d2 < mejor2 or (d2 == mejor2 and orig[pos] < mejor):
+                            mejor2 = d2
+                            mejor = orig[pos]
+                    continue
+                mid = (lo + hi) // 2
+                if mid != q:
+                    dx = xs[mid] - x
+                    dy = ys[mid] - y
+                    d2 = dx * dx + dy * dy
+                    if d2 < mejor2 or (d2 == mejor2 and orig[mid] < mejor):
+                        mejor2 = d2
+                        mejor = orig[mid]
+                delta = (x - xs[mid]) if ejes[mid] == 0 else (y - ys[mid])
+                # el lado lejano va primero en la pila: se revisa último
+                if delta < 0:
+                    pila.append((mid + 1, hi, delta * delta))
+                    pila.append((lo, mid, cota))
+                else:
+                    pila.append((lo, mid, delta * delta))
+                    pila.append((mid + 1, hi, cota))
+
+            i = orig[q]
+            vecino[i] = mejor
+            dist2[i] = mejor2
+        return vecino, dist2
+
+    # ------------------------------
+    # Todos los pares
+    # ------------------------------
+    def pares_dentro_de(
+        self, radio: float, progreso: Callable[[float], None] | None = None
+    ) -> Tuple[float, ParesIndexados]:
+        """
+        (mejor_dist2, pares) con todos los pares (i, j), i < j, a distancia
+        <= radio, en el mismo orden que fuerza bruta.
+        progreso: se llama cada tanto con la fracción de aviones revisados
+        """
+        pares = ParesIndexados(self.puntos)
+        mejor_dist2 = float("inf")
+        for i, j, d2 in self.iterar_pares_dentro_de(radio, progreso):
+            if d2 < mejor_dist2:
+                mejor_dist2 = d2
+            pares.agregar(i, j)
+        return mejor_dist2, pares
+
+    def iterar_pares_dentro_de(
+        self, radio: float, progreso: Callable[[float], None] | None = None
+    ) -> Iterator[Tuple[int, int, float]]:
+        """Los pares de pares_dentro_de de a uno, como (i, j, distancia²)."""
+        puntos = self.puntos
+        n = len(puntos)
+        for i, p in enumerate(puntos):
+            if progreso is not None and i % _PASO_PROGRESO == 0:
+                progreso(i / n)
+            cercanos = sorted(j for j in self.en_radio(p.x, p.y, radio) if j > i)
+            for j in cercanos:
+                q = puntos[j]
+                dx = p.x - q.x
+                dy = p.y - q.y
+                yield i, j, dx * dx + dy * dy
@@ -1,11 +1,35 @@
 # colisiones/main.py
 from __future__ import annotations
 
+import argparse
 import sys
+from contextlib import ExitStack
+from math import sqrt
 from time import perf_counter
+from typing import List
 
 from .generador import generar_puntos
-from .algoritmos import fuerza_bruta, par_mas_cercano_dyv, pares_en_riesgo
+from .ingesta import FORMATOS, TAM_BLOQUE, detectar_en_flujo, leer_bloques, ordenar_por_x
+from .instantanea import abrir_instantanea
+from .kdtree import ArbolKD
+from .modelos import Avion, VecinosCercanos
+from .algoritmos import (
+    _dist2,
+    fuerza_bruta,
+    par_mas_cercano_dyv_indices,
+    pares_en_riesgo,
+    top_k,
+    vecinos_mas_cercanos,
+)
+from .analisis import Analisis, analizar
+from .cache import RUTA_CACHE, CacheResultados
+from .perfil import instrumentar, perfilar, resumen_perfil
+from .seleccion import MOTOR_AUTO, RUTA_CALIBRACION, motores_disponibles, recalibrar
+from .teselas import iterar_pares_teselas
+
+
+# Pares en riesgo que se listan por consola
+PARES_MOSTRADOS = 5
 
 
 def pedir_entero(mensaje: str, minimo: int = 1) -> int:
@@ -34,7 +58,260 @@ def pedir_flotante(mensaje: str, minimo: float = 0.0) -> float:
             print("Entrada inválida. Intenta de nuevo.")
 
 
+def parsear_argumentos(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="colisiones",
+        description="Sistema de Detección de Colisiones Aéreas",
+    )
+    parser.add_argument(
+        "--motor",
+        choices=motores_disponibles(),
+        default=MOTOR_AUTO,
+        help=f"algoritmo usado para listar los pares en riesgo; con '{MOTOR_AUTO}' se elige "
+        f"según la flota y el umbral (default: {MOTOR_AUTO})",
+    )
+    parser.add_argument(
+        "--calibrar",
+        action="store_true",
+        help=f"antes de empezar, medir los motores en esta máquina para que '{MOTOR_AUTO}' "
+        f"elija mejor (unos segundos; se guarda en {RUTA_CALIBRACION})",
+    )
+    parser.add_argument(
+        "--vecinos",
+        type=int,
+        metavar="ID",
+        action="append",
+        default=[],
+        help="mostrar los vecinos más cercanos del avión ID (se puede repetir)",
+    )
+    parser.add_argument(
+        "-k",
+        type=int,
+        default=3,
+        help="cuántos vecinos mostrar con --vecinos (default: 3)",
+    )
+    parser.add_argument(
+        "--histograma",
+        type=int,
+        nargs="?",
+        const=10,
+        metavar="CUBETAS",
+        help="mostrar el histograma de la distancia de cada avión a su vecino "
+        "más cercano (default: 10 cubetas)",
+    )
+
+    parser.add_argument(
+        "--verificar",
+        action="store_true",
+        help="comparar el análisis con fuerza bruta y divide y vencerás (O(n²))",
+    )
+    parser.add_argument(
+        "--sin-cache",
+        action="store_true",
+        help=f"no leer ni guardar los resultados de corridas anteriores ({RUTA_CACHE})",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="al terminar, mostrar contadores y tiempos de cada motor (por stderr)",
+    )
+    parser.add_argument(
+        "--cprofile",
+        nargs="?",
+        const="",
+        metavar="RUTA",
+        help="correr bajo cProfile y mostrar las funciones más costosas; "
+        "con RUTA, guardar también el perfil para pstats",
+    )
+
+    flujo = parser.add_argument_group(
+        "modo flujo",
+        "lee posiciones en cualquier orden (las ordena por x, en disco si no "
+        "entran en memoria) y escribe los pares en riesgo (id_a,id_b,distancia) "
+        "por stdout",
+    )
+    flujo.add_argument(
+        "--entrada",
+        metavar="RUTA",
+        help="archivo CSV (id,x,y) o JSON por líneas; '-' para stdin",
+    )
+    flujo.add_argument(
+        "--formato",
+        choices=FORMATOS,
+        help="formato de la entrada (por defecto, según la extensión; csv para stdin)",
+    )
+    flujo.add_argument("--umbral", type=float, help="umbral de colisión (> 0)")
+    flujo.add_argument(
+        "--separacion-vertical",
+        type=float,
+        metavar="V",
+        help="solo informar pares con diferencia de altitud ≤ V (z es la 4.ª columna "
+        "del CSV o el campo 'z' del JSON)",
+    )
+    flujo.add_argument(
+        "--ordenada",
+        action="store_true",
+        help="la entrada ya viene ordenada por x: no se ordena y los pares salen "
+        "a medida que se leen",
+    )
+    flujo.add_argument(
+        "--tam-bloque",
+        type=int,
+        default=TAM_BLOQUE,
+        help=f"aviones leídos por bloque (default: {TAM_BLOQUE})",
+    )
+
+    teselas = parser.add_argument_group(
+        "modo teselas",
+        "lee una instantánea binaria, la resuelve por teselas con halo de ancho "
+        "--umbral y escribe los pares en riesgo (id_a,id_b,distancia) por stdout",
+    )
+    teselas.add_argument("--instantanea", metavar="RUTA", help="instantánea de flota")
+    teselas.add_argument(
+        "--lado-tesela",
+        type=float,
+        metavar="LADO",
+        help="lado de cada tesela (por defecto, según el tamaño de la flota)",
+    )
+    teselas.add_argument(
+        "--procesos",
+        type=int,
+        default=1,
+        help="procesos para resolver las teselas (default: 1, en secuencia)",
+    )
+
+    args = parser.parse_args(argv[1:])
+    if args.entrada is not None and (args.umbral is None or args.umbral <= 0):
+        parser.error("--entrada requiere --umbral > 0")
+    if args.instantanea is not None:
+        if args.entrada is not None:
+            parser.error("--entrada y --instantanea no se pueden combinar")
+        if args.umbral is None or args.umbral < 0:
+            parser.error("--instantanea requiere --umbral >= 0")
+    if args.separacion_vertical is not None and args.separacion_vertical < 0:
+        parser.error("--separacion-vertical debe ser >= 0")
+    return args
+
+
+def main_flujo(args: argparse.Namespace) -> None:
+    """Modo no interactivo: detecta pares en riesgo sobre un flujo de posiciones."""
+    formato = args.formato
+    if formato is None:
+        formato = "jsonl" if args.entrada.endswith((".jsonl", ".json")) else "csv"
+
+    if args.entrada == "-":
+        entrada = sys.stdin
+    else:
+        entrada = open(args.entrada, encoding="utf-8")
+
+    vertical = args.separacion_vertical
+    total = 0
+    try:
+        bloques = leer_bloques(entrada, formato, args.tam_bloque)
+        if not args.ordenada:
+            bloques = ordenar_por_x(bloques, args.tam_bloque)
+        for (a, b), distancia in detectar_en_flujo(bloques, args.umbral):
+            if vertical is not None and abs(a.z - b.z) > vertical:
+                continue
+            print(f"{a.id},{b.id},{distancia:.6f}")
+            total += 1
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+
+    print(f"Pares en riesgo (distancia ≤ {args.umbral:.4f}): {total}", file=sys.stderr)
+
+
+def main_teselas(args: argparse.Namespace) -> None:
+    """Modo no interactivo: pares en riesgo de una instantánea, por teselas."""
+    with abrir_instantanea(args.instantanea) as flota:
+        # Los pares se escriben a medida que salen de la mezcla de teselas.
+        ids = flota.ids
+        total = 0
+        mejor_dist2 = float("inf")
+        for i, j, d2 in iterar_pares_teselas(flota, args.umbral, args.lado_tesela, args.procesos):
+            print(f"{ids[i]},{ids[j]},{sqrt(d2):.6f}")
+            total += 1
+            if d2 < mejor_dist2:
+                mejor_dist2 = d2
+
+    print(f"Pares en riesgo (distancia ≤ {args.umbral:.4f}): {total}", file=sys.stderr)
+    if total:
+        print(f"Distancia mínima entre ellos: {sqrt(mejor_dist2):.4f}", file=sys.stderr)
+
+
 def main(argv: list[str]) -> None:
+    args = parsear_argumentos(argv)
+    if args.entrada is not None:
+        ejecutar = main_flujo
+    elif args.instantanea is not None:
+        ejecutar = main_teselas
+    else:
+        ejecutar = main_interactivo
+
+    if args.calibrar:
+        print("Calibrando los motores...", file=sys.stderr)
+        recalibrar(informar=lambda linea: print(f"  {linea}", file=sys.stderr))
+
+    stats = perfil = None
+    with ExitStack() as pila:
+        if args.profile:
+            stats = pila.enter_context(instrumentar())
+        if args.cprofile is not None:
+            perfil = pila.enter_context(perfilar(args.cprofile or None))
+        ejecutar(args)
+
+    # Por stderr: en modo flujo stdout lleva los pares.
+    if stats is not None:
+        print("\n=== Estadísticas de los motores ===", file=sys.stderr)
+        print(stats.resumen(), file=sys.stderr)
+    if perfil is not None:
+        print("\n=== cProfile ===", file=sys.stderr)
+        print(resumen_perfil(perfil), file=sys.stderr)
+
+
+def verificar(puntos: List[Avion], umbral: float, analisis: Analisis) -> bool:
+    """
+    Recalcula todo con fuerza bruta (y el par más cercano con divide y
+    vencerás sobre índices, que respeta los empates) y compara con el
+    análisis. Devuelve True si coinciden.
+    """
+    print("\n=== Verificación ===")
+
+    t0 = perf_counter()
+    res_bruta = fuerza_bruta(puntos)
+    t1 = perf_counter()
+    res_dyv = par_mas_cercano_dyv_indices(puntos)
+    t2 = perf_counter()
+    _, pares_bruta = pares_en_riesgo(puntos, umbral)
+    t3 = perf_counter()
+
+    print(f"Distancia mínima (fuerza bruta): {res_bruta.distancia:.6f} en {t1 - t0:.6f} s")
+    print(f"Distancia mínima (divide y vencerás): {res_dyv.distancia:.6f} en {t2 - t1:.6f} s")
+    print(f"Pares en riesgo (fuerza bruta): {len(pares_bruta)} en {t3 - t2:.6f} s")
+
+    def ids(pares):
+        return [(a.id, b.id) for a, b in pares]
+
+    problemas = []
+    if analisis.minimo.distancia != res_bruta.distancia:
+        problemas.append("la distancia mínima no coincide")
+    elif ids(analisis.minimo.pares) != ids(res_bruta.pares):
+        problemas.append("los pares a la distancia mínima no coinciden")
+    if list(analisis.pares_riesgo.indices()) != list(pares_bruta.indices()):
+        problemas.append("los pares en riesgo no coinciden")
+    if res_dyv.distancia != res_bruta.distancia or ids(res_dyv.pares) != ids(res_bruta.pares):
+        problemas.append("divide y vencerás no coincide con fuerza bruta")
+
+    for p in problemas:
+        print(f"❌ {p}")
+    if not problemas:
+        print("✅ El análisis coincide con fuerza bruta.")
+    return not problemas
+
+
+def main_interactivo(args: argparse.Namespace) -> None:
+    """Pide n y umbral por consola y analiza la flota."""
     # ==============================
     # INTERACCIÓN CON EL USUARIO
     # ==============================
@@ -48,26 +325,41 @@ def main(argv: list[str]) -> None:
     print(f"\nGenerando {n} aviones en un plano {max_x}x{max_y}...")
     puntos = generar_puntos(n=n, max_x=max_x, max_y=max_y, seed=42)
 
+    # Índice k-d compartido entre la búsqueda de pares y las consultas de vecinos
+    usa_arbol = args.motor == "kdtree" or args.vecinos or args.histograma is not None
+    arbol = ArbolKD(puntos) if usa_arbol else None
+
     # ==============================
-    # Fuerza bruta
+    # Análisis: mínimo global y pares en riesgo en una pasada
     # ==============================
+    # Resultados de corridas anteriores (la flota sale siempre de la misma semilla)
+    cache = None
+    if not args.sin_cache:
+        cache = CacheResultados()
+        cache.cargar(RUTA_CACHE)
+
     t0 = perf_counter()
-    res_bruta = fuerza_bruta(puntos)
+    # Sin --verificar solo se muestran unos pocos pares: no hace falta la lista.
+    limite = None if args.verificar else PARES_MOSTRADOS
+    analisis = analizar(puntos, umbral, args.motor, arbol=arbol, limite=limite, cache=cache)
     t1 = perf_counter()
-
-    # ==============================
-    # Divide y vencerás
-    # ==============================
-    t2 = perf_counter()
-    res_dyv = par_mas_cercano_dyv(puntos)
-    t3 = perf_counter()
+    if cache is not None and cache.fallos:
+        cache.guardar(RUTA_CACHE)
+    minimo = analisis.minimo
+    total = analisis.total_riesgo
 
     print("\n=== Resultados generales ===")
-    print(f"Distancia mínima (fuerza bruta): {res_bruta.distancia:.6f}")
-    print(f"Tiempo fuerza bruta: {t1 - t0:.6f} s")
+    if args.motor == MOTOR_AUTO:
+        print(f"Motor: {analisis.motor} (elegido automáticamente)")
+    else:
+        print(f"Motor: {analisis.motor}")
+    print(f"Distancia mínima global: {minimo.distancia:.6f} ({len(minimo.pares)} par(es))")
+    print(f"Tiempo de análisis: {t1 - t0:.6f} s")
+    if cache is not None and not cache.fallos:
+        print(f"(resultado tomado de la caché {RUTA_CACHE}; --sin-cache para recalcular)")
 
-    print(f"\nDistancia mínima (divide y vencerás): {res_dyv.distancia:.6f}")
-    print(f"Tiempo divide y vencerás: {t3 - t2:.6f} s")
+    if args.verificar and not verificar(puntos, umbral, analisis):
+        sys.exit(1)
 
     # ==============================
     # ANÁLISIS DE POSIBLE COLISIÓN
@@ -75,29 +367,60 @@ def main(argv: list[str]) -> None:
     print("\n=== Análisis de posible colisión ===")
     print(f"Umbral de colisión definido: {umbral}")
 
-    if not res_dyv.pares:
+    if not minimo.pares:
         print("No hay suficientes aviones para el análisis.")
         return
 
-    if res_dyv.distancia <= umbral:
-        print(f"\n⚠️  Distancia mínima {res_dyv.distancia:.4f} <= umbral → POSIBLE COLISIÓN DETECTADA")
+    if minimo.distancia <= umbral:
+        print(f"\n⚠️  Distancia mínima {minimo.distancia:.4f} <= umbral → POSIBLE COLISIÓN DETECTADA")
     else:
-        print(f"\nDistancia mínima {res_dyv.distancia:.4f} > umbral → No hay riesgo de colisión.")
+        print(f"\nDistancia mínima {minimo.distancia:.4f} > umbral → No hay riesgo de colisión.")
+
+    print(f"\nPares en riesgo (distancia ≤ {umbral:.4f}): {total}")
+
+    if total:
+        if analisis.pares_riesgo is not None:
+            mas_cercanos = top_k(
+                ((par, sqrt(_dist2(*par))) for par in analisis.pares_riesgo), PARES_MOSTRADOS
+            )
+        else:
+            mas_cercanos = analisis.mas_cercanos
+        print("\nPares más cercanos en posible colisión:")
+        for idx, ((a, b), d) in enumerate(mas_cercanos, start=1):
+            print(f"#{idx}: Avión {a.id} ({a.x}, {a.y})  <->  Avión {b.id} ({b.x}, {b.y})  a {d:.4f}")
+        if total > len(mas_cercanos):
+            print(f"... y {total - len(mas_cercanos)} pares adicionales con la misma condición.")
 
-    # Además, listar TODAS las parejas dentro del umbral
-    distancia_min, pares_riesgo = pares_en_riesgo(puntos, umbral)
-    print(f"\nDistancia mínima global (recalculada): {distancia_min:.4f}")
-    print(f"Pares en riesgo (distancia ≤ {umbral:.4f}): {len(pares_riesgo)}")
+    for id_avion in args.vecinos:
+        if not 0 <= id_avion < len(puntos):
+            print(f"\nNo existe el avión {id_avion}.")
+            continue
+        print(f"\nVecinos más cercanos del avión {id_avion}:")
+        for d, j in arbol.vecinos_de(id_avion, args.k):
+            v = puntos[j]
+            print(f"  Avión {v.id} ({v.x}, {v.y}) a {d:.4f}")
 
-    if pares_riesgo:
-        print("\nAlgunos pares en posible colisión:")
-        for idx, (a, b) in enumerate(pares_riesgo[:5], start=1):
-            print(f"#{idx}: Avión {a.id} ({a.x}, {a.y})  <->  Avión {b.id} ({b.x}, {b.y})")
-        if len(pares_riesgo) > 5:
-            print(f"... y {len(pares_riesgo) - 5} pares adicionales con la misma condición.")
+    if args.histograma is not None:
+        imprimir_histograma(vecinos_mas_cercanos(puntos, arbol=arbol), args.histograma)
 
     print("\nAnálisis completado.\n")
 
 
+def imprimir_histograma(vecinos: VecinosCercanos, cubetas: int, ancho: int = 40) -> None:
+    """Histograma de distancias al vecino más cercano, con barras de texto."""
+    tramos = vecinos.histograma(cubetas)
+    print("\n=== Distancia al vecino más cercano ===")
+    if not tramos:
+        print("No hay suficientes aviones.")
+        return
+    distancias = sorted(vecinos.distancias)
+    mediana = distancias[len(distancias) // 2]
+    print(f"Mínima: {distancias[0]:.4f}  mediana: {mediana:.4f}  máxima: {distancias[-1]:.4f}")
+    mayor = max(c for _, _, c in tramos)
+    for desde, hasta, cantidad in tramos:
+        barra = "█" * max(1, round(cantidad / mayor * ancho)) if cantidad else ""
+        print(f"[{desde:9.3f}, {hasta:9.3f})  {cantidad:>8}  {barra}")
+
+
 if __name__ == "__main__":
     main(sys.argv)
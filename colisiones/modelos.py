@@ -1,18 +1,21 @@
 # colisiones/modelos.py
-from dataclasses import dataclass
-from typing import List, Tuple
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple, overload
 
 
-@dataclass
+@dataclass(slots=True)
 class Avion:
     """
     Representa un avión/punto en el plano.
     id: identificador del avión
     x, y: coordenadas
+    z: altitud (los algoritmos del plano la ignoran)
     """
     id: int
     x: float
     y: float
+    z: float = 0.0
 
 
 @dataclass
@@ -24,3 +27,130 @@ class ResultadoColision:
     """
     distancia: float
     pares: List[Tuple[Avion, Avion]]
+
+
+@dataclass
+class Estadisticas:
+    """
+    Contadores y tiempos que juntan los motores mientras la instrumentación
+    está activa (ver perfil.instrumentar). Los nombres van como
+    "motor.medida", por ejemplo "dyv.franja" o "grilla.construccion".
+    - contadores: totales (distancias calculadas, pares emitidos, ...)
+    - maximos: el mayor valor visto (profundidad de recursión, franja más ancha)
+    - tiempos: segundos acumulados por fase
+    """
+    contadores: Dict[str, int] = field(default_factory=dict)
+    maximos: Dict[str, int] = field(default_factory=dict)
+    tiempos: Dict[str, float] = field(default_factory=dict)
+
+    def contar(self, nombre: str, k: int = 1) -> None:
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + k
+
+    def maximo(self, nombre: str, valor: int) -> None:
+        if valor > self.maximos.get(nombre, valor - 1):
+            self.maximos[nombre] = valor
+
+    def tiempo(self, nombre: str, segundos: float) -> None:
+        self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + segundos
+
+    def resumen(self) -> str:
+        """Texto de una línea por medida, ordenado por nombre."""
+        lineas = [f"{k:<32} {v:>14,}" for k, v in sorted(self.contadores.items())]
+        lineas += [f"{k + ' (máx)':<32} {v:>14,}" for k, v in sorted(self.maximos.items())]
+        lineas += [f"{k + ' (s)':<32} {v:>14.6f}" for k, v in sorted(self.tiempos.items())]
+        return "\n".join(lineas)
+
+
+class ParesIndexados(Sequence[Tuple[Avion, Avion]]):
+    """
+    Lista de pares guardada como dos columnas de índices sobre la flota.
+    Cada par ocupa dos enteros; la tupla (Avion, Avion) se arma al pedirla.
+    - puntos: flota a la que apuntan los índices
+    - ia, ib: índices del primer y segundo avión de cada par
+    """
+    __slots__ = ("puntos", "ia", "ib")
+
+    def __init__(self, puntos: Sequence[Avion], ia: Sequence[int] | None = None,
+                 ib: Sequence[int] | None = None):
+        self.puntos = puntos
+        self.ia = ia if ia is not None else array("l")
+        self.ib = ib if ib is not None else array("l")
+        if len(self.ia) != len(self.ib):
+            raise ValueError("ia e ib deben tener la misma longitud")
+
+    def agregar(self, i: int, j: int) -> None:
+        self.ia.append(i)
+        self.ib.append(j)
+
+    def indices(self) -> Iterator[Tuple[int, int]]:
+        """Itera los pares como (i, j) sin crear tuplas de aviones."""
+        return zip(self.ia, self.ib)
+
+    def __len__(self) -> int:
+        return len(self.ia)
+
+    @overload
+    def __getitem__(self, k: int) -> Tuple[Avion, Avion]: ...
+
+    @overload
+    def __getitem__(self, k: slice) -> List[Tuple[Avion, Avion]]: ...
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [(self.puntos[i], self.puntos[j])
+                    for i, j in zip(self.ia[k], self.ib[k])]
+        return self.puntos[self.ia[k]], self.puntos[self.ib[k]]
+
+    def __iter__(self) -> Iterator[Tuple[Avion, Avion]]:
+        puntos = self.puntos
+        for i, j in zip(self.ia, self.ib):
+            yield puntos[i], puntos[j]
+
+    def __repr__(self) -> str:
+        return f"ParesIndexados({len(self)} pares)"
+
+
+class VecinosCercanos:
+    """
+    Vecino más cercano de cada avión, guardado en columnas.
+    - puntos: flota a la que apuntan los índices
+    - indices: indices[i] es el vecino más cercano de puntos[i] (-1 si no hay)
+    - distancias: distancias[i] es la distancia a ese vecino (inf si no hay)
+    """
+    __slots__ = ("puntos", "indices", "distancias")
+
+    def __init__(self, puntos: Sequence[Avion], indices: Sequence[int], distancias: Sequence[float]):
+        if not (len(puntos) == len(indices) == len(distancias)):
+            raise ValueError("puntos, indices y distancias deben tener la misma longitud")
+        self.puntos = puntos
+        self.indices = indices
+        self.distancias = distancias
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def ids(self) -> array:
+        """Ids de los vecinos (-1 para los aviones sin vecino)."""
+        puntos = self.puntos
+        return array("q", (puntos[j].id if j >= 0 else -1 for j in self.indices))
+
+    def histograma(self, cubetas: int = 10) -> List[Tuple[float, float, int]]:
+        """
+        Cuántos aviones tienen a su vecino en cada tramo [desde, hasta) entre
+        la menor y la mayor distancia, como (desde, hasta, cantidad). El
+        último tramo incluye a la mayor.
+        """
+        finitas = [d for d in self.distancias if d != float("inf")]
+        if not finitas or cubetas < 1:
+            return []
+        lo = min(finitas)
+        hi = max(finitas)
+        ancho = (hi - lo) / cubetas
+        conteo = [0] * cubetas
+        for d in finitas:
+            k = int((d - lo) / ancho) if ancho > 0 else 0
+            conteo[min(k, cubetas - 1)] += 1
+        return [(lo + k * ancho, lo + (k + 1) * ancho, c) for k, c in enumerate(conteo)]
+
+    def __repr__(self) -> str:
+        return f"VecinosCercanos({len(self)} aviones)"
@@ -0,0 +1,160 @@
+# colisiones/paralelo.py
+"""
+Par más cercano con divide y vencerás repartido en varios procesos.
+
+Las coordenadas ordenadas por x se copian una vez a memoria compartida.
+Cada proceso resuelve un tramo contiguo de posiciones y el proceso padre
+hace los niveles superiores de la recursión: une tramos vecinos revisando
+solo la franja alrededor de cada corte.
+
+Los empates son exactos: se devuelven todos los pares a la distancia mínima,
+sin repetidos y en el mismo orden (i, j) que fuerza_bruta.
+"""
+from __future__ import annotations
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from multiprocessing import shared_memory
+from typing import List, Sequence, Tuple
+
+from .algoritmos import _unir_franja
+from .modelos import Avion, ResultadoColision
+
+
+# Debajo de este tamaño no vale la pena arrancar procesos
+CORTE_PARALELO = 200_000
+
+# Tramos de este tamaño o menos se resuelven por fuerza bruta
+_HOJA = 8
+
+# (mejor_dist2, pares de posiciones en el orden por x, posiciones del tramo
+# ordenadas por y)
+_Parcial = Tuple[float, List[Tuple[int, int]], List[int]]
+
+
+def _fuerza_bruta_tramo(xs: Sequence[float], ys: Sequence[float], lo: int, hi: int) -> _Parcial:
+    mejor_dist2 = float("inf")
+    pares: List[Tuple[int, int]] = []
+    for i in range(lo, hi):
+        for j in range(i + 1, hi):
+            dx = xs[i] - xs[j]
+            dy = ys[i] - ys[j]
+            d2 = dx * dx + dy * dy
+            if d2 < mejor_dist2:
+                mejor_dist2 = d2
+                pares = [(i, j)]
+            elif d2 == mejor_dist2:
+                pares.append((i, j))
+    return mejor_dist2, pares, sorted(range(lo, hi), key=ys.__getitem__)
+
+
+def _unir(xs: Sequence[float], ys: Sequence[float], lo: int, mid: int, hi: int,
+          izq: _Parcial, der: _Parcial) -> _Parcial:
+    """
+    Combina los resultados de [lo, mid) y [mid, hi) con el mismo paso de
+    unión que par_mas_cercano_dyv_indices.
+    """
+    if izq[0] < der[0]:
+        mejor_dist2, pares = izq[0], list(izq[1])
+    elif der[0] < izq[0]:
+        mejor_dist2, pares = der[0], list(der[1])
+    else:
+        mejor_dist2, pares = izq[0], izq[1] + der[1]
+
+    # Los dos lados ya vienen ordenados por y: timsort los mezcla en una
+    # pasada lineal, como en par_mas_cercano_dyv_indices.
+    por_y = sorted(izq[2] + der[2], key=ys.__getitem__)
+    mejor_dist2, pares, _ = _unir_franja(xs, ys, lo, mid, hi, por_y, mejor_dist2, pares)
+    return mejor_dist2, pares, por_y
+
+
+def _dyv_tramo(xs: Sequence[float], ys: Sequence[float], lo: int, hi: int) -> _Parcial:
+    """Divide y vencerás sobre las posiciones [lo, hi) de xs/ys ordenados por x."""
+    if hi - lo <= _HOJA:
+        return _fuerza_bruta_tramo(xs, ys, lo, hi)
+    mid = (lo + hi) // 2
+    izq = _dyv_tramo(xs, ys, lo, mid)
+    der = _dyv_tramo(xs, ys, mid, hi)
+    return _unir(xs, ys, lo, mid, hi, izq, der)
+
+
+def _resolver_tramo(nombre: str, n: int, lo: int, hi: int) -> _Parcial:
+    """Trabajo de cada proceso: resuelve su tramo leyendo la memoria compartida sin copiarla."""
+    shm = shared_memory.SharedMemory(name=nombre)
+    coords = shm.buf.cast("d")
+    xs = coords[lo:hi]
+    ys = coords[n + lo:n + hi]
+    try:
+        mejor_dist2, pares, por_y = _dyv_tramo(xs, ys, 0, hi - lo)
+    finally:
+        # Las vistas se sueltan antes de cerrar: close() falla si quedan vivas
+        xs.release()
+        ys.release()
+        coords.release()
+        shm.close()
+    return mejor_dist2, [(i + lo, j + lo) for i, j in pares], [p + lo for p in por_y]
+
+
+def _combinar_tramos(xs: Sequence[float], ys: Sequence[float], cortes: List[int],
+                     parciales: List[_Parcial], a: int, b: int) -> _Parcial:
+    """Une los tramos a..b-1 como lo harían los niveles altos de la recursión."""
+    if b - a == 1:
+        return parciales[a]
+    m = (a + b) // 2
+    izq = _combinar_tramos(xs, ys, cortes, parciales, a, m)
+    der = _combinar_tramos(xs, ys, cortes, parciales, m, b)
+    return _unir(xs, ys, cortes[a], cortes[m], cortes[b], izq, der)
+
+
+def par_mas_cercano_paralelo(
+    puntos: List[Avion],
+    procesos: int | None = None,
+    corte: int = CORTE_PARALELO,
+) -> ResultadoColision:
+    """
+    Par más cercano usando varios procesos.
+    procesos: número de procesos (por defecto, os.cpu_count())
+    corte: con menos aviones que esto se resuelve todo en este proceso
+    """
+    n = len(puntos)
+    if n < 2:
+        return ResultadoColision(float("inf"), [])
+
+    orden = sorted(range(n), key=lambda i: puntos[i].x)
+    xs = array("d", (puntos[i].x for i in orden))
+    ys = array("d", (puntos[i].y for i in orden))
+
+    procesos = procesos or os.cpu_count() or 1
+    if n < max(corte, 8) or procesos < 2:
+        mejor_dist2, pares_pos, _ = _dyv_tramo(xs, ys, 0, n)
+    else:
+        tramos = min(procesos, n // 4)
+        cortes = [n * k // tramos for k in range(tramos + 1)]
+
+        shm = shared_memory.SharedMemory(create=True, size=16 * n)
+        try:
+            coords = shm.buf.cast("d")
+            coords[:n] = xs
+            coords[n:] = ys
+            coords.release()
+
+            with ProcessPoolExecutor(max_workers=procesos) as ex:
+                futuros = [
+                    ex.submit(_resolver_tramo, shm.name, n, cortes[k], cortes[k + 1])
+                    for k in range(tramos)
+                ]
+                parciales = [f.result() for f in futuros]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        mejor_dist2, pares_pos, _ = _combinar_tramos(xs, ys, cortes, parciales, 0, tramos)
+
+    # De posiciones en el orden por x a índices originales, como fuerza_bruta
+    pares_idx = sorted(
+        (min(orden[i], orden[j]), max(orden[i], orden[j])) for i, j in pares_pos
+    )
+    pares = [(puntos[i], puntos[j]) for i, j in pares_idx]
+    return ResultadoColision(sqrt(mejor_dist2), pares)
@@ -0,0 +1,66 @@
+# colisiones/perfil.py
+"""
+Instrumentación opcional de los motores.
+
+    with instrumentar() as stats:
+        par_mas_cercano_dyv(puntos)
+    print(stats.resumen())
+
+Cada motor consulta una sola vez, al entrar, si hay estadísticas activas y
+solo cuenta por fase, nivel o bloque (nunca dentro de las vueltas internas),
+así que con la instrumentación apagada el costo es una lectura por llamada.
+Las estadísticas activas son por hilo (contextvars).
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from .modelos import Estadisticas
+
+
+_ACTIVAS: ContextVar[Optional[Estadisticas]] = ContextVar("estadisticas", default=None)
+
+
+def activas() -> Optional[Estadisticas]:
+    """Las estadísticas donde deben contar los motores, o None."""
+    return _ACTIVAS.get()
+
+
+@contextmanager
+def instrumentar(stats: Estadisticas | None = None) -> Iterator[Estadisticas]:
+    """Activa la instrumentación dentro del bloque with."""
+    if stats is None:
+        stats = Estadisticas()
+    token = _ACTIVAS.set(stats)
+    try:
+        yield stats
+    finally:
+        _ACTIVAS.reset(token)
+
+
+@contextmanager
+def perfilar(ruta: str | None = None) -> Iterator[cProfile.Profile]:
+    """
+    Corre el bloque bajo cProfile.
+    ruta: si se da, guarda ahí el perfil (se abre con pstats o snakeviz)
+    """
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield perfil
+    finally:
+        perfil.disable()
+        if ruta is not None:
+            perfil.dump_stats(ruta)
+
+
+def resumen_perfil(perfil: cProfile.Profile, limite: int = 20) -> str:
+    """Las limite funciones con más tiempo acumulado."""
+    salida = io.StringIO()
+    pstats.Stats(perfil, stream=salida).sort_stats("cumulative").print_stats(limite)
+    return salida.getvalue()
@@ -3,10 +3,17 @@
 import tkinter as tk
 from tkinter import ttk
 import math
-from typing import List, Optional, Tuple
+from bisect import bisect_left
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
 from .generador import generar_puntos
-from .algoritmos import pares_en_riesgo
-from .modelos import Avion, ResultadoColision
+from .algoritmos import _dist2, top_k, vecinos_mas_cercanos
+from .analisis import analizar
+from .cache import CacheResultados, huella_flota
+from .kdtree import ArbolKD
+from .modelos import Avion, ResultadoColision, VecinosCercanos
+from .seleccion import MOTOR_AUTO, elegir_motor, motores_disponibles, recalibrar
 
 BG_COLOR = "#060714"      # Fondo general
 CANVAS_BG = "#02030A"     # Fondo del radar
@@ -18,10 +25,126 @@ RADAR_RING = "#ffb2e1"    # Anillos del radar
 RADAR_SWEEP = "#ff009b"   # Línea del radar
 POINT_COLOR = "#a0fff6"   # Aviones
 HIGHLIGHT_COLOR = "#FFEA00"  # Aviones en posible colisión
+# Celdas de densidad, de menos a más aviones
+DENSITY_COLORS = ["#12343a", "#1f5c63", "#3a8f93", "#63c4c2", POINT_COLOR]
+# Aviones según la distancia a su vecino más cercano, en múltiplos del umbral:
+# hasta 1x, hasta 2x, hasta 4x y más lejos
+PROXIMITY_COLORS = ["#ff4d6d", "#ff9f1c", "#ffd166", POINT_COLOR]
+PROXIMITY_STEPS = (1, 2, 4)
 
 PLANE_MAX_X = 1000
 PLANE_MAX_Y = 1000
 
+# Cada cuánto (ms) se revisa el avance de una detección en curso
+INTERVALO_PROGRESO_MS = 100
+
+# Por encima de esto los aviones se dibujan como celdas de densidad
+MAX_AVIONES_DIBUJADOS = 4000
+# Celdas por lado de la vista de densidad
+CELDAS_DENSIDAD = 80
+# Líneas de pares en riesgo dibujadas como máximo
+MAX_PARES_DIBUJADOS = 2000
+
+# Orden de apilado de las capas del radar, de abajo hacia arriba
+CAPAS = ("fondo", "densidad", "avion", "riesgo_linea", "riesgo_avion", "mensaje", "barrido", "rendimiento")
+
+# Animación del barrido: velocidad fija, cuadros cada FRAME_MIN_MS a FRAME_MAX_MS
+# según lo que cueste dibujar. Un cuadro no debería usar más de FRAME_PRESUPUESTO
+# del intervalo, para dejar tiempo a los eventos de la ventana.
+VELOCIDAD_BARRIDO = 2 / 30  # grados por ms
+FRAME_MIN_MS = 30
+FRAME_MAX_MS = 250
+FRAME_PRESUPUESTO = 0.25
+
+
+class DeteccionCancelada(Exception):
+    """Se lanza dentro del hilo de trabajo cuando la detección se cancela."""
+
+
+class TrabajoDeteccion(threading.Thread):
+    """
+    Corre una detección (o un cálculo auxiliar) fuera del hilo de Tk.
+    tarea: recibe la función de progreso y devuelve el resultado
+    calibracion: el trabajo es una calibración de los motores
+    El hilo nunca toca widgets: la interfaz consulta progreso, resultado y
+    error desde root.after.
+    """
+
+    def __init__(self, tarea: Callable[[Callable[[float], None]], object], calibracion: bool = False):
+        super().__init__(daemon=True)
+        self._tarea = tarea
+        self._cancelado = threading.Event()
+        self.progreso: float = 0.0
+        self.resultado: object = None
+        self.error: Optional[BaseException] = None
+        self.calibracion = calibracion
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado.is_set()
+
+    def _informar(self, fraccion: float):
+        if self._cancelado.is_set():
+            raise DeteccionCancelada()
+        self.progreso = fraccion
+
+    def run(self):
+        try:
+            self.resultado = self._tarea(self._informar)
+        except DeteccionCancelada:
+            pass
+        except Exception as e:
+            self.error = e
+
+
+class ReservaItems:
+    """
+    Items de canvas reutilizables de una misma capa (tag).
+    En vez de borrar y crear, los items se mueven con coords y los que
+    sobran se ocultan.
+    """
+
+    def __init__(self, canvas: tk.Canvas, tag: str, crear: Callable[[tk.Canvas, str], int]):
+        self.canvas = canvas
+        self.tag = tag
+        self._crear = crear
+        self.items: List[int] = []
+        self.visibles = 0
+
+    def mostrar(self, formas) -> int:
+        """
+        formas: iterable de (coords, opciones); opciones puede ser None.
+        Devuelve cuántos items quedaron visibles.
+        """
+        canvas = self.canvas
+        k = 0
+        for coords, opciones in formas:
+            if k < len(self.items):
+                item = self.items[k]
+                canvas.coords(item, *coords)
+                if k >= self.visibles:
+                    canvas.itemconfigure(item, state="normal", **(opciones or {}))
+                elif opciones:
+                    canvas.itemconfigure(item, **opciones)
+            else:
+                item = self._crear(canvas, self.tag)
+                canvas.coords(item, *coords)
+                if opciones:
+                    canvas.itemconfigure(item, **opciones)
+                self.items.append(item)
+            k += 1
+
+        for item in self.items[k:self.visibles]:
+            canvas.itemconfigure(item, state="hidden")
+        self.visibles = k
+        return k
+
+    def ocultar(self):
+        self.mostrar(())
+
 
 class InterfazColisiones:
     def __init__(self, root: tk.Tk):
@@ -33,15 +156,36 @@ class InterfazColisiones:
         # Estado del radar
         self.radar_angle: float = 0
         self.radar_line: Optional[int] = None
+        self.radar_animando = False
+        self._barrido_after: Optional[str] = None
+        self.frame_ms: float = FRAME_MIN_MS
+        self._frame_costo_ms: float = 0.0
+        self._ultimo_frame: Optional[float] = None
+        # espera pedida a root.after para el próximo cuadro
+        self._frame_pedido_ms: int = FRAME_MIN_MS
 
 
         self.aviones: List[Avion] = []
         self.ultimo_resultado: Optional[ResultadoColision] = None
+        # índice k-d de la flota actual, se construye al primer uso
+        self._arbol: Optional[ArbolKD] = None
+        # vecino más cercano de cada avión, para colorear por proximidad
+        self._vecinos: Optional[VecinosCercanos] = None
+        # resultados ya calculados, por huella de flota y umbral
+        self._cache = CacheResultados()
+        self._huella: Optional[str] = None
+        # detección corriendo en segundo plano, si hay una
+        self._trabajo: Optional[TrabajoDeteccion] = None
 
         self._configurar_estilos()
         self._crear_layout()
         self._dibujar_radar_base()
-        self._animar_radar()
+        self._crear_capas()
+
+        # El barrido se pausa mientras la ventana no se ve
+        self.root.bind("<Map>", self._on_ventana_visible, add="+")
+        self.root.bind("<Unmap>", self._on_ventana_oculta, add="+")
+        self._iniciar_barrido()
 
     
     def _configurar_estilos(self):
@@ -149,6 +293,19 @@ class InterfazColisiones:
         self.entry_umbral = ttk.Entry(controls_frame, width=8, style="Dark.TEntry")
         self.entry_umbral.pack(side=tk.LEFT, padx=6)
 
+        ttk.Label(
+            controls_frame, text="Motor:", style="Dark.TLabel"
+        ).pack(side=tk.LEFT, padx=(10, 0))
+
+        self.combo_motor = ttk.Combobox(
+            controls_frame,
+            values=motores_disponibles(),
+            width=12,
+            state="readonly",
+        )
+        self.combo_motor.set(MOTOR_AUTO)
+        self.combo_motor.pack(side=tk.LEFT, padx=6)
+
         btn_generar = ttk.Button(
             controls_frame,
             text="Generar puntos",
@@ -165,6 +322,14 @@ class InterfazColisiones:
         )
         btn_detectar.pack(side=tk.LEFT, padx=8)
 
+        self.btn_calibrar = ttk.Button(
+            controls_frame,
+            text="Calibrar",
+            style="Dark.TButton",
+            command=self.on_calibrar,
+        )
+        self.btn_calibrar.pack(side=tk.LEFT, padx=8)
+
         self.status_label = ttk.Label(
             controls_frame,
             text="Estado: esperando puntos...",
@@ -185,6 +350,7 @@ class InterfazColisiones:
         self.canvas.pack(
             side=tk.LEFT, padx=(0, 10), pady=5, fill=tk.BOTH, expand=True
         )
+        self.canvas.bind("<Button-1>", self.on_click_radar)
 
         side_panel = ttk.Frame(center_frame, style="Dark.TFrame")
         side_panel.pack(side=tk.RIGHT, fill=tk.Y, padx=(5, 5))
@@ -197,9 +363,16 @@ class InterfazColisiones:
             "• Ingresa N aeronaves y pulsa 'Generar puntos'.\n"
             "  Se usan coordenadas aleatorias en el plano 1000x1000.\n"
             "• El radar muestra la posición de cada avión.\n"
-            "• 'Detectar colisiones' usa una búsqueda sobre todos los pares\n"
-            "  (pares_en_riesgo) para encontrar TODAS las parejas cuya\n"
-            "  distancia sea menor o igual al umbral.\n\n"
+            "• Haz clic en el radar para ver las 3 aeronaves más cercanas.\n"
+            "• 'Detectar colisiones' encuentra TODAS las parejas cuya\n"
+            "  distancia sea menor o igual al umbral, con el motor elegido:\n"
+            "  'fuerza_bruta' revisa todos los pares y 'grilla' solo\n"
+            "  compara aviones en celdas vecinas de lado umbral.\n"
+            "  Con 'auto' se usa el que se estima más rápido para la\n"
+            "  flota y el umbral.\n"
+            "• 'Calibrar' mide los motores en esta máquina (unos\n"
+            "  segundos) para que 'auto' elija mejor. Se puede cancelar\n"
+            "  pulsando de nuevo.\n\n"
             "📏 Umbral de colisión:\n"
             "Distancia mínima (en unidades del plano 1000x1000) para\n"
             "considerar que dos aeronaves están en posible colisión.\n"
@@ -231,7 +404,8 @@ class InterfazColisiones:
  
     # radar
     def _dibujar_radar_base(self):
-        self.canvas.delete("all")
+        """Dibuja una sola vez lo que no cambia: todo queda con el tag 'fondo'."""
+        self.canvas.delete("fondo")
 
         w = int(self.canvas["width"])
         h = int(self.canvas["height"])
@@ -245,14 +419,15 @@ class InterfazColisiones:
             text="Plano cartesiano simulado 1000 x 1000",
             fill=PRIMARY_COLOR,
             font=("Segoe UI Semibold", 11),
+            tags="fondo",
         )
 
-        self.canvas.create_rectangle(0, 0, w, h, fill=CANVAS_BG, outline="")
+        self.canvas.create_rectangle(0, 0, w, h, fill=CANVAS_BG, outline="", tags="fondo")
         step = 40
         for x in range(0, w, step):
-            self.canvas.create_line(x, 0, x, h, fill=GRID_COLOR)
+            self.canvas.create_line(x, 0, x, h, fill=GRID_COLOR, tags="fondo")
         for y in range(0, h, step):
-            self.canvas.create_line(0, y, w, y, fill=GRID_COLOR)
+            self.canvas.create_line(0, y, w, y, fill=GRID_COLOR, tags="fondo")
 
         for factor in [0.3, 0.5, 0.7, 1.0]:
             r = self.r * factor
@@ -262,6 +437,7 @@ class InterfazColisiones:
                 self.cx + r,
                 self.cy + r,
                 outline=RADAR_RING,
+                tags="fondo",
             )
 
         self.canvas.create_line(
@@ -270,6 +446,7 @@ class InterfazColisiones:
             self.cx + self.r + 10,
             self.cy,
             fill=RADAR_RING,
+            tags="fondo",
         )
         self.canvas.create_line(
             self.cx,
@@ -277,6 +454,7 @@ class InterfazColisiones:
             self.cx,
             self.cy + self.r + 10,
             fill=RADAR_RING,
+            tags="fondo",
         )
 
         self.canvas.create_oval(
@@ -286,6 +464,7 @@ class InterfazColisiones:
             self.cy + 5,
             fill=ACCENT_COLOR,
             outline="",
+            tags="fondo",
         )
 
         self.canvas.create_text(
@@ -294,29 +473,95 @@ class InterfazColisiones:
             text="Estación de control - Radar plano 1000 x 1000 (unidades simuladas)",
             fill=PRIMARY_COLOR,
             font=("Segoe UI", 11),
+            tags="fondo",
         )
 
 
     #  Animación del radar|
+    def _iniciar_barrido(self):
+        if self.radar_line is None:
+            self.radar_line = self.canvas.create_line(
+                self.cx,
+                self.cy,
+                self.cx + self.r,
+                self.cy,
+                fill=RADAR_SWEEP,
+                width=2,
+                tags="barrido",
+            )
+            self.texto_rendimiento = self.canvas.create_text(
+                8,
+                8,
+                anchor="nw",
+                text="",
+                fill=TEXT_COLOR,
+                font=("Consolas", 9),
+                tags="rendimiento",
+            )
+        self.radar_animando = True
+        if self._barrido_after is None:
+            self._ultimo_frame = None
+            self._programar_cuadro()
+
+    def _programar_cuadro(self):
+        self._frame_pedido_ms = int(self.frame_ms)
+        self._barrido_after = self.root.after(self._frame_pedido_ms, self._animar_radar)
+
+    def _on_ventana_visible(self, event):
+        if event.widget is self.root:
+            self._iniciar_barrido()
+
+    def _on_ventana_oculta(self, event):
+        if event.widget is self.root:
+            self.radar_animando = False
+            if self._barrido_after is not None:
+                self.root.after_cancel(self._barrido_after)
+                self._barrido_after = None
+
     def _animar_radar(self):
-        if self.radar_line is not None:
-            self.canvas.delete(self.radar_line)
+        self._barrido_after = None
+        if not self.radar_animando or not self.root.winfo_viewable():
+            # se reanuda con el próximo <Map>
+            self.radar_animando = False
+            return
 
-        self.radar_angle = (self.radar_angle + 2) % 360
+        ahora = time.perf_counter()
+        if self._ultimo_frame is None:
+            transcurrido_ms = self.frame_ms
+            retraso_ms = 0.0
+        else:
+            transcurrido_ms = (ahora - self._ultimo_frame) * 1000
+            # Lo que este callback llegó tarde es lo que Tk tardó en redibujar
+            # el cuadro anterior (y en atender el resto de los eventos).
+            retraso_ms = max(0.0, transcurrido_ms - self._frame_pedido_ms)
+        self._ultimo_frame = ahora
+
+        # El ángulo avanza según el tiempo real, así la velocidad no depende
+        # de cuántos cuadros se alcanzan a dibujar.
+        self.radar_angle = (self.radar_angle + VELOCIDAD_BARRIDO * transcurrido_ms) % 360
         angle_rad = math.radians(self.radar_angle)
         x_end = self.cx + self.r * math.cos(angle_rad)
         y_end = self.cy - self.r * math.sin(angle_rad)
-
-        self.radar_line = self.canvas.create_line(
-            self.cx,
-            self.cy,
-            x_end,
-            y_end,
-            fill=RADAR_SWEEP,
-            width=2,
+        self.canvas.coords(self.radar_line, self.cx, self.cy, x_end, y_end)
+
+        # El redibujado queda para cuando Tk esté libre: se mide por el retraso
+        # del próximo callback, sin forzarlo acá.
+        costo_ms = (time.perf_counter() - ahora) * 1000 + retraso_ms
+        # media móvil para no saltar con un cuadro aislado
+        self._frame_costo_ms = 0.8 * self._frame_costo_ms + 0.2 * costo_ms
+
+        objetivo = self._frame_costo_ms / FRAME_PRESUPUESTO
+        self.frame_ms = min(FRAME_MAX_MS, max(FRAME_MIN_MS, objetivo))
+        self.canvas.itemconfigure(
+            self.texto_rendimiento,
+            text=(
+                f"cuadro {self._frame_costo_ms:.1f} ms · "
+                f"{1000 / self.frame_ms:.0f} fps · "
+                f"{self._items_dinamicos()} items"
+            ),
         )
 
-        self.root.after(30, self._animar_radar)
+        self._programar_cuadro()
 
    
     def _mapear_a_canvas(self, x: float, y: float) -> Tuple[float, float]:
@@ -334,22 +579,144 @@ class InterfazColisiones:
         cy = top + (1 - ny) * size  # invertir eje y
         return cx, cy
 
-    def _dibujar_avion(self, avion: Avion, color: str = POINT_COLOR, radio: int = 5):
-        x, y = self._mapear_a_canvas(avion.x, avion.y)
-        self.canvas.create_oval(
-            x - radio,
-            y - radio,
-            x + radio,
-            y + radio,
-            fill=color,
-            outline="",
+    def _mapear_a_plano(self, cx: float, cy: float) -> Tuple[float, float]:
+        """Inversa de _mapear_a_canvas."""
+        size = 2 * self.r
+        nx = (cx - (self.cx - self.r)) / size
+        ny = 1 - (cy - (self.cy - self.r)) / size
+        return nx * PLANE_MAX_X, ny * PLANE_MAX_Y
+
+    def _indice(self) -> ArbolKD:
+        if self._arbol is None:
+            self._arbol = ArbolKD(self.aviones)
+        return self._arbol
+
+    # capas reutilizables
+    def _crear_capas(self):
+        def ovalo(color):
+            return lambda c, tag: c.create_oval(0, 0, 0, 0, fill=color, outline="", tags=tag)
+
+        self.capa_densidad = ReservaItems(
+            self.canvas,
+            "densidad",
+            lambda c, tag: c.create_rectangle(0, 0, 0, 0, outline="", tags=tag),
+        )
+        self.capa_aviones = ReservaItems(self.canvas, "avion", ovalo(POINT_COLOR))
+        self.capa_lineas = ReservaItems(
+            self.canvas,
+            "riesgo_linea",
+            lambda c, tag: c.create_line(0, 0, 0, 0, fill=HIGHLIGHT_COLOR, width=2, tags=tag),
+        )
+        self.capa_riesgo = ReservaItems(self.canvas, "riesgo_avion", ovalo(HIGHLIGHT_COLOR))
+        self.mensaje = self.canvas.create_text(
+            self.cx,
+            self.cy - self.r - 25,
+            text="",
+            fill=ACCENT_COLOR,
+            font=("Segoe UI Semibold", 11),
+            tags="mensaje",
+            state="hidden",
+        )
+
+    def _ordenar_capas(self):
+        for tag in CAPAS:
+            self.canvas.tag_raise(tag)
+
+    def _items_dinamicos(self) -> int:
+        return sum(
+            capa.visibles
+            for capa in (self.capa_densidad, self.capa_aviones, self.capa_lineas, self.capa_riesgo)
         )
 
+    def _mostrar_mensaje(self, texto: Optional[str]):
+        if texto is None:
+            self.canvas.itemconfigure(self.mensaje, state="hidden")
+        else:
+            self.canvas.itemconfigure(self.mensaje, text=texto, state="normal")
+
+    def _ovalo(self, avion: Avion, radio: int) -> Tuple[float, float, float, float]:
+        x, y = self._mapear_a_canvas(avion.x, avion.y)
+        return x - radio, y - radio, x + radio, y + radio
+
+    def _dibujar_flota(self):
+        """
+        Aviones uno por uno, coloreados por la distancia a su vecino más
+        cercano, o celdas de densidad si son demasiados.
+        """
+        if len(self.aviones) <= MAX_AVIONES_DIBUJADOS:
+            self.capa_densidad.ocultar()
+            colores = self._colores_proximidad()
+            self.capa_aviones.mostrar(
+                (self._ovalo(a, 5), {"fill": color}) for a, color in zip(self.aviones, colores)
+            )
+        else:
+            self.capa_aviones.ocultar()
+            self.capa_densidad.mostrar(self._celdas_densidad())
+        self._ordenar_capas()
+
+    def _umbral_actual(self) -> Optional[float]:
+        try:
+            umbral = float(self.entry_umbral.get().strip())
+        except ValueError:
+            return None
+        return umbral if umbral > 0 else None
+
+    def _colores_proximidad(self) -> List[str]:
+        """
+        Color de cada avión; sin umbral válido, o mientras los vecinos se
+        calculan en segundo plano, todos con POINT_COLOR.
+        """
+        umbral = self._umbral_actual()
+        if umbral is None or self._vecinos is None:
+            return [POINT_COLOR] * len(self.aviones)
+        cortes = [umbral * k for k in PROXIMITY_STEPS]
+        return [PROXIMITY_COLORS[bisect_left(cortes, d)] for d in self._vecinos.distancias]
+
+    def _celdas_densidad(self):
+        conteo = {}
+        for a in self.aviones:
+            cx = min(int(a.x / PLANE_MAX_X * CELDAS_DENSIDAD), CELDAS_DENSIDAD - 1)
+            cy = min(int(a.y / PLANE_MAX_Y * CELDAS_DENSIDAD), CELDAS_DENSIDAD - 1)
+            conteo[(cx, cy)] = conteo.get((cx, cy), 0) + 1
+
+        ancho = PLANE_MAX_X / CELDAS_DENSIDAD
+        alto = PLANE_MAX_Y / CELDAS_DENSIDAD
+        maximo = max(conteo.values())
+        niveles = len(DENSITY_COLORS)
+        for (cx, cy), cantidad in conteo.items():
+            x0, y0 = self._mapear_a_canvas(cx * ancho, (cy + 1) * alto)
+            x1, y1 = self._mapear_a_canvas((cx + 1) * ancho, cy * alto)
+            # escala logarítmica para que las celdas poco pobladas se vean
+            nivel = int(math.log1p(cantidad) / math.log1p(maximo) * (niveles - 1))
+            yield (x0, y0, x1, y1), {"fill": DENSITY_COLORS[nivel]}
+
+    def _dibujar_riesgo(self, pares):
+        """Líneas y aviones resaltados de los pares dados."""
+        lineas = []
+        resaltados = {}
+        for a, b in pares:
+            x1, y1 = self._mapear_a_canvas(a.x, a.y)
+            x2, y2 = self._mapear_a_canvas(b.x, b.y)
+            lineas.append(((x1, y1, x2, y2), None))
+            resaltados[id(a)] = a
+            resaltados[id(b)] = b
+        self.capa_lineas.mostrar(lineas)
+        self.capa_riesgo.mostrar((self._ovalo(a, 6), None) for a in resaltados.values())
+        self._ordenar_capas()
+        return len(pares)
+
 
     def on_generar_puntos(self):
-        self._dibujar_radar_base()
-        self.aviones.clear()
+        self._cancelar_trabajo()
+        self.capa_lineas.ocultar()
+        self.capa_riesgo.ocultar()
+        self._mostrar_mensaje(None)
+        # lista nueva: un hilo cancelado todavía puede estar leyendo la anterior
+        self.aviones = []
         self.ultimo_resultado = None
+        self._arbol = None
+        self._vecinos = None
+        self._huella = None
 
         # Leer n
         try:
@@ -371,14 +738,45 @@ class InterfazColisiones:
             max_y=PLANE_MAX_Y,
             seed=42,
         )
+        self._huella = huella_flota(self.aviones)
 
-        for avion in self.aviones:
-            self._dibujar_avion(avion)
+        self._dibujar_flota()
+        if n <= MAX_AVIONES_DIBUJADOS:
+            self._calcular_vecinos()
 
         self.status_label.config(
             text=f"Estado: {n} aeronaves generadas en el plano 1000x1000 ✈️"
         )
 
+    def _calcular_vecinos(self):
+        """Vecinos más cercanos de la flota en un hilo aparte; al terminar se recolorea."""
+        aviones = self.aviones
+        arbol = self._arbol
+
+        def tarea(progreso):
+            indice = arbol if arbol is not None else ArbolKD(aviones)
+            return vecinos_mas_cercanos(aviones, progreso, arbol=indice), indice
+
+        self._cancelar_trabajo()
+        trabajo = TrabajoDeteccion(tarea)
+        self._trabajo = trabajo
+        trabajo.start()
+        self.root.after(INTERVALO_PROGRESO_MS, self._vigilar_vecinos, trabajo)
+
+    def _vigilar_vecinos(self, trabajo: TrabajoDeteccion):
+        # Una detección (que calcula los vecinos ella misma) o una flota nueva
+        # reemplazó a este cálculo.
+        if trabajo is not self._trabajo:
+            return
+        if trabajo.is_alive():
+            self.root.after(INTERVALO_PROGRESO_MS, self._vigilar_vecinos, trabajo)
+            return
+
+        self._trabajo = None
+        if trabajo.error is None:
+            self._vecinos, self._arbol = trabajo.resultado
+            self._dibujar_flota()
+
     def on_detectar_colisiones(self):
         if not self.aviones:
             self.status_label.config(
@@ -400,12 +798,125 @@ class InterfazColisiones:
             )
             return
 
-        # parejas en riesgo
-        distancia_min, pares_riesgo = pares_en_riesgo(self.aviones, umbral)
+        # parejas en riesgo, en un hilo aparte para no congelar la ventana
+        motor = self.combo_motor.get()
+        aviones = self.aviones
+        arbol = self._arbol
+        vecinos = self._vecinos
+        huella = self._huella
+        cache = self._cache
+
+        def tarea(progreso):
+            # Si la caché responde (mismo umbral o uno mayor), no se llama al motor.
+            construido: List[ArbolKD] = []
+
+            def calcular(puntos, u, prog):
+                elegido = elegir_motor(puntos, u) if motor == MOTOR_AUTO else motor
+                indice = None
+                if elegido == "kdtree":
+                    indice = arbol if arbol is not None else ArbolKD(puntos)
+                    construido.append(indice)
+                analisis = analizar(puntos, u, elegido, prog, arbol=indice)
+                return analisis.minimo.distancia, analisis.pares_riesgo
+
+            res = cache.pares_en_riesgo(aviones, umbral, calcular, progreso, huella=huella)
+            # Si son demasiados para dibujar, se dibujan los más cercanos.
+            pares = res[1]
+            if len(pares) > MAX_PARES_DIBUJADOS:
+                dibujar = [par for par, _ in top_k(
+                    ((par, _dist2(*par)) for par in pares), MAX_PARES_DIBUJADOS
+                )]
+            else:
+                dibujar = list(pares)
+
+            # Los colores de proximidad también se calculan acá, no en el
+            # hilo de Tk. El avance ya está completo: solo se vigila la
+            # cancelación.
+            nuevos = None
+            if vecinos is None and len(aviones) <= MAX_AVIONES_DIBUJADOS:
+                if not construido:
+                    construido.append(arbol if arbol is not None else ArbolKD(aviones))
+                nuevos = vecinos_mas_cercanos(
+                    aviones, lambda _: progreso(1.0), arbol=construido[0]
+                )
+            return res, dibujar, (construido[0] if construido else None), nuevos
+
+        self._cancelar_trabajo()
+        trabajo = TrabajoDeteccion(tarea)
+        self._trabajo = trabajo
+        trabajo.start()
+        self.status_label.config(text=f"Estado: detectando con '{motor}'... 0%")
+        self.root.after(INTERVALO_PROGRESO_MS, self._vigilar_trabajo, trabajo, umbral)
+
+    def on_calibrar(self):
+        # Pulsar durante la calibración la cancela.
+        if self._trabajo is not None and self._trabajo.calibracion:
+            self._cancelar_trabajo()
+            self.btn_calibrar.config(text="Calibrar")
+            self.status_label.config(text="Estado: calibración cancelada.")
+            return
 
-        self._dibujar_radar_base()
-        for avion in self.aviones:
-            self._dibujar_avion(avion)
+        self._cancelar_trabajo()
+        trabajo = TrabajoDeteccion(lambda progreso: recalibrar(progreso=progreso), calibracion=True)
+        self._trabajo = trabajo
+        trabajo.start()
+        self.btn_calibrar.config(text="Cancelar calibración")
+        self.status_label.config(text="Estado: calibrando los motores... 0%")
+        self.root.after(INTERVALO_PROGRESO_MS, self._vigilar_calibracion, trabajo)
+
+    def _vigilar_calibracion(self, trabajo: TrabajoDeteccion):
+        # Cancelada, o reemplazada por una detección o una flota nueva
+        if trabajo is not self._trabajo:
+            self.btn_calibrar.config(text="Calibrar")
+            return
+
+        if trabajo.is_alive():
+            self.status_label.config(
+                text=f"Estado: calibrando los motores... {trabajo.progreso:.0%}"
+            )
+            self.root.after(INTERVALO_PROGRESO_MS, self._vigilar_calibracion, trabajo)
+            return
+
+        self._trabajo = None
+        self.btn_calibrar.config(text="Calibrar")
+        if trabajo.error is not None:
+            self.status_label.config(text=f"Estado: error en la calibración: {trabajo.error}")
+        else:
+            self.status_label.config(text="Estado: motores calibrados para esta máquina.")
+
+    def _cancelar_trabajo(self):
+        if self._trabajo is not None:
+            self._trabajo.cancelar()
+            self._trabajo = None
+
+    def _vigilar_trabajo(self, trabajo: TrabajoDeteccion, umbral: float):
+        # Una detección más nueva (o una flota nueva) reemplazó a esta.
+        if trabajo is not self._trabajo:
+            return
+
+        if trabajo.is_alive():
+            self.status_label.config(
+                text=f"Estado: detectando... {trabajo.progreso:.0%}"
+            )
+            self.root.after(INTERVALO_PROGRESO_MS, self._vigilar_trabajo, trabajo, umbral)
+            return
+
+        self._trabajo = None
+        if trabajo.error is not None:
+            self.status_label.config(text=f"Estado: error en la detección: {trabajo.error}")
+            return
+
+        (distancia_min, pares_riesgo), dibujar, indice, vecinos = trabajo.resultado
+        if indice is not None:
+            self._arbol = indice
+        if vecinos is not None:
+            self._vecinos = vecinos
+        self._mostrar_deteccion(umbral, distancia_min, pares_riesgo, dibujar)
+
+    def _mostrar_deteccion(self, umbral: float, distancia_min: float, pares_riesgo, dibujar):
+        if len(self.aviones) <= MAX_AVIONES_DIBUJADOS:
+            self._dibujar_flota()  # los colores de proximidad dependen del umbral
+        dibujados = self._dibujar_riesgo(dibujar)
 
         if not pares_riesgo:
             msg = (
@@ -413,40 +924,32 @@ class InterfazColisiones:
                 f"No hay pares con distancia ≤ {umbral:.2f}."
             )
             self.status_label.config(text=f"Estado: {msg}")
-            self.canvas.create_text(
-                self.cx,
-                self.cy - self.r - 25,
-                text=msg,
-                fill=ACCENT_COLOR,
-                font=("Segoe UI Semibold", 11),
-            )
+            self._mostrar_mensaje(msg)
             return
 
-    
-        for a, b in pares_riesgo:
-            x1, y1 = self._mapear_a_canvas(a.x, a.y)
-            x2, y2 = self._mapear_a_canvas(b.x, b.y)
-
-            self.canvas.create_line(
-                x1, y1, x2, y2,
-                fill=HIGHLIGHT_COLOR,
-                width=2,
-            )
-            self._dibujar_avion(a, color=HIGHLIGHT_COLOR, radio=6)
-            self._dibujar_avion(b, color=HIGHLIGHT_COLOR, radio=6)
-
         msg = (
             f"{len(pares_riesgo)} posibles colisiones "
             f"(distancia ≤ {umbral:.2f}). "
             f"Distancia mínima global: {distancia_min:.2f}"
         )
         self.status_label.config(text=f"Estado: {msg}")
-        self.canvas.create_text(
-            self.cx,
-            self.cy - self.r - 25,
-            text=msg,
-            fill=ACCENT_COLOR,
-            font=("Segoe UI Semibold", 11),
+        if dibujados < len(pares_riesgo):
+            msg += f" (se dibujan los {dibujados} más cercanos)"
+        self._mostrar_mensaje(msg)
+
+    def on_click_radar(self, event):
+        if not self.aviones:
+            return
+        x, y = self._mapear_a_plano(event.x, event.y)
+        if not (0 <= x <= PLANE_MAX_X and 0 <= y <= PLANE_MAX_Y):
+            return
+
+        vecinos = self._indice().k_vecinos(x, y, 3)
+        texto = ", ".join(
+            f"#{self.aviones[i].id} a {d:.1f}" for d, i in vecinos
+        )
+        self.status_label.config(
+            text=f"Estado: más cercanos a ({x:.0f}, {y:.0f}): {texto}"
         )
 
 
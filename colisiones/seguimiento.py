@@ -0,0 +1,317 @@
+# colisiones/seguimiento.py
+"""
+Seguimiento incremental de la flota.
+
+En vez de recalcular todo en cada barrido del radar, el seguidor mantiene
+una grilla de celdas de lado umbral y el conjunto de pares en riesgo.
+Agregar, mover o quitar un avión solo revisa las 9 celdas alrededor de él.
+
+La distancia mínima global (la que importa cuando nada está en riesgo)
+también se mantiene al día, con una segunda grilla cuyas celdas miden entre
+1,5 y 4 veces el mínimo actual: como ningún par está más cerca que el mínimo,
+cada celda tiene pocos aviones y un avión que entra o se mueve se compara
+con las 9 celdas de alrededor, sin importar cuánto mida el umbral. Si el
+mínimo sale de ese rango, la grilla se rearma. Recién si se rompe el único
+par que lo alcanzaba hay que recalcularlo entero.
+"""
+from __future__ import annotations
+
+import heapq
+from dataclasses import replace
+from math import floor, sqrt
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .algoritmos import ParAviones, _dist2, par_mas_cercano_dyv_indices
+from .modelos import Avion, ResultadoColision
+
+
+Celda = Tuple[int, int]
+
+
+class SeguidorColisiones:
+    """
+    Mantiene la distancia mínima y los pares en riesgo de una flota que cambia.
+    umbral: distancia a partir de la cual dos aviones están en riesgo
+    """
+
+    def __init__(self, umbral: float, aviones: Iterable[Avion] = ()):
+        if umbral <= 0:
+            raise ValueError("el umbral debe ser > 0")
+        self.umbral = umbral
+        self._umbral2 = umbral * umbral
+
+        self._aviones: Dict[int, Avion] = {}
+        self._celda_de: Dict[int, Celda] = {}
+        self._grilla: Dict[Celda, Set[int]] = {}
+
+        # vecinos en riesgo de cada avión: id -> {id: distancia2}
+        self._riesgo: Dict[int, Dict[int, float]] = {}
+        self._num_pares = 0
+        # montículo (d2, id_a, id_b) con borrado perezoso
+        self._monticulo: List[Tuple[float, int, int]] = []
+
+        # distancia² mínima global y sus pares (id_a, id_b), id_a < id_b;
+        # _min_vigente es False mientras haga falta recalcularla
+        self._min_d2 = float("inf")
+        self._min_pares: Set[Tuple[int, int]] = set()
+        self._min_vigente = True
+        # aviones por posición exacta (los candidatos cuando el mínimo es 0)
+        self._en_posicion: Dict[Tuple[float, float], Set[int]] = {}
+        # grilla del mínimo, de lado _lado_min; vacía (lado 0) si el mínimo
+        # es 0 o inf, o mientras no está vigente
+        self._lado_min = 0.0
+        self._grilla_min: Dict[Celda, Set[int]] = {}
+        self._celda_min_de: Dict[int, Celda] = {}
+
+        for avion in aviones:
+            self.agregar(avion)
+
+    # ------------------------------
+    # Operaciones sobre la flota
+    # ------------------------------
+    def agregar(self, avion: Avion) -> None:
+        if avion.id in self._aviones:
+            raise ValueError(f"el avión {avion.id} ya está en seguimiento")
+        self._aviones[avion.id] = avion
+        self._riesgo[avion.id] = {}
+        self._insertar_en_grilla(avion)
+        self._enlazar_vecinos(avion)
+        self._insertar_para_minimo(avion)
+
+    def actualizar(self, id: int, x: float, y: float) -> Avion:
+        """
+        Mueve el avión id a (x, y). El Avion que se pasó al agregarlo no se
+        modifica: el seguidor guarda una copia con la posición nueva y la
+        devuelve.
+        """
+        anterior = self._aviones[id]
+        self._desenlazar(id)
+        self._quitar_de_grilla(id)
+        self._quitar_para_minimo(anterior)
+        self._soltar_minimo(id)
+        avion = replace(anterior, x=x, y=y)
+        self._aviones[id] = avion
+        self._insertar_en_grilla(avion)
+        self._enlazar_vecinos(avion)
+        self._insertar_para_minimo(avion)
+        return avion
+
+    def eliminar(self, id: int) -> Avion:
+        avion = self._aviones[id]
+        self._desenlazar(id)
+        self._quitar_de_grilla(id)
+        self._quitar_para_minimo(avion)
+        self._soltar_minimo(id)
+        del self._riesgo[id]
+        del self._aviones[id]
+        return avion
+
+    # ------------------------------
+    # Consultas
+    # ------------------------------
+    def __len__(self) -> int:
+        return len(self._aviones)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._aviones
+
+    def pares_en_riesgo(self) -> List[ParAviones]:
+        """Pares con distancia <= umbral, ordenados por id."""
+        pares: List[ParAviones] = []
+        for a in sorted(self._riesgo):
+            for b in sorted(self._riesgo[a]):
+                if a < b:
+                    pares.append((self._aviones[a], self._aviones[b]))
+        return pares
+
+    def par_mas_cercano(self) -> ResultadoColision:
+        """Distancia mínima actual y todos los pares que la alcanzan."""
+        if self._num_pares:
+            d2 = self._minimo_en_riesgo()
+            pares = [
+                (self._aviones[a], self._aviones[b])
+                for a in sorted(self._riesgo)
+                for b, d2_ab in sorted(self._riesgo[a].items())
+                if a < b and d2_ab == d2
+            ]
+            return ResultadoColision(sqrt(d2), pares)
+
+        # Sin pares en riesgo el mínimo está fuera de la grilla: sale del
+        # mínimo mantenido, que solo se recalcula si se rompió.
+        if not self._min_vigente:
+            self._recalcular_minimo()
+        pares = [(self._aviones[a], self._aviones[b]) for a, b in sorted(self._min_pares)]
+        return ResultadoColision(sqrt(self._min_d2), pares)
+
+    def distancia_minima(self) -> float:
+        if self._num_pares:
+            return sqrt(self._minimo_en_riesgo())
+        return self.par_mas_cercano().distancia
+
+    def estado(self) -> tuple[float, List[ParAviones]]:
+        """Misma forma que pares_en_riesgo: (distancia_min, pares)."""
+        return self.distancia_minima(), self.pares_en_riesgo()
+
+    # ------------------------------
+    # Internos
+    # ------------------------------
+    def _celda(self, avion: Avion) -> Celda:
+        return floor(avion.x / self.umbral), floor(avion.y / self.umbral)
+
+    def _insertar_en_grilla(self, avion: Avion) -> None:
+        celda = self._celda(avion)
+        self._celda_de[avion.id] = celda
+        self._grilla.setdefault(celda, set()).add(avion.id)
+
+    def _quitar_de_grilla(self, id: int) -> None:
+        celda = self._celda_de.pop(id)
+        ocupantes = self._grilla[celda]
+        ocupantes.discard(id)
+        if not ocupantes:
+            del self._grilla[celda]
+
+    def _enlazar_vecinos(self, avion: Avion) -> None:
+        cx, cy = self._celda_de[avion.id]
+        propios = self._riesgo[avion.id]
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                ocupantes = self._grilla.get((cx + dx, cy + dy))
+                if not ocupantes:
+                    continue
+                for otro in ocupantes:
+                    if otro == avion.id:
+                        continue
+                    d2 = _dist2(avion, self._aviones[otro])
+                    if d2 <= self._umbral2:
+                        propios[otro] = d2
+                        self._riesgo[otro][avion.id] = d2
+                        self._num_pares += 1
+                        a, b = (avion.id, otro) if avion.id < otro else (otro, avion.id)
+                        heapq.heappush(self._monticulo, (d2, a, b))
+
+    def _desenlazar(self, id: int) -> None:
+        vecinos = self._riesgo[id]
+        for otro in vecinos:
+            del self._riesgo[otro][id]
+        self._num_pares -= len(vecinos)
+        vecinos.clear()
+        if len(self._monticulo) > 2 * self._num_pares + 64:
+            self._compactar_monticulo()
+
+    def _insertar_para_minimo(self, avion: Avion) -> None:
+        self._en_posicion.setdefault((avion.x, avion.y), set()).add(avion.id)
+        if self._lado_min:
+            self._meter_en_grilla_min(avion)
+        self._acercar_minimo(avion)
+
+    def _quitar_para_minimo(self, avion: Avion) -> None:
+        clave = (avion.x, avion.y)
+        iguales = self._en_posicion[clave]
+        iguales.discard(avion.id)
+        if not iguales:
+            del self._en_posicion[clave]
+        celda = self._celda_min_de.pop(avion.id, None)
+        if celda is not None:
+            ocupantes = self._grilla_min[celda]
+            ocupantes.discard(avion.id)
+            if not ocupantes:
+                del self._grilla_min[celda]
+
+    def _celda_min(self, avion: Avion) -> Celda:
+        return floor(avion.x / self._lado_min), floor(avion.y / self._lado_min)
+
+    def _meter_en_grilla_min(self, avion: Avion) -> None:
+        celda = self._celda_min(avion)
+        self._celda_min_de[avion.id] = celda
+        self._grilla_min.setdefault(celda, set()).add(avion.id)
+
+    def _ajustar_grilla_min(self) -> None:
+        """Rearma la grilla del mínimo (lado 2 mínimos) si su lado ya no está entre 1,5 y 4."""
+        d2 = self._min_d2
+        if not self._min_vigente or d2 == 0 or d2 == float("inf"):
+            if self._lado_min:
+                self._lado_min = 0.0
+                self._grilla_min.clear()
+                self._celda_min_de.clear()
+            return
+        d = sqrt(d2)
+        # con holgura: 2 * d al cuadrado puede quedar apenas debajo de 4 * d2
+        if 1.5 * d <= self._lado_min <= 4 * d:
+            return
+        self._lado_min = 2 * d
+        self._grilla_min.clear()
+        self._celda_min_de.clear()
+        for avion in self._aviones.values():
+            self._meter_en_grilla_min(avion)
+
+    def _candidatos_minimo(self, avion: Avion) -> Iterator[int]:
+        """
+        Aviones que pueden estar a distancia <= mínimo del avión: los de su
+        misma posición si el mínimo es 0; los de las 9 celdas de la grilla
+        del mínimo (lado >= 1,5 mínimos) si no.
+        """
+        if self._min_d2 == 0:
+            iguales: Iterable[int] = self._en_posicion[(avion.x, avion.y)]
+        elif not self._lado_min:
+            # mínimo inf: hay a lo sumo otro avión
+            iguales = self._aviones
+        else:
+            cx, cy = self._celda_min_de[avion.id]
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for otro in self._grilla_min.get((cx + dx, cy + dy), ()):
+                        if otro != avion.id:
+                            yield otro
+            return
+        for otro in iguales:
+            if otro != avion.id:
+                yield otro
+
+    def _acercar_minimo(self, avion: Avion) -> None:
+        """Compara el avión que entró o se movió contra el mínimo global."""
+        if not self._min_vigente:
+            return
+        for otro in self._candidatos_minimo(avion):
+            d2 = _dist2(avion, self._aviones[otro])
+            if d2 > self._min_d2:
+                continue
+            if d2 < self._min_d2:
+                self._min_d2 = d2
+                self._min_pares = set()
+            self._min_pares.add((avion.id, otro) if avion.id < otro else (otro, avion.id))
+        self._ajustar_grilla_min()
+
+    def _soltar_minimo(self, id: int) -> None:
+        """Saca los pares del mínimo global en los que está el avión id."""
+        if not self._min_vigente:
+            return
+        quedan = {par for par in self._min_pares if id not in par}
+        if quedan or not self._min_pares:
+            self._min_pares = quedan
+        else:
+            # Era el único par (o los únicos) con esa distancia: el nuevo
+            # mínimo puede estar en cualquier parte.
+            self._min_vigente = False
+            self._ajustar_grilla_min()
+
+    def _recalcular_minimo(self) -> None:
+        res = par_mas_cercano_dyv_indices(list(self._aviones.values()))
+        self._min_d2 = _dist2(*res.pares[0]) if res.pares else float("inf")
+        self._min_pares = {
+            (a.id, b.id) if a.id < b.id else (b.id, a.id) for a, b in res.pares
+        }
+        self._min_vigente = True
+        self._ajustar_grilla_min()
+
+    def _vigente(self, d2: float, a: int, b: int) -> bool:
+        vecinos = self._riesgo.get(a)
+        return vecinos is not None and vecinos.get(b) == d2
+
+    def _minimo_en_riesgo(self) -> float:
+        while not self._vigente(*self._monticulo[0]):
+            heapq.heappop(self._monticulo)
+        return self._monticulo[0][0]
+
+    def _compactar_monticulo(self) -> None:
+        self._monticulo = [e for e in self._monticulo if self._vigente(*e)]
+        heapq.heapify(self._monticulo)
@@ -0,0 +1,454 @@
+# colisiones/seleccion.py
+"""
+Elección automática del motor de pares en riesgo.
+
+Cada motor de MOTORES_RIESGO con un PerfilMotor tiene un modelo de costo
+
+    t = c0 + a * f1 + b * f2
+
+sobre dos rasgos de la carga: f1 crece con n (construir el índice, recorrer
+la flota) y f2 con las distancias que hay que calcular. Estas dependen de
+cuántos vecinos tiene un avión típico dentro del umbral: densidad medida
+alrededor de los aviones (no la media del plano, que subestima las flotas
+agrupadas) por umbral². Para los motores que barren por un eje cuenta en
+cambio cuántos aviones caen en la franja |dx| <= umbral (o |dy|, si son menos).
+
+Mientras no se calibre se usan los coeficientes de referencia de PERFILES.
+La calibración (un micro-benchmark de unos segundos) solo corre cuando se
+pide, con main --calibrar o desde la interfaz; el resultado se guarda en
+RUTA_CALIBRACION y se usa mientras no cambie el entorno (versión de Python,
+máquina, procesador, cantidad de CPUs, versión de numpy) ni la lista de
+motores.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sys
+import threading
+from dataclasses import dataclass
+from math import isqrt, log2, pi
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .algoritmos import MOTORES_RIESGO
+from .cache import directorio_cache
+from .enteros import coordenadas_enteras
+from .generador import generar_puntos
+from .modelos import Avion, Estadisticas
+from .perfil import instrumentar
+
+
+# Nombre con el que se pide la elección automática
+MOTOR_AUTO = "auto"
+
+# Cambia cuando cambian los rasgos o las cargas de calibración
+VERSION_CALIBRACION = 2
+
+# Aviones tomados para medir la densidad
+_MUESTRA = 4096
+
+# Cargas de calibración: (n, vecinos esperados en una celda de lado umbral)
+_CARGAS_CALIBRACION = ((400, 0.05), (800, 0.05), (400, 4.0), (800, 4.0), (6400, 0.05), (6400, 4.0))
+# Cargas con más trabajo que esto no se miden (fuerza bruta en 6400 aviones)
+_MAX_TRABAJO_CALIBRACION = 1e6
+_REPETICIONES = 3
+
+
+RUTA_CALIBRACION = (
+    os.environ.get("COLISIONES_CALIBRACION") or os.path.join(directorio_cache(), "calibracion.json")
+)
+
+
+# ==============================
+# Carga
+# ==============================
+
+@dataclass(frozen=True)
+class Carga:
+    """
+    n: aviones
+    umbral: umbral pedido
+    densidad: aviones por unidad² alrededor de un avión típico
+    franja: aviones a distancia <= umbral en x (o en y, si son menos) de un avión típico
+    enteras: la muestra tiene coordenadas enteras
+    """
+    n: int
+    umbral: float
+    densidad: float
+    franja: float
+    enteras: bool
+
+    @property
+    def vecinos(self) -> float:
+        """Aviones esperados en una celda de lado umbral."""
+        return self.densidad * self.umbral * self.umbral
+
+
+def medir_carga(puntos: Sequence[Avion], umbral: float, muestra: int = _MUESTRA) -> Carga:
+    """
+    Rasgos de la carga a partir de una muestra de la flota (uno de cada
+    n // muestra aviones). La densidad se mide con una grilla gruesa: para
+    cada avión de la muestra, cuántos otros caen en su celda.
+    """
+    n = len(puntos)
+    paso = max(1, n // muestra)
+    tomados = [puntos[i] for i in range(0, n, paso)]
+    m = len(tomados)
+    enteras = all(float(p.x).is_integer() and float(p.y).is_integer() for p in tomados)
+    if m < 2 or umbral <= 0:
+        return Carga(n, umbral, 0.0, 0.0, enteras)
+
+    x0 = min(p.x for p in tomados)
+    y0 = min(p.y for p in tomados)
+    # Una flota sobre una recta tiene área 0: se le da el ancho del umbral,
+    # que es lo que ve cada avión.
+    ancho = max(max(p.x for p in tomados) - x0, umbral)
+    alto = max(max(p.y for p in tomados) - y0, umbral)
+
+    # ~4 aviones de la muestra por celda, pero celdas no más chicas que el
+    # umbral: por debajo de esa escala la agrupación no le cuesta al motor.
+    g = max(1, isqrt(m // 4))
+    gx = max(1, min(g, int(ancho / umbral)))
+    gy = max(1, min(g, int(alto / umbral)))
+    ancho_celda = ancho / gx
+    alto_celda = alto / gy
+    en_celda = _otros_en_celda(
+        ((min(int((p.x - x0) / ancho_celda), gx - 1), min(int((p.y - y0) / alto_celda), gy - 1))
+         for p in tomados),
+        m, n,
+    )
+
+    # Lo mismo por un solo eje, para los motores que barren: eligen el eje
+    # con menos aviones en la franja.
+    columnas = max(1, min(m // 4, int(ancho / umbral)))
+    ancho_columna = ancho / columnas
+    en_columna = _otros_en_celda(
+        (min(int((p.x - x0) / ancho_columna), columnas - 1) for p in tomados), m, n
+    )
+    filas = max(1, min(m // 4, int(alto / umbral)))
+    alto_fila = alto / filas
+    en_fila = _otros_en_celda(
+        (min(int((p.y - y0) / alto_fila), filas - 1) for p in tomados), m, n
+    )
+
+    return Carga(
+        n,
+        umbral,
+        densidad=en_celda / (ancho_celda * alto_celda),
+        franja=min(en_columna / ancho_columna, en_fila / alto_fila) * 2 * umbral,
+        enteras=enteras,
+    )
+
+
+def _otros_en_celda(claves: Iterable, m: int, n: int) -> float:
+    """
+    Otros aviones en la celda de un avión típico de la muestra (m de n),
+    llevado a la flota entera. c(c - 1) y no c²: el avión no se cuenta.
+    """
+    conteo: Dict[object, int] = {}
+    for clave in claves:
+        conteo[clave] = conteo.get(clave, 0) + 1
+    return sum(c * (c - 1) for c in conteo.values()) / m * (n / m)
+
+
+# ==============================
+# Perfiles de los motores
+# ==============================
+
+@dataclass(frozen=True)
+class PerfilMotor:
+    """
+    rasgos: (f1, f2) de la carga para este motor
+    referencia: (c0, a, b) medidos en una máquina típica, para usar sin calibrar
+    requiere_enteras: solo sirve con coordenadas enteras
+    """
+    rasgos: Callable[[Carga], Tuple[float, float]]
+    referencia: Tuple[float, float, float]
+    requiere_enteras: bool = False
+
+
+def _rasgos_cuadratico(c: Carga) -> Tuple[float, float]:
+    return c.n, c.n * (c.n - 1) / 2
+
+
+def _rasgos_grilla(c: Carga) -> Tuple[float, float]:
+    # 9 celdas vecinas, cada par se mira una vez
+    return c.n, c.n * 9 * c.vecinos / 2
+
+
+def _rasgos_barrido(c: Carga) -> Tuple[float, float]:
+    # se comparan todos los pares con |dx| (o |dy|) <= umbral
+    return c.n, c.n * c.franja / 2
+
+
+def _rasgos_kdtree(c: Carga) -> Tuple[float, float]:
+    # una consulta por avión; cada una ve el círculo entero
+    return c.n * log2(max(c.n, 2)), c.n * pi * c.vecinos
+
+
+PERFILES: Dict[str, PerfilMotor] = {
+    "fuerza_bruta": PerfilMotor(_rasgos_cuadratico, (0.0, 0.0, 1.4e-7)),
+    "grilla": PerfilMotor(_rasgos_grilla, (0.0, 3.3e-6, 2.7e-7)),
+    "kdtree": PerfilMotor(_rasgos_kdtree, (0.0, 8.5e-7, 1.2e-6)),
+    "enteros": PerfilMotor(_rasgos_grilla, (0.0, 3.1e-6, 3.3e-7), requiere_enteras=True),
+    "numpy": PerfilMotor(_rasgos_barrido, (8e-4, 0.0, 4.4e-8)),
+}
+
+
+def _motores_calibrables() -> List[str]:
+    return sorted(m for m in PERFILES if m in MOTORES_RIESGO)
+
+
+# ==============================
+# Modelo de costo
+# ==============================
+
+@dataclass
+class ModeloCosto:
+    """
+    coeficientes: (c0, a, b) por motor
+    entorno: dónde se midieron (ver _entorno)
+    """
+    coeficientes: Dict[str, Tuple[float, float, float]]
+    entorno: Dict[str, str]
+
+    def estimar(self, motor: str, carga: Carga) -> float:
+        """Segundos estimados para motor sobre carga."""
+        c0, a, b = self.coeficientes[motor]
+        f1, f2 = PERFILES[motor].rasgos(carga)
+        return c0 + a * f1 + b * f2
+
+    def a_json(self) -> dict:
+        return {
+            "version": VERSION_CALIBRACION,
+            "entorno": self.entorno,
+            "coeficientes": {k: list(v) for k, v in self.coeficientes.items()},
+        }
+
+    @classmethod
+    def desde_json(cls, datos: dict) -> "ModeloCosto":
+        return cls(
+            {k: tuple(map(float, v)) for k, v in datos["coeficientes"].items()},
+            dict(datos["entorno"]),
+        )
+
+
+def _version_numpy() -> str:
+    try:
+        import numpy
+    except ImportError:  # numpy es opcional
+        return ""
+    return numpy.__version__
+
+
+def _entorno() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "maquina": platform.machine(),
+        "procesador": platform.processor(),
+        "nodo": platform.node(),
+        "cpus": str(os.cpu_count()),
+        "numpy": _version_numpy(),
+        "motores": ",".join(_motores_calibrables()),
+    }
+
+
+def _minimos_cuadrados(filas: List[List[float]], ts: List[float]) -> Optional[List[float]]:
+    """Solución de mínimos cuadrados de filas · x = ts, o None si es singular."""
+    k = len(filas[0])
+    # ecuaciones normales, con eliminación gaussiana
+    m = [[sum(f[i] * f[j] for f in filas) for j in range(k)] +
+         [sum(f[i] * t for f, t in zip(filas, ts))] for i in range(k)]
+    for col in range(k):
+        piv = max(range(col, k), key=lambda r: abs(m[r][col]))
+        if abs(m[piv][col]) < 1e-300:
+            return None
+        m[col], m[piv] = m[piv], m[col]
+        for r in range(k):
+            if r != col:
+                factor = m[r][col] / m[col][col]
+                m[r] = [v - factor * w for v, w in zip(m[r], m[col])]
+    return [m[i][k] / m[i][i] for i in range(k)]
+
+
+def _ajustar(rasgos: List[Tuple[float, float]], tiempos: List[float]) -> Tuple[float, float, float]:
+    """
+    (c0, a, b) >= 0 que mejor explican los tiempos. Se prueban todos los
+    subconjuntos de términos y se queda el de menor error sin coeficientes
+    negativos.
+    """
+    columnas = [[1.0] * len(rasgos), [f1 for f1, _ in rasgos], [f2 for _, f2 in rasgos]]
+    mejor: Tuple[float, float, float] = (max(tiempos), 0.0, 0.0)
+    mejor_error = float("inf")
+    for mascara in range(1, 8):
+        usados = [k for k in range(3) if mascara >> k & 1]
+        # columnas normalizadas: los rasgos van de 1 a n²
+        escalas = [max(columnas[k]) or 1.0 for k in usados]
+        filas = [[columnas[k][i] / e for k, e in zip(usados, escalas)] for i in range(len(rasgos))]
+        x = _minimos_cuadrados(filas, tiempos)
+        if x is None or min(x) < 0:
+            continue
+        coef = [0.0, 0.0, 0.0]
+        for k, v, e in zip(usados, x, escalas):
+            coef[k] = v / e
+        error = sum(
+            (coef[0] + coef[1] * f1 + coef[2] * f2 - t) ** 2
+            for (f1, f2), t in zip(rasgos, tiempos)
+        )
+        if error < mejor_error:
+            mejor, mejor_error = (coef[0], coef[1], coef[2]), error
+    return mejor
+
+
+def modelo_referencia() -> ModeloCosto:
+    """Modelo con los coeficientes de referencia de PERFILES, sin medir nada."""
+    return ModeloCosto({m: PERFILES[m].referencia for m in _motores_calibrables()}, {})
+
+
+def calibrar(
+    informar: Callable[[str], None] | None = None,
+    progreso: Callable[[float], None] | None = None,
+) -> ModeloCosto:
+    """
+    Mide cada motor sobre las cargas de _CARGAS_CALIBRACION (flotas
+    uniformes de coordenadas enteras) y ajusta su modelo de costo.
+    progreso: recibe la fracción hecha después de cada medición; puede lanzar
+    una excepción para cortar la calibración
+    """
+    flotas = []
+    for n, vecinos in _CARGAS_CALIBRACION:
+        lado = 10 * isqrt(n) + 10
+        puntos = generar_puntos(n, lado, lado, seed=n)
+        # umbral con el que una celda tiene ~vecinos aviones
+        umbral = (vecinos * lado * lado / n) ** 0.5
+        flotas.append((puntos, umbral, medir_carga(puntos, umbral)))
+
+    coeficientes: Dict[str, Tuple[float, float, float]] = {}
+    motores = _motores_calibrables()
+    total = len(motores) * len(flotas)
+    hechas = 0
+    # Las mediciones no deben sumarse a las estadísticas del usuario.
+    with instrumentar(Estadisticas()):
+        for nombre in motores:
+            motor = MOTORES_RIESGO[nombre]
+            rasgos: List[Tuple[float, float]] = []
+            tiempos: List[float] = []
+            for puntos, umbral, carga in flotas:
+                hechas += 1
+                rasgo = PERFILES[nombre].rasgos(carga)
+                if rasgo[1] > _MAX_TRABAJO_CALIBRACION:
+                    continue
+                mejor = float("inf")
+                for _ in range(_REPETICIONES):
+                    t0 = perf_counter()
+                    motor(puntos, umbral)
+                    mejor = min(mejor, perf_counter() - t0)
+                rasgos.append(rasgo)
+                tiempos.append(mejor)
+                if progreso is not None:
+                    progreso(hechas / total)
+            coeficientes[nombre] = _ajustar(rasgos, tiempos)
+            if informar is not None:
+                c0, a, b = coeficientes[nombre]
+                informar(f"{nombre}: c0={c0:.3g} s, a={a:.3g} s, b={b:.3g} s")
+    return ModeloCosto(coeficientes, _entorno())
+
+
+def _leer(ruta: str) -> Optional[ModeloCosto]:
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            datos = json.load(f)
+        if datos.get("version") != VERSION_CALIBRACION:
+            return None
+        modelo = ModeloCosto.desde_json(datos)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if modelo.entorno != _entorno():
+        return None
+    return modelo
+
+
+def _guardar(ruta: str, modelo: ModeloCosto) -> None:
+    try:
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(modelo.a_json(), f, indent=2)
+        os.replace(temporal, ruta)
+    except OSError as e:
+        # Sin disco se sigue con el modelo en memoria.
+        print(f"No se pudo guardar la calibración en {ruta}: {e}", file=sys.stderr)
+
+
+_modelo: Optional[ModeloCosto] = None
+_lock = threading.Lock()
+
+
+def modelo_costo(ruta: str | None = None) -> ModeloCosto:
+    """
+    Modelo de costo en uso: el de memoria, el guardado en disco por una
+    calibración anterior o el de referencia. Nunca calibra. Se puede llamar
+    desde varios hilos.
+    """
+    global _modelo
+    with _lock:
+        if _modelo is None:
+            _modelo = _leer(ruta or RUTA_CALIBRACION) or modelo_referencia()
+        return _modelo
+
+
+def recalibrar(
+    ruta: str | None = None,
+    informar: Callable[[str], None] | None = None,
+    progreso: Callable[[float], None] | None = None,
+) -> ModeloCosto:
+    """
+    Calibra (ver calibrar), guarda el resultado y lo deja en uso. Si
+    progreso corta la calibración, el modelo en uso no cambia.
+    """
+    global _modelo
+    modelo = calibrar(informar, progreso)
+    _guardar(ruta or RUTA_CALIBRACION, modelo)
+    with _lock:
+        _modelo = modelo
+    return modelo
+
+
+# ==============================
+# Elección
+# ==============================
+
+def estimar_motores(puntos: Sequence[Avion], umbral: float) -> List[Tuple[float, str]]:
+    """(segundos estimados, motor) para cada motor que sirve, del más rápido al más lento."""
+    carga = medir_carga(puntos, umbral)
+    modelo = modelo_costo()
+    estimados = []
+    for nombre in modelo.coeficientes:
+        if nombre not in MOTORES_RIESGO:
+            continue
+        if PERFILES[nombre].requiere_enteras and not carga.enteras:
+            continue
+        estimados.append((modelo.estimar(nombre, carga), nombre))
+    estimados.sort()
+    return estimados
+
+
+def elegir_motor(puntos: Sequence[Avion], umbral: float) -> str:
+    """Nombre del motor de MOTORES_RIESGO que el modelo estima más rápido."""
+    if len(puntos) < 2 or umbral <= 0:
+        return "grilla"
+    for _, nombre in estimar_motores(puntos, umbral):
+        # la muestra puede tener enteras y el resto no: se revisa la flota
+        if PERFILES[nombre].requiere_enteras and not coordenadas_enteras(puntos):
+            continue
+        return nombre
+    return "grilla"
+
+
+def motores_disponibles() -> List[str]:
+    """Opciones para elegir motor: MOTOR_AUTO y los de MOTORES_RIESGO."""
+    return [MOTOR_AUTO] + sorted(MOTORES_RIESGO)
+
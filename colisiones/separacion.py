@@ -0,0 +1,134 @@
+# colisiones/separacion.py
+"""
+Separación con mínimos horizontal y vertical.
+
+Dos aviones están en conflicto si su distancia horizontal es <= H y su
+diferencia de altitud es <= V (un cilindro de radio H y alto 2V alrededor
+de cada avión). Los aviones se agrupan por nivel (franjas de altitud de
+alto V) y, dentro de cada nivel, por celdas horizontales de lado H: cada
+avión solo se compara con su celda y las vecinas de los niveles de al lado,
+así que los aviones apilados a distintas altitudes no se comparan.
+"""
+from __future__ import annotations
+
+from math import floor
+from time import perf_counter
+from typing import Dict, List, Sequence, Tuple
+
+from .algoritmos import _PASO_PROGRESO, Progreso, _dist2
+from .modelos import Avion, ParesIndexados
+from .perfil import activas
+
+
+_VECINOS_3D = tuple(
+    (dz, dx, dy) for dz in (-1, 0, 1) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+)
+
+
+def en_conflicto(a: Avion, b: Avion, separacion_h: float, separacion_v: float) -> bool:
+    """True si a y b no respetan ninguno de los dos mínimos."""
+    return abs(a.z - b.z) <= separacion_v and _dist2(a, b) <= separacion_h * separacion_h
+
+
+class IndiceNiveles:
+    """
+    Índice de la flota por (nivel, celda x, celda y).
+    Las consultas devuelven índices sobre la lista original (puntos).
+    """
+
+    def __init__(self, puntos: Sequence[Avion], separacion_h: float, separacion_v: float):
+        if separacion_h <= 0 or separacion_v <= 0:
+            raise ValueError("las separaciones deben ser > 0")
+        self.puntos = puntos
+        self.separacion_h = separacion_h
+        self.separacion_v = separacion_v
+
+        self._celdas: Dict[Tuple[int, int, int], List[int]] = {}
+        for i, p in enumerate(puntos):
+            clave = self._clave(p.x, p.y, p.z)
+            celda = self._celdas.get(clave)
+            if celda is None:
+                self._celdas[clave] = [i]
+            else:
+                celda.append(i)
+
+    def _clave(self, x: float, y: float, z: float) -> Tuple[int, int, int]:
+        h = self.separacion_h
+        return floor(z / self.separacion_v), floor(x / h), floor(y / h)
+
+    def __len__(self) -> int:
+        return len(self.puntos)
+
+    def en_cilindro(self, x: float, y: float, z: float) -> List[int]:
+        """Índices (ordenados) de los aviones en conflicto con la posición (x, y, z)."""
+        puntos = self.puntos
+        h2 = self.separacion_h * self.separacion_h
+        v = self.separacion_v
+        nz, cx, cy = self._clave(x, y, z)
+        res: List[int] = []
+        for dz, dx, dy in _VECINOS_3D:
+            celda = self._celdas.get((nz + dz, cx + dx, cy + dy))
+            if celda is None:
+                continue
+            for j in celda:
+                q = puntos[j]
+                ex = q.x - x
+                ey = q.y - y
+                if abs(q.z - z) <= v and ex * ex + ey * ey <= h2:
+                    res.append(j)
+        res.sort()
+        return res
+
+    def pares(self, progreso: Progreso | None = None) -> ParesIndexados:
+        """
+        Todos los pares (i, j), i < j, en conflicto, en el mismo orden que
+        fuerza bruta.
+        progreso: se llama cada tanto con la fracción de aviones revisados
+        """
+        puntos = self.puntos
+        n = len(puntos)
+        h2 = self.separacion_h * self.separacion_h
+        v = self.separacion_v
+        celdas = self._celdas
+        pares = ParesIndexados(puntos)
+        candidatos: List[int] = []
+
+        stats = activas()
+        if stats is not None:
+            t0 = perf_counter()
+
+        for i, pa in enumerate(puntos):
+            if progreso is not None and i % _PASO_PROGRESO == 0:
+                progreso(i / n)
+            nz, cx, cy = self._clave(pa.x, pa.y, pa.z)
+            for dz, dx, dy in _VECINOS_3D:
+                celda = celdas.get((nz + dz, cx + dx, cy + dy))
+                if celda is None:
+                    continue
+                for j in celda:
+                    if j <= i:
+                        continue
+                    pb = puntos[j]
+                    if abs(pa.z - pb.z) <= v and _dist2(pa, pb) <= h2:
+                        candidatos.append(j)
+            if candidatos:
+                candidatos.sort()
+                for j in candidatos:
+                    pares.agregar(i, j)
+                candidatos.clear()
+
+        if stats is not None:
+            stats.tiempo("separacion.recorrido", perf_counter() - t0)
+            stats.contar("separacion.celdas", len(celdas))
+            stats.contar("separacion.pares", len(pares))
+        return pares
+
+
+def pares_en_conflicto(
+    puntos: Sequence[Avion],
+    separacion_h: float,
+    separacion_v: float,
+    progreso: Progreso | None = None,
+) -> ParesIndexados:
+    """Pares (i, j), i < j, con distancia horizontal <= H y |Δz| <= V."""
+    return IndiceNiveles(puntos, separacion_h, separacion_v).pares(progreso)
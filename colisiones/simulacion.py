@@ -0,0 +1,180 @@
+# colisiones/simulacion.py
+"""
+Simulación por pasos de tiempo y predicción del punto de máximo acercamiento.
+
+Cada avión se mueve en línea recta con velocidad (vx, vy). Para predecir
+conflictos dentro de un horizonte, se toma la caja que barre cada avión en
+ese intervalo y solo se calcula el acercamiento de los pares cuyas cajas
+(ampliadas por el umbral) se tocan.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import floor, sqrt
+from random import Random
+from typing import Dict, Iterator, List, Tuple
+
+from .modelos import Avion
+
+
+@dataclass(slots=True)
+class AvionEnMovimiento(Avion):
+    """
+    Avión con vector de velocidad.
+    vx, vy: unidades del plano por unidad de tiempo
+    """
+    vx: float = 0.0
+    vy: float = 0.0
+
+
+@dataclass
+class Acercamiento:
+    """
+    Predicción para un par de aviones:
+    - tiempo: instante (desde ahora) de máximo acercamiento, en [0, horizonte]
+    - distancia: distancia entre ambos en ese instante
+    """
+    a: AvionEnMovimiento
+    b: AvionEnMovimiento
+    tiempo: float
+    distancia: float
+
+
+def generar_trayectorias(
+    n: int,
+    max_x: int,
+    max_y: int,
+    velocidad_max: float,
+    seed: int | None = None,
+) -> List[AvionEnMovimiento]:
+    """
+    Genera n aviones como generar_puntos y les asigna una velocidad aleatoria
+    con componentes en [-velocidad_max, velocidad_max].
+    """
+    rnd = Random(seed)
+    aviones: List[AvionEnMovimiento] = []
+
+    for i in range(n):
+        x = rnd.randint(0, max_x)
+        y = rnd.randint(0, max_y)
+        vx = rnd.uniform(-velocidad_max, velocidad_max)
+        vy = rnd.uniform(-velocidad_max, velocidad_max)
+        aviones.append(AvionEnMovimiento(id=i, x=float(x), y=float(y), vx=vx, vy=vy))
+
+    return aviones
+
+
+def avanzar(aviones: List[AvionEnMovimiento], dt: float) -> None:
+    """Mueve todos los aviones dt unidades de tiempo (en el lugar)."""
+    for a in aviones:
+        a.x += a.vx * dt
+        a.y += a.vy * dt
+
+
+def simular(
+    aviones: List[AvionEnMovimiento], ticks: int, dt: float = 1.0
+) -> Iterator[Tuple[int, List[AvionEnMovimiento]]]:
+    """
+    Avanza la flota ticks veces y entrega (tick, aviones) después de cada paso.
+    La lista entregada es la misma en todos los pasos.
+    """
+    for t in range(1, ticks + 1):
+        avanzar(aviones, dt)
+        yield t, aviones
+
+
+def maximo_acercamiento(
+    a: AvionEnMovimiento, b: AvionEnMovimiento, horizonte: float
+) -> Tuple[float, float]:
+    """
+    (tiempo, distancia) del máximo acercamiento entre a y b dentro de
+    [0, horizonte], suponiendo velocidad constante.
+    """
+    rx = b.x - a.x
+    ry = b.y - a.y
+    wx = b.vx - a.vx
+    wy = b.vy - a.vy
+
+    w2 = wx * wx + wy * wy
+    if w2 == 0:
+        t = 0.0
+    else:
+        t = -(rx * wx + ry * wy) / w2
+        if t < 0:
+            t = 0.0
+        elif t > horizonte:
+            t = horizonte
+
+    dx = rx + wx * t
+    dy = ry + wy * t
+    return t, sqrt(dx * dx + dy * dy)
+
+
+def _caja_barrida(a: AvionEnMovimiento, horizonte: float) -> Tuple[float, float, float, float]:
+    x1 = a.x + a.vx * horizonte
+    y1 = a.y + a.vy * horizonte
+    return min(a.x, x1), min(a.y, y1), max(a.x, x1), max(a.y, y1)
+
+
+def predecir_acercamientos(
+    aviones: List[AvionEnMovimiento], horizonte: float, umbral: float
+) -> List[Acercamiento]:
+    """
+    Pares que estarán a distancia <= umbral en algún instante de
+    [0, horizonte], ordenados por tiempo de máximo acercamiento.
+
+    Cada caja barrida se registra en las celdas que cubre (de lado
+    umbral + desplazamiento típico), y solo se comparan pares que comparten
+    celda y cuyas cajas ampliadas por umbral se intersecan.
+    """
+    if horizonte < 0:
+        raise ValueError("el horizonte debe ser >= 0")
+    if umbral <= 0:
+        raise ValueError("el umbral debe ser > 0")
+
+    cajas = [_caja_barrida(a, horizonte) for a in aviones]
+
+    # Celda del tamaño del desplazamiento medio, para que una caja típica
+    # ocupe pocas celdas.
+    if aviones:
+        recorrido = sum(max(c[2] - c[0], c[3] - c[1]) for c in cajas) / len(cajas)
+    else:
+        recorrido = 0.0
+    tam = umbral + recorrido
+
+    grilla: Dict[Tuple[int, int], List[int]] = {}
+    for i, (x0, y0, x1, y1) in enumerate(cajas):
+        for cx in range(floor(x0 / tam), floor((x1 + umbral) / tam) + 1):
+            for cy in range(floor(y0 / tam), floor((y1 + umbral) / tam) + 1):
+                grilla.setdefault((cx, cy), []).append(i)
+
+    vistos = set()
+    resultado: List[Acercamiento] = []
+
+    for celda in grilla.values():
+        m = len(celda)
+        for p in range(m):
+            i = celda[p]
+            ax0, ay0, ax1, ay1 = cajas[i]
+            for q in range(p + 1, m):
+                j = celda[q]
+                bx0, by0, bx1, by1 = cajas[j]
+                if (
+                    bx0 > ax1 + umbral
+                    or ax0 > bx1 + umbral
+                    or by0 > ay1 + umbral
+                    or ay0 > by1 + umbral
+                ):
+                    continue
+                clave = (i, j) if i < j else (j, i)
+                if clave in vistos:
+                    continue
+                vistos.add(clave)
+
+                a, b = aviones[clave[0]], aviones[clave[1]]
+                t, d = maximo_acercamiento(a, b, horizonte)
+                if d <= umbral:
+                    resultado.append(Acercamiento(a, b, t, d))
+
+    resultado.sort(key=lambda r: (r.tiempo, r.distancia, r.a.id, r.b.id))
+    return resultado
@@ -0,0 +1,248 @@
+# colisiones/teselas.py
+"""
+Pares en riesgo por teselas, para flotas que no entran en un solo proceso.
+
+El espacio se parte en teselas cuadradas. Cada tesela es dueña de los
+aviones que caen en ella y además lee un halo de ancho umbral alrededor:
+así ve todos los vecinos de sus aviones. Un par (i, j), i < j, lo informa
+solo la tesela dueña de i, de modo que los pares del borde no se repiten.
+
+Las teselas se resuelven de a una o en varios procesos; cada una lee de la
+instantánea (mmap) solo sus aviones y su halo, así la memoria por proceso
+depende del tamaño de la tesela y no del de la flota. Las teselas vacías no
+se resuelven, y los pares de todas se mezclan en orden con heapq.merge.
+"""
+from __future__ import annotations
+
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from math import ceil, sqrt
+from typing import Deque, Iterator, List, Sequence, Tuple
+
+from .algoritmos import Progreso, _indices_en_riesgo_grilla
+from .instantanea import Instantanea
+from .modelos import Avion, ParesIndexados
+
+
+# Aviones por tesela buscados al elegir el lado automáticamente
+AVIONES_POR_TESELA = 250_000
+
+# Teselas como máximo: con más, el lado pedido se agranda (ver teselado)
+MAX_TESELAS = 4096
+
+
+@dataclass(frozen=True)
+class Teselado:
+    """
+    Grilla de teselas sobre la caja [x0, x0 + columnas*lado] x [y0, y0 + filas*lado].
+    """
+    x0: float
+    y0: float
+    lado: float
+    columnas: int
+    filas: int
+
+    def tesela(self, x: float, y: float) -> Tuple[int, int]:
+        """Tesela dueña del punto (x, y)."""
+        cx = min(max(int((x - self.x0) // self.lado), 0), self.columnas - 1)
+        cy = min(max(int((y - self.y0) // self.lado), 0), self.filas - 1)
+        return cx, cy
+
+    def rectangulo(self, cx: int, cy: int) -> Tuple[float, float, float, float]:
+        x = self.x0 + cx * self.lado
+        y = self.y0 + cy * self.lado
+        return x, y, x + self.lado, y + self.lado
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for cx in range(self.columnas):
+            for cy in range(self.filas):
+                yield cx, cy
+
+    def __len__(self) -> int:
+        return self.columnas * self.filas
+
+
+def teselado(flota: Instantanea, lado: float | None = None, max_teselas: int = MAX_TESELAS) -> Teselado:
+    """
+    Teselado que cubre la flota.
+    lado: lado de cada tesela; por defecto, el que deja ~AVIONES_POR_TESELA
+    aviones por tesela si la flota fuera uniforme. Si deja más de max_teselas
+    teselas (o más teselas que aviones) se agranda hasta que no: los pares no
+    dependen del lado y cada tesela tiene un costo fijo aunque esté vacía.
+    """
+    if flota.orden_x is not None:
+        x0, x1 = flota.xs[flota.orden_x[0]], flota.xs[flota.orden_x[-1]]
+        y0, y1 = flota.ys[flota.orden_y[0]], flota.ys[flota.orden_y[-1]]
+    else:
+        x0, x1 = min(flota.xs), max(flota.xs)
+        y0, y1 = min(flota.ys), max(flota.ys)
+
+    ancho_x = x1 - x0
+    ancho_y = y1 - y0
+    if lado is None:
+        lado = max(ancho_x, ancho_y, 1.0) * sqrt(AVIONES_POR_TESELA / len(flota))
+    if not lado > 0:
+        raise ValueError("el lado de las teselas debe ser > 0")
+
+    def cantidad(lado: float) -> int:
+        return max(1, ceil(ancho_x / lado)) * max(1, ceil(ancho_y / lado))
+
+    tope = max(1, min(max_teselas, len(flota)))
+    if cantidad(lado) > tope:
+        # ninguno más chico alcanza: columnas * filas >= área / lado² y >= ancho / lado
+        lado = max(lado, sqrt(ancho_x * ancho_y / tope), max(ancho_x, ancho_y) / tope)
+        while cantidad(lado) > tope:
+            lado *= 1.0625
+    return Teselado(
+        x0, y0, lado,
+        max(1, ceil(ancho_x / lado)),
+        max(1, ceil(ancho_y / lado)),
+    )
+
+
+def _teselas_con_halo(
+    flota: Instantanea, geo: Teselado, umbral: float, orden_x: Sequence[int]
+) -> Iterator[Tuple[int, int, List[int]]]:
+    """
+    (cx, cy, índices) de cada tesela dueña de algún avión, con los índices
+    de sus aviones más su halo en orden creciente; las vacías se saltean.
+    Se recorre por columnas: la franja en x de cada una sale de orden_x con
+    bisect y se ordena por y una sola vez, así cada tesela es otro bisect.
+    """
+    xs, ys = flota.xs, flota.ys
+    for cx in range(geo.columnas):
+        x0, _, x1, _ = geo.rectangulo(cx, 0)
+        # Las teselas del borde se extienden: son dueñas de lo que queda fuera.
+        lo_x = float("-inf") if cx == 0 else x0 - umbral
+        hi_x = float("inf") if cx == geo.columnas - 1 else x1 + umbral
+        a = bisect_left(orden_x, lo_x, key=xs.__getitem__)
+        b = bisect_right(orden_x, hi_x, key=xs.__getitem__)
+        franja = sorted(orden_x[a:b], key=ys.__getitem__)
+        franja_ys = [ys[i] for i in franja]
+
+        for cy in range(geo.filas):
+            _, y0, _, y1 = geo.rectangulo(cx, cy)
+            lo_y = float("-inf") if cy == 0 else y0 - umbral
+            hi_y = float("inf") if cy == geo.filas - 1 else y1 + umbral
+            indices = franja[bisect_left(franja_ys, lo_y):bisect_right(franja_ys, hi_y)]
+            propia = (cx, cy)
+            if not any(geo.tesela(xs[i], ys[i]) == propia for i in indices):
+                continue
+            indices.sort()
+            yield cx, cy, indices
+
+
+def _resolver_tesela(
+    flota: Instantanea, geo: Teselado, cx: int, cy: int, umbral: float, indices: Sequence[int]
+) -> Tuple[array, array, array]:
+    """
+    (ia, ib, d2) con los pares cuyo primer avión es de la tesela, en el
+    orden de fuerza bruta. indices: los de _teselas_con_halo
+    """
+    xs, ys = flota.xs, flota.ys
+    locales = [Avion(id=i, x=xs[i], y=ys[i]) for i in indices]
+
+    _, pares = _indices_en_riesgo_grilla(locales, umbral)
+
+    ia = array("l")
+    ib = array("l")
+    d2s = array("d")
+    propia = (cx, cy)
+    es_propio = [geo.tesela(p.x, p.y) == propia for p in locales]
+    for a, b in pares.indices():
+        # indices está ordenado: a < b local implica i < j global
+        if not es_propio[a]:
+            continue
+        pa, pb = locales[a], locales[b]
+        dx = pa.x - pb.x
+        dy = pa.y - pb.y
+        ia.append(pa.id)
+        ib.append(pb.id)
+        d2s.append(dx * dx + dy * dy)
+    return ia, ib, d2s
+
+
+def _resolver_tesela_en_proceso(
+    ruta: str, geo: Teselado, cx: int, cy: int, umbral: float, indices: array
+) -> Tuple[array, array, array]:
+    """Trabajo de cada proceso: abre la instantánea por su cuenta."""
+    with Instantanea(ruta) as flota:
+        return _resolver_tesela(flota, geo, cx, cy, umbral, indices)
+
+
+def iterar_pares_teselas(
+    flota: Instantanea,
+    umbral: float,
+    lado: float | None = None,
+    procesos: int = 1,
+    progreso: Progreso | None = None,
+) -> Iterator[Tuple[int, int, float]]:
+    """
+    Los pares de pares_en_riesgo_teselas como (i, j, distancia²), en el
+    orden de fuerza bruta. Las teselas se resuelven todas antes de devolver;
+    cada una deja sus pares ya ordenados en columnas compactas y se mezclan
+    con heapq.merge a medida que se piden, sin juntarlos en una sola lista.
+    """
+    if umbral < 0:
+        raise ValueError("el umbral debe ser >= 0")
+    n = len(flota)
+    if n < 2:
+        return iter(())
+
+    geo = teselado(flota, lado)
+    orden_x = flota.orden_x
+    if orden_x is None:
+        # Sin el orden guardado se arma una vez (n enteros), no una pasada por tesela.
+        orden_x = array("q", sorted(range(n), key=flota.xs.__getitem__))
+    teselas = _teselas_con_halo(flota, geo, umbral, orden_x)
+    parciales: List[Tuple[array, array, array]] = []
+
+    if procesos < 2:
+        for cx, cy, indices in teselas:
+            if progreso is not None:
+                progreso(cx / geo.columnas)
+            parciales.append(_resolver_tesela(flota, geo, cx, cy, umbral, indices))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ex:
+            # Pocas teselas en vuelo: sus índices no se acumulan en este proceso.
+            pendientes: Deque[Future] = deque()
+            for cx, cy, indices in teselas:
+                if progreso is not None:
+                    progreso(cx / geo.columnas)
+                pendientes.append(ex.submit(
+                    _resolver_tesela_en_proceso, flota.ruta, geo, cx, cy, umbral, array("q", indices)
+                ))
+                if len(pendientes) >= 2 * procesos:
+                    parciales.append(pendientes.popleft().result())
+            parciales.extend(f.result() for f in pendientes)
+
+    # Cada par salió de una sola tesela y cada tesela ya está en orden (i, j).
+    return heapq.merge(*(zip(ia, ib, d2) for ia, ib, d2 in parciales))
+
+
+def pares_en_riesgo_teselas(
+    flota: Instantanea,
+    umbral: float,
+    lado: float | None = None,
+    procesos: int = 1,
+    progreso: Progreso | None = None,
+) -> tuple[float, ParesIndexados]:
+    """
+    Igual que pares_en_riesgo sobre una instantánea, resolviendo tesela por
+    tesela. Los pares quedan en el mismo orden que fuerza bruta.
+    lado: lado de las teselas (ver teselado)
+    procesos: 1 para resolver las teselas en secuencia en este proceso
+    A diferencia de los otros motores, si ningún par queda bajo el umbral la
+    distancia devuelta es inf: la mínima global requeriría la flota entera.
+    """
+    pares = ParesIndexados(flota)
+    mejor_dist2 = float("inf")
+    for i, j, d2 in iterar_pares_teselas(flota, umbral, lado, procesos, progreso):
+        if d2 < mejor_dist2:
+            mejor_dist2 = d2
+        pares.agregar(i, j)
+    return sqrt(mejor_dist2), pares
@@ -0,0 +1,249 @@
+# colisiones/trafico.py
+"""
+Generador vectorizado (NumPy) de tráfico sintético.
+
+A diferencia de generar_puntos, que sortea coordenadas uniformes de a una,
+este arma escenarios parecidos al tráfico real:
+- hubs: aeropuertos con aviones concentrados alrededor (algunos mucho más
+  grandes que otros); cerca del centro vuelan bajo, subiendo o bajando
+- corredores: aerovías rectas entre hubs, con los aviones en niveles de
+  vuelo según el sentido (pares en uno, impares en el otro)
+- fondo: el resto, uniforme en el plano y en un nivel cualquiera
+- duplicados: una fracción de aviones repite la posición de otro
+
+Se genera por bloques de TAM_BLOQUE aviones, cada uno con su propio
+generador derivado de la semilla: el resultado es el mismo para la misma
+semilla sin importar cómo se consuman los bloques.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import sqrt
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from .instantanea import guardar_bloques
+from .modelos import Avion
+from .vectorizado import FlotaColumnar
+
+
+# Aviones por bloque generado
+TAM_BLOQUE = 1 << 16
+
+
+@dataclass(frozen=True)
+class ConfigTrafico:
+    """
+    lado: lado del plano; None para ~100 unidades² por avión (mínimo 1000)
+    hubs, corredores: cantidad; None para escalar con n
+    frac_hubs, frac_corredores: fracción de aviones en cada grupo (el resto
+        va al fondo uniforme)
+    dispersion_hub: desvío típico de un hub, como fracción del lado
+    ancho_corredor: desvío lateral en un corredor, como fracción del lado
+    capas: niveles de vuelo
+    separacion_capas: distancia vertical entre niveles
+    tasa_duplicados: fracción de aviones que copian la posición de otro
+    enteras: redondear x e y (como generar_puntos)
+    """
+    lado: Optional[float] = None
+    hubs: Optional[int] = None
+    corredores: Optional[int] = None
+    frac_hubs: float = 0.35
+    frac_corredores: float = 0.45
+    dispersion_hub: float = 0.01
+    ancho_corredor: float = 0.002
+    capas: int = 12
+    separacion_capas: float = 300.0
+    tasa_duplicados: float = 0.0
+    enteras: bool = False
+
+    def __post_init__(self):
+        if self.frac_hubs < 0 or self.frac_corredores < 0 or self.frac_hubs + self.frac_corredores > 1:
+            raise ValueError("frac_hubs y frac_corredores deben ser >= 0 y sumar <= 1")
+        if not 0 <= self.tasa_duplicados < 1:
+            raise ValueError("tasa_duplicados debe estar en [0, 1)")
+        if self.capas < 2:
+            raise ValueError("se necesitan al menos 2 capas")
+
+
+@dataclass
+class BloqueTrafico:
+    """
+    Aviones generados, por columnas.
+    ids: int64; xs, ys: float64; zs: altitud (float64)
+    """
+    ids: np.ndarray
+    xs: np.ndarray
+    ys: np.ndarray
+    zs: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def a_flota(self) -> FlotaColumnar:
+        return FlotaColumnar(self.ids, self.xs, self.ys, zs=self.zs)
+
+    def a_aviones(self) -> List[Avion]:
+        return [Avion(id=i, x=x, y=y, z=z)
+                for i, x, y, z in zip(self.ids.tolist(), self.xs.tolist(),
+                                      self.ys.tolist(), self.zs.tolist())]
+
+
+@dataclass
+class _Escenario:
+    lado: float
+    centros: np.ndarray      # (hubs, 2)
+    pesos: np.ndarray        # probabilidad de cada hub
+    sigmas: np.ndarray       # desvío de cada hub
+    origenes: np.ndarray     # (corredores, 2)
+    destinos: np.ndarray     # (corredores, 2)
+    normales: np.ndarray     # (corredores, 2) unitarias, perpendiculares al corredor
+
+
+def _escenario(n: int, config: ConfigTrafico, rng: np.random.Generator) -> _Escenario:
+    lado = config.lado if config.lado is not None else float(max(1000, int(sqrt(n) * 10)))
+    hubs = config.hubs if config.hubs is not None else int(np.clip(n // 50_000, 3, 400))
+    corredores = config.corredores if config.corredores is not None else 2 * hubs
+
+    centros = rng.uniform(0.05 * lado, 0.95 * lado, size=(hubs, 2))
+    # Pocos hubs grandes y muchos chicos (Zipf)
+    pesos = 1.0 / np.arange(1, hubs + 1)
+    rng.shuffle(pesos)
+    pesos /= pesos.sum()
+    sigmas = config.dispersion_hub * lado * rng.uniform(0.5, 2.0, size=hubs)
+
+    if hubs >= 2 and corredores > 0:
+        a = rng.choice(hubs, size=corredores, p=pesos)
+        b = (a + rng.integers(1, hubs, size=corredores)) % hubs
+        origenes, destinos = centros[a], centros[b]
+    else:
+        origenes = rng.uniform(0, lado, size=(corredores, 2))
+        destinos = rng.uniform(0, lado, size=(corredores, 2))
+    direccion = destinos - origenes
+    largo = np.hypot(direccion[:, 0], direccion[:, 1])
+    largo[largo == 0] = 1.0
+    normales = np.column_stack((-direccion[:, 1], direccion[:, 0])) / largo[:, None]
+
+    return _Escenario(lado, centros, pesos, sigmas, origenes, destinos, normales)
+
+
+def _generar_bloque(
+    inicio: int, m: int, esc: _Escenario, config: ConfigTrafico, rng: np.random.Generator
+) -> BloqueTrafico:
+    lado = esc.lado
+    sep = config.separacion_capas
+    techo = config.capas * sep
+
+    xs = np.empty(m)
+    ys = np.empty(m)
+    zs = np.empty(m)
+
+    grupo = rng.random(m)
+    en_hub = grupo < config.frac_hubs
+    en_corredor = ~en_hub & (grupo < config.frac_hubs + config.frac_corredores)
+    en_fondo = ~(en_hub | en_corredor)
+
+    # Hubs: nube gaussiana; la altitud crece con la distancia al centro
+    k = int(en_hub.sum())
+    if k:
+        h = rng.choice(len(esc.centros), size=k, p=esc.pesos)
+        desvio = rng.standard_normal((k, 2)) * esc.sigmas[h, None]
+        xs[en_hub] = esc.centros[h, 0] + desvio[:, 0]
+        ys[en_hub] = esc.centros[h, 1] + desvio[:, 1]
+        radio = np.hypot(desvio[:, 0], desvio[:, 1])
+        zs[en_hub] = np.minimum(radio / (3 * esc.sigmas[h]), 1.0) * techo
+
+    # Corredores: a lo largo del segmento, nivel par o impar según el sentido
+    k = int(en_corredor.sum())
+    if k and len(esc.origenes):
+        c = rng.integers(len(esc.origenes), size=k)
+        t = rng.random(k)
+        lateral = rng.standard_normal(k) * (config.ancho_corredor * lado)
+        pos = esc.origenes[c] + t[:, None] * (esc.destinos[c] - esc.origenes[c])
+        pos += lateral[:, None] * esc.normales[c]
+        xs[en_corredor] = pos[:, 0]
+        ys[en_corredor] = pos[:, 1]
+        sentido = rng.integers(2, size=k)
+        nivel = 2 * rng.integers(config.capas // 2, size=k) + sentido
+        zs[en_corredor] = (np.minimum(nivel, config.capas - 1) + 1) * sep
+    elif k:
+        en_fondo |= en_corredor
+
+    # Fondo uniforme
+    k = int(en_fondo.sum())
+    if k:
+        xs[en_fondo] = rng.uniform(0, lado, size=k)
+        ys[en_fondo] = rng.uniform(0, lado, size=k)
+        zs[en_fondo] = (rng.integers(config.capas, size=k) + 1) * sep
+
+    np.clip(xs, 0, lado, out=xs)
+    np.clip(ys, 0, lado, out=ys)
+    if config.enteras:
+        np.rint(xs, out=xs)
+        np.rint(ys, out=ys)
+
+    # Duplicados: copian la posición de un avión del bloque que no se copia
+    if config.tasa_duplicados > 0 and m > 1:
+        copia = rng.random(m) < config.tasa_duplicados
+        copia[0] = False
+        fuentes = np.flatnonzero(~copia)
+        destinos = np.flatnonzero(copia)
+        origen = fuentes[rng.integers(len(fuentes), size=len(destinos))]
+        xs[destinos] = xs[origen]
+        ys[destinos] = ys[origen]
+        zs[destinos] = zs[origen]
+
+    ids = np.arange(inicio, inicio + m, dtype=np.int64)
+    return BloqueTrafico(ids, xs, ys, zs)
+
+
+def bloques_trafico(
+    n: int, seed: int | None = None, config: ConfigTrafico | None = None
+) -> Iterator[BloqueTrafico]:
+    """Genera n aviones en bloques de hasta TAM_BLOQUE, con ids 0..n-1."""
+    if config is None:
+        config = ConfigTrafico()
+    base = np.random.SeedSequence(seed).entropy
+    esc = _escenario(n, config, np.random.default_rng([base, 0]))
+    for b, inicio in enumerate(range(0, n, TAM_BLOQUE)):
+        m = min(TAM_BLOQUE, n - inicio)
+        yield _generar_bloque(inicio, m, esc, config, np.random.default_rng([base, 1, b]))
+
+
+def generar_trafico(
+    n: int, seed: int | None = None, config: ConfigTrafico | None = None
+) -> BloqueTrafico:
+    """Genera los n aviones de una vez, en columnas."""
+    ids = np.empty(n, dtype=np.int64)
+    xs = np.empty(n)
+    ys = np.empty(n)
+    zs = np.empty(n)
+    for bloque in bloques_trafico(n, seed, config):
+        ini = int(bloque.ids[0])
+        fin = ini + len(bloque)
+        ids[ini:fin] = bloque.ids
+        xs[ini:fin] = bloque.xs
+        ys[ini:fin] = bloque.ys
+        zs[ini:fin] = bloque.zs
+    return BloqueTrafico(ids, xs, ys, zs)
+
+
+def guardar_trafico(
+    ruta: str,
+    n: int,
+    seed: int | None = None,
+    config: ConfigTrafico | None = None,
+    ordenar: bool = True,
+) -> None:
+    """
+    Genera n aviones y los escribe como instantánea (con altitud), bloque
+    por bloque.
+    """
+    guardar_bloques(
+        ruta,
+        n,
+        ((b.ids, b.xs, b.ys, b.zs) for b in bloques_trafico(n, seed, config)),
+        ordenar,
+        con_z=True,
+    )
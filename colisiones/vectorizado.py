@@ -0,0 +1,365 @@
+# colisiones/vectorizado.py
+"""
+Versiones vectorizadas (NumPy) de los algoritmos de algoritmos.py.
+
+La flota se guarda por columnas (ids, x, y) en arreglos contiguos y los
+resultados usan la misma forma que las versiones originales:
+ResultadoColision para el par más cercano y (distancia_min, pares) para
+los pares en riesgo. Los pares empatados se devuelven todos, en el mismo
+orden (i, j) con i < j que usa fuerza_bruta.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from math import sqrt
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .modelos import Avion, ParesIndexados, ResultadoColision
+
+
+ParAviones = Tuple[Avion, Avion]
+
+# Celdas de la matriz de distancias calculadas a la vez en fuerza bruta
+_CELDAS_POR_BLOQUE = 1 << 22
+
+# Por debajo de este tamaño la recursión usa fuerza bruta
+_CORTE_DYV = 32
+
+_PARES_VACIOS = np.empty((0, 2), dtype=np.int64)
+
+
+@dataclass
+class FlotaColumnar:
+    """
+    Flota en formato columnar.
+    ids: identificadores (int64)
+    xs, ys: coordenadas (float64)
+    orden_x: permutación que ordena por x, si ya se conoce
+    zs: altitud (float64), si se conoce; los algoritmos no la usan, solo
+    pasa a los Avion que se arman desde las columnas
+    """
+    ids: np.ndarray
+    xs: np.ndarray
+    ys: np.ndarray
+    _aviones: Optional[Sequence[Avion]] = field(default=None, repr=False)
+    orden_x: Optional[np.ndarray] = field(default=None, repr=False)
+    zs: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        self.ids = np.ascontiguousarray(self.ids, dtype=np.int64)
+        self.xs = np.ascontiguousarray(self.xs, dtype=np.float64)
+        self.ys = np.ascontiguousarray(self.ys, dtype=np.float64)
+        if not (len(self.ids) == len(self.xs) == len(self.ys)):
+            raise ValueError("ids, xs e ys deben tener la misma longitud")
+        if self.orden_x is not None:
+            self.orden_x = np.ascontiguousarray(self.orden_x, dtype=np.int64)
+        if self.zs is not None:
+            self.zs = np.ascontiguousarray(self.zs, dtype=np.float64)
+            if len(self.zs) != len(self.ids):
+                raise ValueError("zs debe tener la misma longitud que ids")
+
+    def ordenar_x(self) -> np.ndarray:
+        """Permutación que ordena la flota por x (se calcula una sola vez)."""
+        if self.orden_x is None:
+            self.orden_x = np.argsort(self.xs, kind="stable")
+        return self.orden_x
+
+    @classmethod
+    def desde_aviones(cls, puntos: Sequence[Avion]) -> "FlotaColumnar":
+        n = len(puntos)
+        ids = np.fromiter((p.id for p in puntos), dtype=np.int64, count=n)
+        xs = np.fromiter((p.x for p in puntos), dtype=np.float64, count=n)
+        ys = np.fromiter((p.y for p in puntos), dtype=np.float64, count=n)
+        return cls(ids, xs, ys, puntos)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def avion(self, i: int) -> Avion:
+        """Avión en la posición i (el original si la flota viene de una lista)."""
+        if self._aviones is not None:
+            return self._aviones[i]
+        z = float(self.zs[i]) if self.zs is not None else 0.0
+        return Avion(id=int(self.ids[i]), x=float(self.xs[i]), y=float(self.ys[i]), z=z)
+
+    __getitem__ = avion
+
+    def a_aviones(self) -> List[Avion]:
+        return [self.avion(i) for i in range(len(self))]
+
+    def pares(self, pares_idx: np.ndarray) -> ParesIndexados:
+        """Envuelve una matriz (k, 2) de índices como pares de aviones."""
+        return ParesIndexados(self, np.ascontiguousarray(pares_idx[:, 0]),
+                              np.ascontiguousarray(pares_idx[:, 1]))
+
+
+def _ordenar_pares(pares_idx: np.ndarray) -> np.ndarray:
+    """Ordena los pares (i, j) lexicográficamente, como fuerza_bruta."""
+    if len(pares_idx) < 2:
+        return pares_idx
+    orden = np.lexsort((pares_idx[:, 1], pares_idx[:, 0]))
+    return pares_idx[orden]
+
+
+def _normalizar_pares(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pares (min, max) a partir de dos columnas de índices."""
+    return np.column_stack((np.minimum(a, b), np.maximum(a, b)))
+
+
+# ==============================
+# Fuerza bruta por bloques
+# ==============================
+
+def _fuerza_bruta_idx(xs: np.ndarray, ys: np.ndarray) -> Tuple[float, np.ndarray]:
+    """(mejor_dist2, pares) con índices locales a xs/ys."""
+    n = len(xs)
+    if n < 2:
+        return float("inf"), _PARES_VACIOS
+
+    filas = max(1, _CELDAS_POR_BLOQUE // n)
+    mejor_dist2 = float("inf")
+    trozos: List[np.ndarray] = []
+
+    for s in range(0, n - 1, filas):
+        e = min(s + filas, n - 1)
+        dx = xs[s:e, None] - xs[None, s + 1:]
+        dy = ys[s:e, None] - ys[None, s + 1:]
+        d2 = dx * dx + dy * dy
+        # Solo j > i: la columna c corresponde a j = s + 1 + c
+        fila = np.arange(s, e)[:, None]
+        col = np.arange(s + 1, n)[None, :]
+        d2[col <= fila] = np.inf
+
+        minimo = float(d2.min())
+        if minimo > mejor_dist2 or minimo == float("inf"):
+            continue
+        if minimo < mejor_dist2:
+            mejor_dist2 = minimo
+            trozos = []
+        ii, cc = np.nonzero(d2 == minimo)
+        trozos.append(np.column_stack((ii + s, cc + s + 1)))
+
+    if mejor_dist2 == float("inf"):
+        return mejor_dist2, _PARES_VACIOS
+    return mejor_dist2, np.concatenate(trozos).astype(np.int64, copy=False)
+
+
+def fuerza_bruta_np(flota: FlotaColumnar) -> ResultadoColision:
+    """Fuerza bruta con la matriz de distancias calculada por bloques de filas."""
+    mejor_dist2, pares_idx = _fuerza_bruta_idx(flota.xs, flota.ys)
+    return ResultadoColision(sqrt(mejor_dist2), list(flota.pares(pares_idx)))
+
+
+# ==============================
+# Divide y vencerás
+# ==============================
+
+def _dyv_rec(xs: np.ndarray, ys: np.ndarray, orig: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    xs, ys ordenados por x; orig son los índices en la flota original.
+    Devuelve (mejor_dist2, pares) con índices originales.
+    """
+    n = len(xs)
+    if n <= _CORTE_DYV:
+        d2, locales = _fuerza_bruta_idx(xs, ys)
+        return d2, orig[locales]
+
+    mid = n // 2
+    mid_x = xs[mid]
+
+    d2_izq, pares_izq = _dyv_rec(xs[:mid], ys[:mid], orig[:mid])
+    d2_der, pares_der = _dyv_rec(xs[mid:], ys[mid:], orig[mid:])
+
+    if d2_izq < d2_der:
+        mejor_dist2, pares = d2_izq, [pares_izq]
+    elif d2_der < d2_izq:
+        mejor_dist2, pares = d2_der, [pares_der]
+    else:
+        mejor_dist2, pares = d2_izq, [pares_izq, pares_der]
+
+    d = sqrt(mejor_dist2)
+
+    # Franja alrededor de mid_x; solo interesan pares que cruzan la división
+    # (la posición decide el lado, no el valor de x).
+    en_franja = np.flatnonzero(np.abs(xs - mid_x) <= d)
+    orden = np.argsort(ys[en_franja], kind="stable")
+    pos = en_franja[orden]
+    fx = xs[pos]
+    fy = ys[pos]
+    izquierda = pos < mid
+
+    m = len(pos)
+    cruces_d2: List[np.ndarray] = []
+    cruces_i: List[np.ndarray] = []
+    cruces_j: List[np.ndarray] = []
+    k = 1
+    activos = np.arange(m - 1)
+    while len(activos):
+        activos = activos[activos + k < m]
+        if not len(activos):
+            break
+        dy = fy[activos + k] - fy[activos]
+        activos = activos[dy <= d]
+        if not len(activos):
+            break
+        otros = activos + k
+        cruza = izquierda[activos] != izquierda[otros]
+        a = activos[cruza]
+        b = otros[cruza]
+        ddx = fx[a] - fx[b]
+        ddy = fy[a] - fy[b]
+        cruces_d2.append(ddx * ddx + ddy * ddy)
+        cruces_i.append(a)
+        cruces_j.append(b)
+        k += 1
+
+    if cruces_d2:
+        todos_d2 = np.concatenate(cruces_d2)
+        if len(todos_d2):
+            minimo = float(todos_d2.min())
+            if minimo <= mejor_dist2:
+                sel = todos_d2 == minimo
+                a = pos[np.concatenate(cruces_i)[sel]]
+                b = pos[np.concatenate(cruces_j)[sel]]
+                nuevos = np.column_stack((orig[a], orig[b]))
+                if minimo < mejor_dist2:
+                    mejor_dist2, pares = minimo, [nuevos]
+                else:
+                    pares.append(nuevos)
+
+    return mejor_dist2, np.concatenate(pares)
+
+
+def _par_mas_cercano_idx(flota: FlotaColumnar) -> Tuple[float, np.ndarray]:
+    orden = flota.ordenar_x()
+    mejor_dist2, pares = _dyv_rec(flota.xs[orden], flota.ys[orden], orden)
+    if len(pares):
+        pares = _ordenar_pares(_normalizar_pares(pares[:, 0], pares[:, 1]))
+    return mejor_dist2, pares
+
+
+def par_mas_cercano_dyv_np(flota: FlotaColumnar) -> ResultadoColision:
+    """Divide y vencerás con franjas calculadas sobre rebanadas de arreglos."""
+    if len(flota) < 2:
+        return ResultadoColision(float("inf"), [])
+    mejor_dist2, pares_idx = _par_mas_cercano_idx(flota)
+    return ResultadoColision(sqrt(mejor_dist2), list(flota.pares(pares_idx)))
+
+
+# ==============================
+# Pares en riesgo: ordenar y barrer
+# ==============================
+
+def _comparaciones_barrido(cs: np.ndarray, umbral: float) -> int:
+    """Pares a distancia <= umbral sobre un eje (cs ordenadas): lo que compara el barrido."""
+    hasta = np.searchsorted(cs, cs + umbral, side="right")
+    return int((hasta - np.arange(1, len(cs) + 1)).sum())
+
+
+def _trozos_en_riesgo(
+    flota: FlotaColumnar, umbral: float
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    (a, b, d2) por cada desplazamiento k del barrido: los pares a distancia
+    <= umbral entre cada avión y el k-ésimo siguiente sobre el eje barrido,
+    con índices sobre la flota. Cada trozo tiene a lo sumo n pares.
+    Se barre por x, o por y si así hay menos pares que comparar: con la
+    flota sobre una vertical, barrer por x compararía todos contra todos.
+    """
+    n = len(flota)
+    umbral2 = umbral * umbral
+    orden = flota.ordenar_x()
+    xs = flota.xs[orden]
+    ys = flota.ys[orden]
+    orden_y = np.argsort(flota.ys, kind="stable")
+    if _comparaciones_barrido(flota.ys[orden_y], umbral) < _comparaciones_barrido(xs, umbral):
+        orden = orden_y
+        xs, ys = flota.ys[orden], flota.xs[orden]
+
+    activos = np.arange(n - 1)
+    k = 1
+    while len(activos):
+        activos = activos[activos + k < n]
+        if not len(activos):
+            break
+        activos = activos[xs[activos + k] - xs[activos] <= umbral]
+        if not len(activos):
+            break
+        otros = activos + k
+        dx = xs[otros] - xs[activos]
+        dy = ys[otros] - ys[activos]
+        d2 = dx * dx + dy * dy
+        dentro = d2 <= umbral2
+        yield orden[activos[dentro]], orden[otros[dentro]], d2[dentro]
+        k += 1
+
+
+def _indices_en_riesgo_np(flota: FlotaColumnar, umbral: float) -> Tuple[float, np.ndarray]:
+    """(mejor_dist2, pares) con todos los pares a distancia <= umbral."""
+    trozos_d2: List[np.ndarray] = []
+    trozos_a: List[np.ndarray] = []
+    trozos_b: List[np.ndarray] = []
+    for a, b, d2 in _trozos_en_riesgo(flota, umbral):
+        trozos_a.append(a)
+        trozos_b.append(b)
+        trozos_d2.append(d2)
+
+    if not trozos_d2:
+        return float("inf"), _PARES_VACIOS
+    todos_d2 = np.concatenate(trozos_d2)
+    if not len(todos_d2):
+        return float("inf"), _PARES_VACIOS
+
+    a = np.concatenate(trozos_a)
+    b = np.concatenate(trozos_b)
+    return float(todos_d2.min()), _ordenar_pares(_normalizar_pares(a, b))
+
+
+def pares_en_riesgo_flota(flota: FlotaColumnar, umbral: float) -> tuple[float, ParesIndexados]:
+    """
+    Igual que pares_en_riesgo, ordenando por x (o por y) y barriendo con
+    desplazamientos vectorizados. Si ningún par queda bajo el umbral, la distancia mínima
+    global se obtiene con divide y vencerás.
+    """
+    if len(flota) < 2:
+        return float("inf"), ParesIndexados(flota)
+
+    mejor_dist2, pares_idx = _indices_en_riesgo_np(flota, umbral)
+    if not len(pares_idx):
+        mejor_dist2, _ = _par_mas_cercano_idx(flota)
+    return sqrt(mejor_dist2), flota.pares(pares_idx)
+
+
+def pares_en_riesgo_np(
+    puntos: List[Avion], umbral: float, progreso: Callable[[float], None] | None = None
+) -> tuple[float, ParesIndexados]:
+    """
+    Adaptador de pares_en_riesgo_flota para listas de Avion.
+    El barrido vectorizado no se puede interrumpir: progreso solo se informa
+    al empezar y al terminar.
+    """
+    if progreso is not None:
+        progreso(0.0)
+    resultado = pares_en_riesgo_flota(FlotaColumnar.desde_aviones(puntos), umbral)
+    if progreso is not None:
+        progreso(1.0)
+    return resultado
+
+
+def iterar_indices_np(
+    puntos: List[Avion], umbral: float, progreso: Callable[[float], None] | None = None
+) -> Iterator[Tuple[int, int, float]]:
+    """
+    Los pares de pares_en_riesgo_np de a uno, como (i, j, distancia²), en el
+    orden del barrido (por desplazamiento, no por índice). Solo se tiene en
+    memoria un desplazamiento a la vez.
+    """
+    if progreso is not None:
+        progreso(0.0)
+    if len(puntos) >= 2:
+        for a, b, d2 in _trozos_en_riesgo(FlotaColumnar.desde_aviones(puntos), umbral):
+            yield from zip(np.minimum(a, b).tolist(), np.maximum(a, b).tolist(), d2.tolist())
+    if progreso is not None:
+        progreso(1.0)
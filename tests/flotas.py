@@ -0,0 +1,70 @@
+# tests/flotas.py
+"""Flotas de prueba y resultados de referencia por fuerza bruta."""
+from __future__ import annotations
+
+from random import Random
+from typing import List, Sequence, Set, Tuple
+
+from colisiones.modelos import Avion
+
+
+def flota_aleatoria(n: int, lado: int = 100, seed: int = 0) -> List[Avion]:
+    """n aviones con coordenadas enteras en [0, lado]²."""
+    rnd = Random(seed)
+    return [Avion(i, float(rnd.randint(0, lado)), float(rnd.randint(0, lado))) for i in range(n)]
+
+
+def flota_duplicada(n: int, posiciones: int = 5, seed: int = 0) -> List[Avion]:
+    """n aviones repartidos en pocas posiciones: muchos coinciden."""
+    rnd = Random(seed)
+    lugares = [(float(rnd.randint(0, 20)), float(rnd.randint(0, 20))) for _ in range(posiciones)]
+    return [Avion(i, *rnd.choice(lugares)) for i in range(n)]
+
+
+def flota_decimal(n: int, lado: float = 50.0, seed: int = 0) -> List[Avion]:
+    """n aviones con coordenadas no enteras."""
+    rnd = Random(seed)
+    return [Avion(i, rnd.uniform(0, lado), rnd.uniform(0, lado)) for i in range(n)]
+
+
+def flota_rejilla(n: int, paso: float = 0.1, seed: int = 0) -> List[Avion]:
+    """n aviones sobre una rejilla de paso no representable: muchos empates."""
+    rnd = Random(seed)
+    return [Avion(i, rnd.randint(0, 15) * paso, rnd.randint(0, 15) * paso) for i in range(n)]
+
+
+def dist2(a: Avion, b: Avion) -> float:
+    dx = a.x - b.x
+    dy = a.y - b.y
+    return dx * dx + dy * dy
+
+
+def pares_bf(puntos: Sequence[Avion], umbral: float) -> List[Tuple[int, int]]:
+    """Pares (i, j), i < j, a distancia² <= umbral², en orden de fuerza bruta."""
+    u2 = umbral * umbral
+    n = len(puntos)
+    return [(i, j) for i in range(n) for j in range(i + 1, n) if dist2(puntos[i], puntos[j]) <= u2]
+
+
+def minimo_bf(puntos: Sequence[Avion]) -> Tuple[float, Set[Tuple[int, int]]]:
+    """(distancia² mínima, pares (i, j) que la alcanzan)."""
+    mejor = float("inf")
+    pares: Set[Tuple[int, int]] = set()
+    for i in range(len(puntos)):
+        for j in range(i + 1, len(puntos)):
+            d2 = dist2(puntos[i], puntos[j])
+            if d2 < mejor:
+                mejor, pares = d2, {(i, j)}
+            elif d2 == mejor:
+                pares.add((i, j))
+    return mejor, pares
+
+
+def indices(puntos: Sequence[Avion], pares) -> List[Tuple[int, int]]:
+    """Pares de aviones pasados a pares de índices sobre puntos."""
+    pos = {id(p): i for i, p in enumerate(puntos)}
+    return [(pos[id(a)], pos[id(b)]) for a, b in pares]
+
+
+def como_conjunto(puntos: Sequence[Avion], pares) -> Set[Tuple[int, int]]:
+    return {tuple(sorted(par)) for par in indices(puntos, pares)}
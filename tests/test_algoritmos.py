@@ -0,0 +1,52 @@
+# tests/test_algoritmos.py
+from math import sqrt
+
+import pytest
+
+from colisiones.algoritmos import (
+    iterar_indices_grilla,
+    par_mas_cercano_barrido,
+    par_mas_cercano_dyv_indices,
+    pares_en_riesgo_grilla,
+)
+
+from .flotas import flota_aleatoria, flota_decimal, flota_duplicada, flota_rejilla, indices, minimo_bf, pares_bf
+
+FLOTAS = [flota_aleatoria, flota_duplicada, flota_decimal]
+UMBRALES = (0.0, 1.0, 3.0, 12.5, 500.0)
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+def test_grilla_contra_fuerza_bruta(flota):
+    for seed in range(3):
+        puntos = flota(200, seed=seed)
+        d2_min, _ = minimo_bf(puntos)
+        for umbral in UMBRALES:
+            esperados = pares_bf(puntos, umbral)
+            distancia, pares = pares_en_riesgo_grilla(puntos, umbral)
+            assert list(pares.indices()) == esperados
+            assert [(i, j) for i, j, _ in iterar_indices_grilla(puntos, umbral)] == esperados
+            # sin pares bajo el umbral, la mínima global
+            assert distancia == sqrt(d2_min)
+
+
+@pytest.mark.parametrize("flota", FLOTAS + [flota_rejilla])
+def test_barrido_contra_fuerza_bruta(flota):
+    for seed in range(5):
+        for n in (2, 3, 40, 300):
+            puntos = flota(n, seed=seed)
+            d2, pares = minimo_bf(puntos)
+            res = par_mas_cercano_barrido(puntos)
+            assert res.distancia == sqrt(d2)
+            assert indices(puntos, res.pares) == sorted(pares)
+
+
+@pytest.mark.parametrize("flota", FLOTAS + [flota_rejilla])
+def test_dyv_indices_contra_fuerza_bruta(flota):
+    for seed in range(5):
+        for n in (2, 3, 17, 40, 300):
+            puntos = flota(n, seed=seed)
+            d2, pares = minimo_bf(puntos)
+            res = par_mas_cercano_dyv_indices(puntos)
+            assert res.distancia == sqrt(d2)
+            assert indices(puntos, res.pares) == sorted(pares)
@@ -0,0 +1,94 @@
+# tests/test_analisis.py
+from math import sqrt
+
+import pytest
+
+from colisiones import analisis
+from colisiones.algoritmos import ITERADORES_RIESGO, MOTORES_RIESGO
+from colisiones.analisis import analizar
+from colisiones.main import verificar
+from colisiones.seleccion import MOTOR_AUTO
+
+from .flotas import (
+    dist2, flota_aleatoria, flota_decimal, flota_duplicada, flota_rejilla, indices, minimo_bf, pares_bf,
+)
+
+FLOTAS = [flota_aleatoria, flota_duplicada, flota_decimal]
+
+
+def _casos(motor, flota):
+    if motor == "enteros" and flota is flota_decimal:
+        pytest.skip("el motor enteros pide coordenadas enteras")
+    for seed in range(3):
+        for umbral in (0.0, 3.0, 12.5):
+            yield flota(150, seed=seed), umbral
+
+
+def test_todo_motor_tiene_iterador():
+    assert set(ITERADORES_RIESGO) == set(MOTORES_RIESGO)
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+@pytest.mark.parametrize("motor", sorted(MOTORES_RIESGO))
+def test_analisis_contra_fuerza_bruta(motor, flota):
+    for puntos, umbral in _casos(motor, flota):
+        esperados = pares_bf(puntos, umbral)
+        res = analizar(puntos, umbral, motor)
+        assert sorted(res.pares_riesgo.indices()) == esperados
+        assert res.total_riesgo == len(esperados)
+        d2, minimos = minimo_bf(puntos)
+        assert res.minimo.distancia == sqrt(d2)
+        assert sorted(indices(puntos, res.minimo.pares)) == sorted(minimos)
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+@pytest.mark.parametrize("motor", sorted(MOTORES_RIESGO) + [MOTOR_AUTO])
+def test_analisis_acotado_contra_fuerza_bruta(motor, flota):
+    for puntos, umbral in _casos(motor, flota):
+        esperados = pares_bf(puntos, umbral)
+        ordenados = sorted(esperados, key=lambda p: (dist2(puntos[p[0]], puntos[p[1]]), p))
+        for limite in (0, 1, 7, len(esperados) + 3):
+            res = analizar(puntos, umbral, motor, limite=limite)
+            assert res.pares_riesgo is None
+            assert res.total_riesgo == len(esperados)
+            assert indices(puntos, [par for par, _ in res.mas_cercanos]) == ordenados[:limite]
+            d2, minimos = minimo_bf(puntos)
+            assert res.minimo.distancia == sqrt(d2)
+            assert indices(puntos, res.minimo.pares) == sorted(minimos)
+
+
+def test_acotado_no_arma_la_lista(monkeypatch):
+    # con limite no se puede caer en el motor que devuelve la lista completa
+    for nombre in MOTORES_RIESGO:
+        monkeypatch.setitem(MOTORES_RIESGO, nombre, None)
+    puntos = flota_duplicada(200)
+    res = analizar(puntos, 5.0, "kdtree", limite=3)
+    assert res.total_riesgo == len(pares_bf(puntos, 5.0))
+
+
+def test_motor_sin_iterador():
+    with pytest.raises(ValueError):
+        analizar(flota_aleatoria(10), 5.0, "inexistente", limite=3)
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+def test_grilla_en_una_pasada(flota, monkeypatch):
+    # con pares bajo el umbral el mínimo sale del mismo recorrido de la grilla
+    def no_llamar(puntos):
+        raise AssertionError("búsqueda aparte del mínimo")
+
+    monkeypatch.setattr(analisis, "par_mas_cercano_dyv_indices", no_llamar)
+    for seed in range(3):
+        puntos = flota(300, seed=seed)
+        res = analizar(puntos, 12.5, "grilla")
+        d2, minimos = minimo_bf(puntos)
+        assert res.minimo.distancia == sqrt(d2)
+        assert indices(puntos, res.minimo.pares) == sorted(minimos)
+        assert list(res.pares_riesgo.indices()) == pares_bf(puntos, 12.5)
+
+
+def test_verificar_con_empates(capsys):
+    # Rejilla de paso 0.1: muchos pares empatados en el mínimo
+    puntos = flota_rejilla(300, seed=2)
+    assert verificar(puntos, 0.25, analizar(puntos, 0.25))
+    assert "✅" in capsys.readouterr().out
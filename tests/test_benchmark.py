@@ -0,0 +1,47 @@
+# tests/test_benchmark.py
+from math import sqrt
+
+import pytest
+
+from colisiones.algoritmos import MOTORES_RIESGO
+from colisiones.benchmark import DISTRIBUCIONES, ejecutar, motores_disponibles
+from colisiones.enteros import coordenadas_enteras
+
+from .flotas import indices, minimo_bf, pares_bf
+
+MOTORES = {m.nombre: m for m in motores_disponibles()}
+
+
+def test_registra_todos_los_motores_de_riesgo():
+    assert {f"riesgo_{nombre}" for nombre in MOTORES_RIESGO} <= set(MOTORES)
+
+
+@pytest.mark.parametrize("distribucion", sorted(DISTRIBUCIONES))
+@pytest.mark.parametrize("nombre", sorted(MOTORES))
+def test_motores_contra_fuerza_bruta(nombre, distribucion):
+    motor = MOTORES[nombre]
+    if nombre == "dyv":
+        pytest.skip("el dyv original puede repetir pares empatados; ver dyv_indices")
+    puntos = DISTRIBUCIONES[distribucion](300, 1)
+    if motor.enteros and not coordenadas_enteras(puntos):
+        pytest.skip("el motor pide coordenadas enteras")
+    if motor.tipo == "par":
+        d2, pares = minimo_bf(puntos)
+        res = motor.fn(puntos)
+        assert res.distancia == sqrt(d2)
+        assert sorted(indices(puntos, res.pares)) == sorted(pares)
+    else:
+        for umbral in (0.0, 5.0, 30.0):
+            _, pares = motor.fn(puntos, umbral)
+            assert sorted(indices(puntos, pares)) == pares_bf(puntos, umbral)
+
+
+def test_avisa_los_casos_omitidos():
+    avisos = []
+    motores = [MOTORES["fuerza_bruta"], MOTORES["dyv"], MOTORES["barrido"]]
+    mediciones = ejecutar([50], ["colineal", "uniforme"], [], motores,
+                          repeticiones=1, limite_cuadratico=10, avisar=avisos.append)
+    assert sorted((m.motor, m.distribucion) for m in mediciones) == [
+        ("barrido", "colineal"), ("barrido", "uniforme"), ("dyv", "uniforme"),
+    ]
+    assert len(avisos) == 3
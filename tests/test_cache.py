@@ -0,0 +1,83 @@
+# tests/test_cache.py
+import pytest
+
+from colisiones.algoritmos import MOTORES_RIESGO
+from colisiones.analisis import analizar
+from colisiones.cache import CacheResultados
+
+from .flotas import flota_aleatoria, flota_duplicada, indices, minimo_bf, pares_bf
+
+
+def _resumen(puntos, res):
+    pares = None if res.pares_riesgo is None else list(res.pares_riesgo.indices())
+    return (
+        res.minimo.distancia,
+        indices(puntos, res.minimo.pares),
+        pares,
+        res.total_riesgo,
+        [(indices(puntos, [par]), d) for par, d in res.mas_cercanos],
+    )
+
+
+@pytest.mark.parametrize("flota", [flota_aleatoria, flota_duplicada])
+@pytest.mark.parametrize("motor", sorted(MOTORES_RIESGO))
+@pytest.mark.parametrize("limite", [None, 4])
+def test_analisis_con_cache_igual_al_directo(motor, flota, limite):
+    puntos = flota(200, seed=1)
+    cache = CacheResultados()
+    # el umbral mayor primero: los siguientes se responden filtrando
+    for umbral in (12.0, 12.0, 5.0, 0.0):
+        directo = analizar(puntos, umbral, motor, limite=limite)
+        con_cache = analizar(puntos, umbral, motor, limite=limite, cache=cache)
+        assert _resumen(puntos, con_cache) == _resumen(puntos, directo)
+        assert con_cache.total_riesgo == len(pares_bf(puntos, umbral))
+    assert cache.fallos == 1
+    assert cache.aciertos == 1
+    assert cache.filtrados == 2
+
+
+def test_acotado_no_guarda_lo_que_no_cabe():
+    puntos = flota_duplicada(300)
+    cache = CacheResultados(max_bytes=2048)
+    res = analizar(puntos, 5.0, "grilla", limite=3, cache=cache)
+    assert res.total_riesgo == len(pares_bf(puntos, 5.0))
+    assert len(cache) == 0
+
+
+def test_sin_pares_usa_el_minimo_guardado():
+    puntos = flota_aleatoria(100, lado=10000)
+    cache = CacheResultados()
+    d2, pares = minimo_bf(puntos)
+    for _ in range(2):
+        res = analizar(puntos, 0.5, "grilla", cache=cache)
+        assert res.minimo.distancia ** 2 == pytest.approx(d2)
+        assert indices(puntos, res.minimo.pares) == sorted(pares)
+    assert cache.aciertos == 2
+
+
+def test_guardar_y_cargar(tmp_path):
+    ruta = str(tmp_path / "sub" / "resultados.bin")
+    puntos = flota_duplicada(200)
+    cache = CacheResultados()
+    esperado = analizar(puntos, 6.0, "kdtree", cache=cache)
+    analizar(puntos, 0.0, "grilla", limite=2, cache=cache)
+    cache.guardar(ruta)
+
+    leida = CacheResultados()
+    assert leida.cargar(ruta)
+    assert len(leida) == len(cache)
+    res = analizar(puntos, 6.0, "kdtree", cache=leida)
+    assert _resumen(puntos, res) == _resumen(puntos, esperado)
+    assert leida.fallos == 0
+
+
+def test_archivo_roto_se_ignora(tmp_path):
+    ruta = tmp_path / "resultados.bin"
+    cache = CacheResultados()
+    analizar(flota_aleatoria(50), 10.0, "grilla", cache=cache)
+    cache.guardar(str(ruta))
+    ruta.write_bytes(ruta.read_bytes()[:-5])
+    otra = CacheResultados()
+    assert not otra.cargar(str(ruta))
+    assert len(otra) == 0
+    assert not otra.cargar(str(tmp_path / "no_existe.bin"))
@@ -0,0 +1,47 @@
+# tests/test_enteros.py
+from math import sqrt
+
+import pytest
+
+from colisiones.enteros import (
+    iterar_indices_enteros,
+    par_mas_cercano_enteros,
+    pares_en_riesgo_enteros,
+    umbral2_entero,
+)
+
+from .flotas import flota_aleatoria, flota_duplicada, indices, minimo_bf, pares_bf
+
+
+def test_umbral2_como_la_comparacion_en_float():
+    for k in range(1, 2000):
+        for u in (sqrt(k), k / 7, k ** 0.5 + 1e-12):
+            m = umbral2_entero(u)
+            assert float(m) <= u * u < float(m + 1)
+
+
+def test_umbral2_con_escala():
+    assert umbral2_entero(1.5, escala=10) == 225
+    assert umbral2_entero(0.0) == umbral2_entero(-3.0) == 0
+
+
+@pytest.mark.parametrize("flota", [flota_aleatoria, flota_duplicada])
+def test_pares_contra_fuerza_bruta(flota):
+    for seed in range(3):
+        puntos = flota(150, lado=30, seed=seed) if flota is flota_aleatoria else flota(150, seed=seed)
+        for k in (0, 1, 2, 5, 8, 13, 50, 200):
+            umbral = sqrt(k)
+            esperados = pares_bf(puntos, umbral)
+            _, pares = pares_en_riesgo_enteros(puntos, umbral)
+            assert list(pares.indices()) == esperados
+            assert sorted((i, j) for i, j, _ in iterar_indices_enteros(puntos, umbral)) == esperados
+
+
+@pytest.mark.parametrize("flota", [flota_aleatoria, flota_duplicada])
+def test_minimo_contra_fuerza_bruta(flota):
+    for seed in range(3):
+        puntos = flota(200, seed=seed)
+        d2, pares = minimo_bf(puntos)
+        res = par_mas_cercano_enteros(puntos)
+        assert res.distancia == sqrt(d2)
+        assert indices(puntos, res.pares) == sorted(pares)
@@ -0,0 +1,41 @@
+# tests/test_ingesta.py
+import io
+from random import Random
+
+import pytest
+
+from colisiones.ingesta import detectar_en_flujo, leer_bloques, ordenar_por_x
+
+from .flotas import flota_aleatoria, flota_duplicada, pares_bf
+
+
+def _csv(aviones):
+    return io.StringIO("id,x,y,z\n" + "".join(f"{a.id},{a.x},{a.y},{a.z}\n" for a in aviones))
+
+
+@pytest.mark.parametrize("tam_tramo", [7, 64, 10_000])
+def test_ordenar_por_x_es_estable(tam_tramo):
+    aviones = flota_duplicada(200, seed=1)
+    Random(2).shuffle(aviones)
+    salida = [a for bloque in ordenar_por_x(leer_bloques(_csv(aviones), tam_bloque=16), 16, tam_tramo)
+              for a in bloque]
+    assert [a.id for a in salida] == [a.id for a in sorted(aviones, key=lambda a: a.x)]
+    assert all(len(b) <= 16 for b in ordenar_por_x([aviones], 16, tam_tramo))
+
+
+@pytest.mark.parametrize("flota", [flota_aleatoria, flota_duplicada])
+def test_flujo_desordenado_contra_fuerza_bruta(flota):
+    aviones = flota(300, seed=4)
+    Random(5).shuffle(aviones)
+    umbral = 6.0
+    bloques = ordenar_por_x(leer_bloques(_csv(aviones), tam_bloque=32), 32, tam_tramo=50)
+    encontrados = {tuple(sorted((a.id, b.id))) for (a, b), _ in detectar_en_flujo(bloques, umbral)}
+    esperados = {tuple(sorted((aviones[i].id, aviones[j].id))) for i, j in pares_bf(aviones, umbral)}
+    assert encontrados == esperados
+
+
+def test_flujo_sin_ordenar_falla():
+    aviones = flota_aleatoria(50, seed=1)
+    aviones.sort(key=lambda a: -a.x)
+    with pytest.raises(ValueError, match="ordenar_por_x"):
+        list(detectar_en_flujo([aviones], 5.0))
@@ -0,0 +1,58 @@
+# tests/test_instantanea.py
+import importlib.util
+
+import pytest
+
+from colisiones.instantanea import abrir_instantanea, guardar_instantanea
+from colisiones.modelos import Avion
+
+from .flotas import flota_decimal
+
+
+def test_ida_y_vuelta(tmp_path):
+    aviones = flota_decimal(100, seed=2)
+    ruta = str(tmp_path / "flota.cols")
+    guardar_instantanea(ruta, aviones)
+    with abrir_instantanea(ruta) as flota:
+        assert [(a.id, a.x, a.y) for a in flota] == [(a.id, a.x, a.y) for a in aviones]
+        assert list(flota.orden_x) == sorted(range(100), key=lambda i: aviones[i].x)
+
+
+def test_cerrar_con_arreglos_en_uso(tmp_path):
+    pytest.importorskip("numpy")
+    aviones = flota_decimal(100, seed=3)
+    ruta = str(tmp_path / "flota.cols")
+    guardar_instantanea(ruta, aviones)
+    with abrir_instantanea(ruta) as instantanea:
+        flota = instantanea.a_flota()
+        rebanada = instantanea.xs[:10]
+    # las columnas que se entregaron siguen leyéndose después de cerrar
+    assert flota.xs.tolist() == [a.x for a in aviones]
+    assert rebanada.tolist() == [a.x for a in aviones[:10]]
+    instantanea.cerrar()  # cerrar dos veces no falla
+
+
+def test_altitud(tmp_path):
+    aviones = [Avion(a.id, a.x, a.y, z=float(a.id % 7) * 100) for a in flota_decimal(50, seed=4)]
+    ruta = str(tmp_path / "flota.cols")
+    guardar_instantanea(ruta, aviones)
+    with abrir_instantanea(ruta) as flota:
+        assert list(flota) == aviones
+        assert flota[3] == aviones[3]
+        if importlib.util.find_spec("numpy") is not None:
+            assert flota.a_flota().a_aviones() == aviones
+
+    # Sin altitudes no se guarda la columna
+    guardar_instantanea(ruta, flota_decimal(50, seed=4))
+    with abrir_instantanea(ruta) as flota:
+        assert flota.zs is None
+        assert {a.z for a in flota} == {0.0}
+
+
+def test_trafico_guarda_altitud(tmp_path):
+    trafico = pytest.importorskip("colisiones.trafico")
+    ruta = str(tmp_path / "trafico.cols")
+    trafico.guardar_trafico(ruta, 500, seed=3)
+    with abrir_instantanea(ruta) as flota:
+        assert list(flota) == trafico.generar_trafico(500, seed=3).a_aviones()
+        assert list(flota.orden_y) == sorted(range(500), key=flota.ys.__getitem__)
@@ -0,0 +1,84 @@
+# tests/test_kdtree.py
+from time import perf_counter
+
+import pytest
+
+from colisiones.kdtree import ArbolKD
+
+from .flotas import dist2, flota_aleatoria, flota_decimal, flota_duplicada, pares_bf
+
+FLOTAS = [flota_aleatoria, flota_duplicada, flota_decimal]
+
+
+def _vecino_bf(puntos):
+    vecino, distancias = [], []
+    for i, p in enumerate(puntos):
+        mejor = min(((dist2(p, q), j) for j, q in enumerate(puntos) if j != i), default=(float("inf"), -1))
+        distancias.append(mejor[0])
+        vecino.append(mejor[1])
+    return vecino, distancias
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+def test_vecino_de_cada_uno_contra_fuerza_bruta(flota):
+    for seed in range(3):
+        for n in (1, 2, 9, 200):
+            puntos = flota(n, seed=seed)
+            vecino, distancias = ArbolKD(puntos).vecino_de_cada_uno()
+            assert (list(vecino), list(distancias)) == _vecino_bf(puntos)
+
+
+def test_vecino_de_cada_uno_con_muchos_repetidos():
+    # Cada grupo de repetidos antes se recorría entero por cada avión: O(n²).
+    puntos = flota_duplicada(20000, posiciones=3)
+    arbol = ArbolKD(puntos)
+    t0 = perf_counter()
+    vecino, distancias = arbol.vecino_de_cada_uno()
+    assert perf_counter() - t0 < 2.0
+    primero = {}
+    for i, p in enumerate(puntos):
+        primero.setdefault((p.x, p.y), []).append(i)
+    for i, p in enumerate(puntos):
+        grupo = primero[(p.x, p.y)]
+        assert distancias[i] == 0.0
+        assert vecino[i] == (grupo[1] if grupo[0] == i else grupo[0])
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+def test_pares_dentro_de_contra_fuerza_bruta(flota):
+    for seed in range(3):
+        puntos = flota(200, seed=seed)
+        arbol = ArbolKD(puntos)
+        for radio in (0.0, 2.5, 10.0):
+            esperados = pares_bf(puntos, radio)
+            _, pares = arbol.pares_dentro_de(radio)
+            assert list(pares.indices()) == esperados
+            assert sorted((i, j) for i, j, _ in arbol.iterar_pares_dentro_de(radio)) == esperados
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+def test_consultas_contra_fuerza_bruta(flota):
+    for seed in range(3):
+        puntos = flota(300, seed=seed)
+        arbol = ArbolKD(puntos)
+        for q in puntos[:20]:
+            for radio in (0.0, 3.0, 10.0):
+                esperados = [i for i, p in enumerate(puntos) if dist2(p, q) <= radio * radio]
+                assert sorted(arbol.en_radio(q.x, q.y, radio)) == esperados
+            x0, y0 = q.x - 4, q.y - 2.5
+            esperados = [i for i, p in enumerate(puntos) if x0 <= p.x <= q.x and y0 <= p.y <= q.y]
+            assert sorted(arbol.en_rectangulo(x0, y0, q.x, q.y)) == esperados
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+def test_k_vecinos_contra_fuerza_bruta(flota):
+    for seed in range(3):
+        puntos = flota(300, seed=seed)
+        arbol = ArbolKD(puntos)
+        for i in range(0, 300, 15):
+            # empates por índice menor, como el árbol
+            orden = sorted((dist2(p, puntos[i]), j) for j, p in enumerate(puntos) if j != i)
+            for k in (1, 4, 40):
+                vecinos = arbol.vecinos_de(i, k)
+                assert [j for _, j in vecinos] == [j for _, j in orden[:k]]
+                assert [d * d for d, _ in vecinos] == pytest.approx([d2 for d2, _ in orden[:k]])
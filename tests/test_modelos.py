@@ -0,0 +1,37 @@
+# tests/test_modelos.py
+from array import array
+
+import pytest
+
+from colisiones.modelos import Avion, ParesIndexados
+
+from .flotas import flota_duplicada
+
+
+def test_avion_sin_dict():
+    a = Avion(1, 2.0, 3.0)
+    assert not hasattr(a, "__dict__")
+    with pytest.raises(AttributeError):
+        a.velocidad = 1.0
+
+
+def test_pares_indexados_como_lista_de_pares():
+    puntos = flota_duplicada(20)
+    pares = ParesIndexados(puntos)
+    lista = []
+    for i in range(0, 20, 3):
+        for j in range(i + 1, 20, 5):
+            pares.agregar(i, j)
+            lista.append((puntos[i], puntos[j]))
+    assert len(pares) == len(lista)
+    assert list(pares) == lista
+    assert pares[3] == lista[3]
+    assert pares[-1] == lista[-1]
+    assert pares[2:7] == lista[2:7]
+    assert list(pares.indices())[0] == (0, 1)
+    assert bool(ParesIndexados(puntos)) is False
+
+
+def test_columnas_de_distinto_largo():
+    with pytest.raises(ValueError):
+        ParesIndexados([], array("l", [0]), array("l"))
@@ -0,0 +1,20 @@
+# tests/test_paralelo.py
+from math import sqrt
+
+import pytest
+
+from colisiones.paralelo import par_mas_cercano_paralelo
+
+from .flotas import flota_aleatoria, flota_decimal, flota_duplicada, indices, minimo_bf
+
+
+@pytest.mark.parametrize("flota", [flota_aleatoria, flota_duplicada, flota_decimal])
+@pytest.mark.parametrize("procesos", [1, 3])
+def test_paralelo_contra_fuerza_bruta(flota, procesos):
+    for seed in range(3):
+        puntos = flota(300, seed=seed)
+        d2, pares = minimo_bf(puntos)
+        res = par_mas_cercano_paralelo(puntos, procesos=procesos, corte=0)
+        assert res.distancia == sqrt(d2)
+        # mismo orden que fuerza bruta
+        assert indices(puntos, res.pares) == sorted(pares)
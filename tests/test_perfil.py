@@ -0,0 +1,26 @@
+# tests/test_perfil.py
+from colisiones.algoritmos import fuerza_bruta, par_mas_cercano_barrido, par_mas_cercano_dyv_indices
+from colisiones.perfil import activas, instrumentar
+
+from .flotas import flota_duplicada, indices
+
+
+def test_instrumentacion_no_cambia_resultados():
+    puntos = flota_duplicada(120)
+    sin = [indices(puntos, f(puntos).pares) for f in (par_mas_cercano_dyv_indices, par_mas_cercano_barrido)]
+    with instrumentar() as stats:
+        con = [indices(puntos, f(puntos).pares) for f in (par_mas_cercano_dyv_indices, par_mas_cercano_barrido)]
+        fuerza_bruta(puntos)
+    assert con == sin
+    assert stats.contadores["fuerza_bruta.distancias"] == 120 * 119 // 2
+    assert stats.contadores["barrido.pares"] == len(sin[1])
+    assert "dyv_indices.orden" in stats.tiempos
+    assert activas() is None
+
+
+def test_sin_instrumentar_no_se_junta_nada():
+    assert activas() is None
+    with instrumentar() as stats:
+        pass
+    fuerza_bruta(flota_duplicada(10))
+    assert stats.contadores == {}
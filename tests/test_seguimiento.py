@@ -0,0 +1,62 @@
+# tests/test_seguimiento.py
+from math import sqrt
+from time import perf_counter
+from random import Random
+
+import pytest
+
+from colisiones.seguimiento import SeguidorColisiones
+
+from .flotas import flota_aleatoria, flota_duplicada, minimo_bf, pares_bf
+
+
+def _comparar(seguidor, umbral):
+    aviones = sorted((seguidor._aviones[i] for i in seguidor._aviones), key=lambda a: a.id)
+    d2, pares = minimo_bf(aviones)
+    res = seguidor.par_mas_cercano()
+    assert res.distancia == sqrt(d2)
+    assert {(a.id, b.id) for a, b in res.pares} == {(aviones[i].id, aviones[j].id) for i, j in pares}
+    esperados = [(aviones[i].id, aviones[j].id) for i, j in pares_bf(aviones, umbral)]
+    assert sorted((a.id, b.id) for a, b in seguidor.pares_en_riesgo()) == sorted(esperados)
+
+
+@pytest.mark.parametrize("umbral", [0.5, 3.0, 15.0])
+@pytest.mark.parametrize("flota", [flota_aleatoria, flota_duplicada])
+def test_seguidor_contra_fuerza_bruta(flota, umbral):
+    rnd = Random(7)
+    aviones = flota(40, seed=3)
+    seguidor = SeguidorColisiones(umbral, aviones[:30])
+    _comparar(seguidor, umbral)
+    libres = aviones[30:]
+    for paso in range(200):
+        accion = rnd.random()
+        if accion < 0.15 and libres:
+            seguidor.agregar(libres.pop())
+        elif accion < 0.3 and len(seguidor) > 1:
+            libres.append(seguidor.eliminar(rnd.choice(list(seguidor._aviones))))
+        else:
+            id = rnd.choice(list(seguidor._aviones))
+            seguidor.actualizar(id, float(rnd.randint(0, 100)), float(rnd.randint(0, 100)))
+        if paso % 3 == 0:
+            _comparar(seguidor, umbral)
+
+
+def test_actualizar_no_modifica_el_avion_del_llamador():
+    aviones = flota_aleatoria(10)
+    seguidor = SeguidorColisiones(2.0, aviones)
+    x, y = aviones[3].x, aviones[3].y
+    movido = seguidor.actualizar(aviones[3].id, 50.5, 60.5)
+    assert (aviones[3].x, aviones[3].y) == (x, y)
+    assert (movido.id, movido.x, movido.y) == (aviones[3].id, 50.5, 60.5)
+    assert seguidor._aviones[aviones[3].id] is movido
+
+
+def test_agregar_no_recorre_la_flota():
+    # Mínimo mucho mayor que el umbral: antes cada alta revisaba todos los aviones.
+    aviones = flota_aleatoria(20000, lado=10 ** 7, seed=5)
+    t0 = perf_counter()
+    seguidor = SeguidorColisiones(1.0, aviones)
+    for a in aviones[:2000]:
+        seguidor.actualizar(a.id, a.x + 3.0, a.y)
+    assert perf_counter() - t0 < 5.0
+    assert seguidor.distancia_minima() > 0
@@ -0,0 +1,46 @@
+# tests/test_seleccion.py
+import pytest
+
+from colisiones import seleccion
+from colisiones.seleccion import ModeloCosto
+
+
+def test_calibracion_de_otra_maquina_se_descarta(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "calibracion.json")
+    entorno = seleccion._entorno()
+    seleccion._guardar(ruta, ModeloCosto({"grilla": (1e-4, 1e-6, 1e-7)}, dict(entorno)))
+    assert seleccion._leer(ruta) is not None
+    for clave in ("cpus", "nodo", "procesador", "numpy"):
+        assert clave in entorno
+        monkeypatch.setattr(seleccion, "_entorno", lambda: {**entorno, clave: "otro"})
+        assert seleccion._leer(ruta) is None
+        monkeypatch.undo()
+
+
+def test_sin_calibracion_usa_la_referencia(tmp_path, monkeypatch):
+    def no_calibrar(*args, **kwargs):
+        raise AssertionError("modelo_costo no debe calibrar")
+
+    monkeypatch.setattr(seleccion, "calibrar", no_calibrar)
+    monkeypatch.setattr(seleccion, "_modelo", None)
+    modelo = seleccion.modelo_costo(str(tmp_path / "no_existe.json"))
+    assert modelo.coeficientes == seleccion.modelo_referencia().coeficientes
+    assert set(modelo.coeficientes) == set(seleccion._motores_calibrables())
+    assert not list(tmp_path.iterdir())
+
+
+def test_recalibrar_cancelado_no_cambia_nada(tmp_path, monkeypatch):
+    class Cancelada(Exception):
+        pass
+
+    def cortar(fraccion):
+        assert 0 < fraccion <= 1
+        raise Cancelada()
+
+    monkeypatch.setattr(seleccion, "_modelo", None)
+    ruta = str(tmp_path / "calibracion.json")
+    antes = seleccion.modelo_costo(ruta)
+    with pytest.raises(Cancelada):
+        seleccion.recalibrar(ruta, progreso=cortar)
+    assert seleccion.modelo_costo(ruta) is antes
+    assert not list(tmp_path.iterdir())
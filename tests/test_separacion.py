@@ -0,0 +1,42 @@
+# tests/test_separacion.py
+from random import Random
+
+import pytest
+
+from colisiones.modelos import Avion
+from colisiones.separacion import IndiceNiveles, en_conflicto, pares_en_conflicto
+
+from .flotas import flota_aleatoria, flota_decimal, flota_duplicada
+
+
+def _con_altitud(puntos, niveles, seed):
+    """Misma flota con altitudes: pocos niveles repetidos o valores continuos."""
+    rnd = Random(seed)
+    if niveles:
+        return [Avion(p.id, p.x, p.y, 1000.0 * rnd.randrange(niveles)) for p in puntos]
+    return [Avion(p.id, p.x, p.y, rnd.uniform(0, 3000)) for p in puntos]
+
+
+@pytest.mark.parametrize("flota", [flota_aleatoria, flota_duplicada, flota_decimal])
+@pytest.mark.parametrize("niveles", [0, 1, 4])
+def test_conflictos_contra_fuerza_bruta(flota, niveles):
+    for seed in range(3):
+        puntos = _con_altitud(flota(200, seed=seed), niveles, seed)
+        for h, v in ((3.0, 1000.0), (10.0, 300.0), (0.5, 999.0)):
+            esperados = [
+                (i, j)
+                for i in range(len(puntos))
+                for j in range(i + 1, len(puntos))
+                if en_conflicto(puntos[i], puntos[j], h, v)
+            ]
+            assert list(pares_en_conflicto(puntos, h, v).indices()) == esperados
+
+            indice = IndiceNiveles(puntos, h, v)
+            for q in puntos[:10]:
+                cerca = [j for j, p in enumerate(puntos) if en_conflicto(p, q, h, v)]
+                assert indice.en_cilindro(q.x, q.y, q.z) == cerca
+
+
+def test_separaciones_invalidas():
+    with pytest.raises(ValueError):
+        IndiceNiveles([], 0.0, 1000.0)
@@ -0,0 +1,42 @@
+# tests/test_simulacion.py
+import pytest
+
+from colisiones.simulacion import AvionEnMovimiento, generar_trayectorias, maximo_acercamiento, predecir_acercamientos
+
+
+def _predecir_bf(aviones, horizonte, umbral):
+    res = []
+    for i, a in enumerate(aviones):
+        for b in aviones[i + 1:]:
+            t, d = maximo_acercamiento(a, b, horizonte)
+            if d <= umbral:
+                res.append((t, d, a.id, b.id))
+    return sorted(res)
+
+
+def _como_tuplas(acercamientos):
+    return [(r.tiempo, r.distancia, r.a.id, r.b.id) for r in acercamientos]
+
+
+@pytest.mark.parametrize("lado", [20, 500])
+def test_prediccion_contra_fuerza_bruta(lado):
+    for seed in range(3):
+        aviones = generar_trayectorias(200, lado, lado, velocidad_max=3.0, seed=seed)
+        for horizonte, umbral in ((0.0, 5.0), (10.0, 2.0), (30.0, 15.0)):
+            esperado = _predecir_bf(aviones, horizonte, umbral)
+            assert _como_tuplas(predecir_acercamientos(aviones, horizonte, umbral)) == esperado
+
+
+def test_prediccion_con_aviones_repetidos():
+    # misma posición y velocidad: la distancia no cambia nunca
+    aviones = [AvionEnMovimiento(i, float(i % 3), 0.0, vx=1.0, vy=0.5) for i in range(60)]
+    esperado = _predecir_bf(aviones, 20.0, 0.5)
+    assert _como_tuplas(predecir_acercamientos(aviones, 20.0, 0.5)) == esperado
+    assert len(esperado) == 3 * (20 * 19 // 2)
+
+
+def test_maximo_acercamiento_de_frente():
+    a = AvionEnMovimiento(0, 0.0, 0.0, vx=1.0, vy=0.0)
+    b = AvionEnMovimiento(1, 10.0, 1.0, vx=-1.0, vy=0.0)
+    assert maximo_acercamiento(a, b, 100.0) == (5.0, 1.0)
+    assert maximo_acercamiento(a, b, 2.0) == (2.0, pytest.approx((36 + 1) ** 0.5))
@@ -0,0 +1,79 @@
+# tests/test_teselas.py
+import pytest
+
+from colisiones import teselas
+from colisiones.instantanea import Instantanea, guardar_instantanea
+from colisiones.modelos import Avion
+from colisiones.teselas import MAX_TESELAS, iterar_pares_teselas, pares_en_riesgo_teselas, teselado
+
+from .flotas import flota_aleatoria, flota_decimal, flota_duplicada, pares_bf
+
+
+@pytest.fixture
+def instantanea(tmp_path):
+    abiertas = []
+
+    def abrir(puntos, ordenar=True):
+        ruta = str(tmp_path / f"flota{len(abiertas)}.bin")
+        guardar_instantanea(ruta, puntos, ordenar)
+        flota = Instantanea(ruta)
+        abiertas.append(flota)
+        return flota
+
+    yield abrir
+    for flota in abiertas:
+        flota.cerrar()
+
+
+@pytest.mark.parametrize("flota", [flota_aleatoria, flota_duplicada, flota_decimal])
+@pytest.mark.parametrize("ordenar", [True, False])
+def test_teselas_contra_fuerza_bruta(instantanea, flota, ordenar):
+    for seed in range(2):
+        puntos = flota(300, seed=seed)
+        snap = instantanea(puntos, ordenar)
+        for umbral in (0.0, 2.0, 7.5):
+            esperados = pares_bf(puntos, umbral)
+            for lado in (None, 1.0, 6.0):
+                _, pares = pares_en_riesgo_teselas(snap, umbral, lado)
+                assert list(pares.indices()) == esperados
+                assert [(i, j) for i, j, _ in iterar_pares_teselas(snap, umbral, lado)] == esperados
+
+
+def test_teselas_en_procesos(instantanea):
+    puntos = flota_aleatoria(400, seed=3)
+    snap = instantanea(puntos)
+    _, pares = pares_en_riesgo_teselas(snap, 5.0, lado=20.0, procesos=2)
+    assert list(pares.indices()) == pares_bf(puntos, 5.0)
+
+
+def test_lado_chico_se_agranda(instantanea):
+    puntos = [Avion(0, 0.0, 0.0), Avion(1, 1000.0, 1000.0), Avion(2, 1000.5, 1000.0)]
+    snap = instantanea(puntos)
+    geo = teselado(snap, 1.0)
+    assert len(geo) <= len(puntos)
+    puntos = flota_decimal(20000, lado=1000.0)
+    geo = teselado(instantanea(puntos), 1.0)
+    assert len(geo) <= MAX_TESELAS
+    with pytest.raises(ValueError):
+        teselado(snap, 0.0)
+
+
+def test_teselas_vacias_no_se_resuelven(instantanea, monkeypatch):
+    # dos grupos en esquinas opuestas: casi todas las teselas quedan vacías
+    puntos = [Avion(i, float(i % 10), float(i // 10)) for i in range(100)]
+    puntos += [Avion(100 + i, 900.0 + i % 10, 900.0 + i // 10) for i in range(100)]
+    snap = instantanea(puntos)
+    resueltas = []
+    original = teselas._resolver_tesela
+
+    def contar(flota, geo, cx, cy, umbral, indices):
+        resueltas.append((cx, cy))
+        return original(flota, geo, cx, cy, umbral, indices)
+
+    monkeypatch.setattr(teselas, "_resolver_tesela", contar)
+    _, pares = pares_en_riesgo_teselas(snap, 1.5, lado=10.0)
+    assert list(pares.indices()) == pares_bf(puntos, 1.5)
+    geo = teselado(snap, 10.0)
+    ocupadas = {geo.tesela(p.x, p.y) for p in puntos}
+    assert len(geo) > 100
+    assert set(resueltas) == ocupadas
@@ -0,0 +1,40 @@
+# tests/test_trafico.py
+import pytest
+
+pytest.importorskip("numpy")
+
+from colisiones import trafico  # noqa: E402
+from colisiones.algoritmos import MOTORES_RIESGO  # noqa: E402
+from colisiones.trafico import ConfigTrafico, bloques_trafico, generar_trafico  # noqa: E402
+
+from .flotas import pares_bf  # noqa: E402
+
+
+def test_misma_semilla_mismo_trafico(monkeypatch):
+    monkeypatch.setattr(trafico, "TAM_BLOQUE", 1000)
+    config = ConfigTrafico(tasa_duplicados=0.1)
+    junto = generar_trafico(3500, seed=7, config=config)
+    # bloque por bloque salen los mismos aviones que todos juntos
+    ultimos = list(bloques_trafico(3500, seed=7, config=config))[2:]
+    assert junto.ids.tolist() == list(range(3500))
+    assert [x for b in ultimos for x in b.xs.tolist()] == junto.xs.tolist()[2000:]
+    assert generar_trafico(3500, seed=8, config=config).xs.tolist() != junto.xs.tolist()
+
+
+def test_dentro_del_plano():
+    config = ConfigTrafico(lado=2000.0, enteras=True)
+    bloque = generar_trafico(5000, seed=1, config=config)
+    assert 0 <= bloque.xs.min() and bloque.xs.max() <= 2000
+    assert 0 <= bloque.ys.min() and bloque.ys.max() <= 2000
+    assert (bloque.xs == bloque.xs.round()).all()
+
+
+@pytest.mark.parametrize("motor", sorted(MOTORES_RIESGO))
+def test_motores_sobre_trafico_con_duplicados(motor):
+    config = ConfigTrafico(lado=1000.0, tasa_duplicados=0.2, enteras=True)
+    puntos = generar_trafico(400, seed=3, config=config).a_aviones()
+    posiciones = {(p.x, p.y) for p in puntos}
+    assert len(posiciones) < len(puntos)
+    for umbral in (0.0, 5.0, 40.0):
+        _, pares = MOTORES_RIESGO[motor](puntos, umbral)
+        assert sorted(pares.indices()) == pares_bf(puntos, umbral)
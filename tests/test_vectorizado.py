@@ -0,0 +1,59 @@
+# tests/test_vectorizado.py
+from math import sqrt
+from random import Random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from colisiones.modelos import Avion  # noqa: E402
+from colisiones.vectorizado import (  # noqa: E402
+    FlotaColumnar,
+    _comparaciones_barrido,
+    fuerza_bruta_np,
+    iterar_indices_np,
+    par_mas_cercano_dyv_np,
+    pares_en_riesgo_flota,
+)
+
+from .flotas import flota_aleatoria, flota_decimal, flota_duplicada, indices, minimo_bf, pares_bf  # noqa: E402
+
+FLOTAS = [flota_aleatoria, flota_duplicada, flota_decimal]
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+@pytest.mark.parametrize("motor", [fuerza_bruta_np, par_mas_cercano_dyv_np])
+def test_minimo_contra_fuerza_bruta(motor, flota):
+    for seed in range(3):
+        for n in (2, 3, 50, 300):
+            puntos = flota(n, seed=seed)
+            d2, pares = minimo_bf(puntos)
+            res = motor(FlotaColumnar.desde_aviones(puntos))
+            assert res.distancia == sqrt(d2)
+            assert indices(puntos, res.pares) == sorted(pares)
+
+
+@pytest.mark.parametrize("flota", FLOTAS)
+def test_pares_contra_fuerza_bruta(flota):
+    for seed in range(3):
+        puntos = flota(200, seed=seed)
+        d2_min, _ = minimo_bf(puntos)
+        for umbral in (0.0, 1.0, 4.0, 12.5):
+            esperados = pares_bf(puntos, umbral)
+            distancia, pares = pares_en_riesgo_flota(FlotaColumnar.desde_aviones(puntos), umbral)
+            assert list(pares.indices()) == esperados
+            assert distancia == sqrt(d2_min)
+            assert sorted((i, j) for i, j, _ in iterar_indices_np(puntos, umbral)) == esperados
+
+
+def test_barrido_sobre_una_vertical_cambia_de_eje():
+    # Todos con el mismo x: barrer por x compararía todos contra todos
+    rnd = Random(0)
+    puntos = [Avion(i, 50.0, float(rnd.randint(0, 20000))) for i in range(400)]
+    esperados = pares_bf(puntos, 3.0)
+    _, pares = pares_en_riesgo_flota(FlotaColumnar.desde_aviones(puntos), 3.0)
+    assert list(pares.indices()) == esperados
+    flota = FlotaColumnar.desde_aviones(puntos)
+    ys = np.sort(flota.ys)
+    assert _comparaciones_barrido(ys, 3.0) == len(esperados) < len(puntos)
+    assert _comparaciones_barrido(flota.xs, 3.0) == len(puntos) * (len(puntos) - 1) // 2